@@ -2,80 +2,122 @@
 PCR系统 - 纯GUI版本
 移除了所有硬件控制代码(TMC2209, TEC, GPIO, ADC等)
 仅保留Kivy/KivyMD界面框架
+
+启动分析: TEC_PROFILE_STARTUP=1 python3 1119_gui.py
+numpy 等重量级模块在首次使用时才导入
 """
 
+import startup_profile
+startup_profile.begin()
+
 from kivy.metrics import dp
 from kivy.config import Config
 from kivy.clock import Clock
-from kivy.core.window import Window
-from kivy.core.image import Image as CoreImage
 from kivy.graphics import Color, Ellipse, Line, Rectangle
 from kivy.properties import NumericProperty, StringProperty
 from kivy.uix.widget import Widget
 from kivy.uix.image import Image
-from kivy.uix.anchorlayout import AnchorLayout
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.card import MDCard
-from kivymd.uix.selectioncontrol import MDCheckbox
 from kivymd.uix.button import MDButton, MDButtonIcon, MDButtonText, MDIconButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.floatlayout import MDFloatLayout
 from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.fitimage import FitImage
-from kivymd.uix.screenmanager import MDScreenManager
 from kivymd.uix.snackbar import MDSnackbar, MDSnackbarText
 from kivymd.uix.textfield import MDTextField, MDTextFieldLeadingIcon, MDTextFieldHintText
-from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.list import MDList, MDListItem, MDListItemLeadingIcon, MDListItemHeadlineText
-from kivymd.uix.dialog import MDDialog, MDDialogIcon, MDDialogHeadlineText, MDDialogContentContainer, MDDialogButtonContainer
 
 from datetime import datetime
-from io import BytesIO
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import time
 import csv
 import os
-import json
+import threading
+
+from ui_binding import UIBinder
+from run_writer import FIELDNAMES, IncrementalCSVWriter, record_to_row
+from user_store import UserStore
+from run_catalog import RunCatalog
+from plot_cache import PlotCache, PlotRenderer
+import metrics_overlay
+import run_journal
+import replay
+from experiment_queue import ExperimentQueue, BatchScheduler
+from thermal_profile import load_profile
+from experiment_engine import ExperimentEngine, Stage
+from lazy_screens import LazyScreenManager
+
+startup_profile.end_imports()
 
 Config.set('kivy', 'keyboard_mode', 'systemanddock')
 
 USER_DATA_FILE = os.path.expanduser("~/user_data.json")
 
-def load_users():
-    if not os.path.exists(USER_DATA_FILE):
-        return {"users": []}
-    with open(USER_DATA_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return {"users": []}
+# 用户数据缓存在内存中，文件修改时间变化时才重新读取
+user_store = UserStore(USER_DATA_FILE)
 
-def save_users(data):
-    with open(USER_DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+CSV_DIR = os.path.expanduser("~/csv_files")
+# 运行中的检查点日志，断电/崩溃后用于恢复实验
+JOURNAL_PATH = os.path.join(CSV_DIR, ".current_run.journal")
+# 实验队列（重启后保留）；批量运行时下一个实验的预热与上一个实验的后处理并行
+QUEUE_PATH = os.path.join(CSV_DIR, "experiment_queue.json")
+QUEUE_PREHEAT_SECONDS = 10  # 模拟的模块预热时间（本程序未连接TEC）
+# 以下单例会在界面线程、后处理线程和历史同步线程中首次使用，创建时加锁
+_singleton_lock = threading.Lock()
+_run_catalog = None
+
+def get_catalog():
+    """历史记录索引（SQLite），首次使用时打开"""
+    global _run_catalog
+    if _run_catalog is None:
+        with _singleton_lock:
+            if _run_catalog is None:
+                _run_catalog = RunCatalog(os.path.join(CSV_DIR, "catalog.sqlite3"))
+    return _run_catalog
+
+PLOT_CACHE_DIR = os.path.expanduser("~/.cache/tec_gui/plots")
+_plot_renderer = None
+
+def get_plot_renderer():
+    """曲线图在子进程中渲染，结果按内容哈希缓存为PNG"""
+    global _plot_renderer
+    if _plot_renderer is None:
+        with _singleton_lock:
+            if _plot_renderer is None:
+                _plot_renderer = PlotRenderer(PlotCache(PLOT_CACHE_DIR))
+    return _plot_renderer
+
+def save_run(run_writer, data_records, project_name, user):
+    """
+    Finish a run's CSV and catalogue it -> (csv_path, timestamp); safe off the UI thread
+
+    csv_path is None if the CSV could not be written; the partial data stays in <path>.part.
+    """
+    # 记录已在运行中逐条写入，这里只做刷新和原子重命名
+    csv_path = run_writer.close()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if csv_path is None:
+        print(f"Saving {project_name} failed ({run_writer.error}), partial data kept in {run_writer.part_path}")
+        return None, timestamp
+    
+    # 保存后立即登记到历史索引
+    get_catalog().add_run(csv_path, project=project_name, user=user,
+                          timestamp=timestamp, summary=data_records.summary())
+    get_plot_renderer().request(csv_path)  # 预先渲染报告图
+    
+    print(f"Results saved: {csv_path}")
+    return csv_path, timestamp
 
 def export_to_csv(data_records, filename='data_records.csv'):
+    if hasattr(data_records, 'to_csv'):  # RunRecordStore - vectorised export
+        data_records.to_csv(filename)
+        return
     with open(filename, 'w', newline='') as csvfile:
-        fieldnames = ['elapsed', 'cy5_avg_value1', 'cy5_avg_value2', 'cy5_avg_value3',
-                      'fam_avg_value1', 'fam_avg_value2', 'fam_avg_value3', 'hex_value']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for record in data_records:
-            row_data = {
-                'elapsed': record['elapsed'],
-                'cy5_avg_value1': record['cy5_avg_values'][0],
-                'cy5_avg_value2': record['cy5_avg_values'][1],
-                'cy5_avg_value3': record['cy5_avg_values'][2],
-                'fam_avg_value1': record['fam_avg_values'][0],
-                'fam_avg_value2': record['fam_avg_values'][1],
-                'fam_avg_value3': record['fam_avg_values'][2],
-                'hex_value': record['hex_value'],
-            }
-            writer.writerow(row_data)
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(record_to_row(record) for record in data_records)
 
 # ==================== 自定义UI组件 ====================
 class CircularProgressBar(Widget):
@@ -86,34 +128,40 @@ class CircularProgressBar(Widget):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.bind(pos=self.update_canvas, size=self.update_canvas, percentage=self.update_canvas)
-        Clock.schedule_once(self.update_canvas)
-
-    def update_canvas(self, *args):
-        self.canvas.clear()
+        # 绘图指令只创建一次，之后只修改 pos/size/angle_end
         with self.canvas:
             Color(*self.background_color)
-            Ellipse(pos=self.pos, size=self.size, angle_start=0, angle_end=360)
+            self._track = Ellipse(pos=self.pos, size=self.size, angle_start=0, angle_end=360)
             Color(*self.bar_color)
-            angle = 360 * (self.percentage / 100)
-            Ellipse(pos=self.pos, size=self.size, angle_start=90, angle_end=90 + angle)
+            self._bar = Ellipse(pos=self.pos, size=self.size, angle_start=90, angle_end=90)
+        self.bind(pos=self.update_canvas, size=self.update_canvas, percentage=self.update_percentage)
+        self.update_canvas()
+
+    def update_canvas(self, *args):
+        self._track.pos = self._bar.pos = self.pos
+        self._track.size = self._bar.size = self.size
+        self.update_percentage()
+
+    def update_percentage(self, *args):
+        self._bar.angle_end = 90 + 360 * (self.percentage / 100)
 
 class ProcessFlow(Widget):
     fill_percentage = NumericProperty(0)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.bind(pos=self.update_canvas, size=self.update_canvas, fill_percentage=self.update_canvas)
-        Clock.schedule_once(self.update_canvas)
-    
-    def update_canvas(self, *args):
-        self.canvas.clear()
         with self.canvas:
             Color(0.5, 0.5, 0.5, 1)
-            Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
-            fill_height = self.height * (self.fill_percentage / 100)
+            self._border = Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
             Color(0.2, 0.6, 1, 0.5)
-            Rectangle(pos=(self.x, self.y), size=(self.width, fill_height))
+            self._fill = Rectangle(pos=self.pos, size=(self.width, 0))
+        self.bind(pos=self.update_canvas, size=self.update_canvas, fill_percentage=self.update_canvas)
+        self.update_canvas()
+    
+    def update_canvas(self, *args):
+        self._border.rectangle = (self.x, self.y, self.width, self.height)
+        self._fill.pos = self.pos
+        self._fill.size = (self.width, self.height * (self.fill_percentage / 100))
 
 # ==================== 界面类 ====================
 class HomingScreen(MDScreen):
@@ -140,7 +188,7 @@ class HomingScreen(MDScreen):
 class LockScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.users = load_users()["users"]
+        self.users = user_store.names()
         self.current_index = 0
 
         layout = MDFloatLayout()
@@ -190,7 +238,7 @@ class LockScreen(MDScreen):
     def get_current_user_name(self):
         if not self.users:
             return "No Users"
-        return self.users[self.current_index]["username"]
+        return self.users[self.current_index]
 
     def prev_user(self, *args):
         if self.users:
@@ -216,7 +264,7 @@ class LockScreen(MDScreen):
         self.manager.current = 'create_user'
 
     def on_enter(self, *args):
-        self.users = load_users()["users"]
+        self.users = user_store.names()
         self.current_index = 0
         self.user_label.text = self.get_current_user_name()
 
@@ -269,13 +317,12 @@ class UserLoginScreen(MDScreen):
 
     def login(self, *args):
         password = self.password_field.text.strip()
-        data = load_users()
-        for user in data.get("users", []):
-            if user["username"] == self.selected_username and user["password"] == password:
-                app = MDApp.get_running_app()
-                app.current_user = self.selected_username
-                self.manager.current = "main"
-                return
+        if user_store.check_password(self.selected_username, password):
+            app = MDApp.get_running_app()
+            app.current_user = self.selected_username
+            self.manager.current = "main"
+            app.offer_resume()  # 登录后才提供恢复中断的实验
+            return
         
         snackbar = MDSnackbar(MDSnackbarText(text="Incorrect password"),
                               y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
@@ -342,16 +389,11 @@ class CreateUserScreen(MDScreen):
             snackbar.open()
             return
         
-        data = load_users()
-        for user in data.get("users", []):
-            if user["username"] == username:
-                snackbar = MDSnackbar(MDSnackbarText(text="Username already exists"),
-                                      y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
-                snackbar.open()
-                return
-        
-        data["users"].append({"username": username, "password": password})
-        save_users(data)
+        if not user_store.add(username, password):
+            snackbar = MDSnackbar(MDSnackbarText(text="Username already exists"),
+                                  y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
+            snackbar.open()
+            return
         
         snackbar = MDSnackbar(MDSnackbarText(text="User created successfully!"),
                               y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
@@ -460,6 +502,11 @@ class PreTestScreen(MDScreen):
         self.name_field.add_widget(MDTextFieldHintText(text="Project Name"))
         main_container.add_widget(self.name_field)
         
+        self.profile_field = MDTextField(size_hint=(1, None), height=dp(50))
+        self.profile_field.add_widget(MDTextFieldLeadingIcon(icon="thermometer-lines"))
+        self.profile_field.add_widget(MDTextFieldHintText(text="Thermal Profile (optional)"))
+        main_container.add_widget(self.profile_field)
+        
         start_btn = MDButton(
             MDButtonText(text="Start"),
             size_hint=(1, None),
@@ -468,19 +515,102 @@ class PreTestScreen(MDScreen):
         )
         main_container.add_widget(start_btn)
         
+        # 实验队列：多个项目排队后自动依次运行
+        queue_bar = MDBoxLayout(orientation="horizontal", spacing=dp(20),
+                                size_hint=(1, None), height=dp(50))
+        queue_bar.add_widget(MDButton(
+            MDButtonText(text="Add to Queue"),
+            style="outlined",
+            size_hint=(0.5, 1),
+            on_release=self.add_to_queue
+        ))
+        self.run_queue_text = MDButtonText(text="Run Queue")
+        queue_bar.add_widget(MDButton(
+            self.run_queue_text,
+            style="outlined",
+            size_hint=(0.5, 1),
+            on_release=self.run_queue
+        ))
+        main_container.add_widget(queue_bar)
+        
+        self.queue_label = MDLabel(text="", halign="center", size_hint_y=None, height=dp(40))
+        main_container.add_widget(self.queue_label)
+        
         layout.add_widget(main_container)
         self.add_widget(layout)
     
+    def on_enter(self, *args):
+        MDApp.get_running_app().scheduler.add_listener(self.on_queue_event)
+        self.update_queue_label()
+    
+    def on_leave(self, *args):
+        MDApp.get_running_app().scheduler.remove_listener(self.on_queue_event)
+    
+    def on_queue_event(self, event):
+        Clock.schedule_once(lambda dt: self.update_queue_label())
+    
+    def notify(self, text):
+        snackbar = MDSnackbar(MDSnackbarText(text=text),
+                              y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
+        snackbar.open()
+    
+    def read_fields(self):
+        """(project, profile path or None), or None after telling the user what is wrong"""
+        project = self.name_field.text.strip()
+        if not project:
+            self.notify("Please enter project name")
+            return None
+        profile = self.profile_field.text.strip() or None
+        if profile is not None:
+            profile = os.path.expanduser(profile)
+            try:
+                if not load_profile(profile):
+                    raise ValueError("no steps")
+            except (OSError, ValueError, KeyError) as e:
+                self.notify(f"Invalid thermal profile: {e}")
+                return None
+        return project, profile
+    
     def start_experiment(self, *args):
-        if not self.name_field.text.strip():
-            snackbar = MDSnackbar(MDSnackbarText(text="Please enter project name"),
-                                  y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8)
-            snackbar.open()
+        fields = self.read_fields()
+        if fields is None:
             return
         
         app = MDApp.get_running_app()
-        app.current_project = self.name_field.text.strip()
+        app.current_project, app.current_profile = fields
         self.manager.current = "instruction"
+    
+    def add_to_queue(self, *args):
+        fields = self.read_fields()
+        if fields is None:
+            return
+        app = MDApp.get_running_app()
+        project, profile = fields
+        app.experiment_queue.add(project, user=app.current_user, profile=profile)
+        self.name_field.text = ""
+        self.notify(f"{project} added to queue")
+        self.update_queue_label()
+    
+    def run_queue(self, *args):
+        app = MDApp.get_running_app()
+        if app.scheduler.active:
+            app.scheduler.stop()  # 当前实验结束后不再启动下一个
+        elif app.experiment_queue.next_pending() is None:
+            self.notify("Queue is empty")
+        else:
+            app.scheduler.start()
+        self.update_queue_label()
+    
+    def update_queue_label(self):
+        scheduler = MDApp.get_running_app().scheduler
+        stats = scheduler.stats()
+        text = f"Queue: {stats['pending']} pending, {stats['done']} done"
+        if stats["runs_per_hour"] is not None:
+            text += f"  ·  {stats['runs_per_hour']:.1f} runs/h"
+        if stats["interrupted"]:
+            text += f"  ·  {stats['interrupted']} interrupted"
+        self.queue_label.text = text
+        self.run_queue_text.text = "Stop Queue" if scheduler.active else "Run Queue"
 
 class InstructionScreen(MDScreen):
     def __init__(self, **kwargs):
@@ -536,10 +666,15 @@ class MotorControlScreen(MDScreen):
         super().__init__(**kwargs)
         
         self.locked = False
-        self.stop_requested = False
+        self.engine = None  # ExperimentEngine, 独立线程按截止时间运行
         self.current_cycle = 0
         self.total_cycles = 40
-        self.data_records = []
+        self.data_records = None  # RunRecordStore, created when a run starts
+        self.run_writer = None  # 实验过程中逐周期写入CSV（后台线程）
+        self.journal = None  # 检查点日志（阶段、周期、设定温度、新增记录）
+        self.setpoint = 60  # 循环阶段设定温度（有温度程序时取第一步）
+        self.queue_item_id = None  # 由实验队列启动的运行
+        self.ui_binder = UIBinder()
         
         layout = MDFloatLayout()
         
@@ -558,6 +693,9 @@ class MotorControlScreen(MDScreen):
         self.status_label = MDLabel(text="Ready", size_hint=(0.7, 1))
         top_bar.add_widget(self.status_label)
         
+        self.pause_button = MDIconButton(icon="pause", disabled=True, on_release=self.toggle_pause)
+        top_bar.add_widget(self.pause_button)
+        
         self.stop_button = MDIconButton(icon="stop", disabled=True, on_release=self.stop_experiment)
         top_bar.add_widget(self.stop_button)
         
@@ -623,92 +761,261 @@ class MotorControlScreen(MDScreen):
         
         layout.add_widget(bottom_container)
         self.add_widget(layout)
+        
+        self.ui_binder.bind("status", self.status_label)
+        self.ui_binder.bind("cycle", self.progress_label,
+                            lambda c: f"Cycle: {c} / {self.total_cycles}")
+        self.ui_binder.bind("temp", self.temp_label, "Temp: {:.1f}°C")
+    
+    def on_enter(self, *args):
+        self.ui_binder.start()  # 仅在界面可见时刷新标签，隐藏期间的值保留到下次进入
+    
+    def on_leave(self, *args):
+        self.ui_binder.stop()
     
     def go_back(self, *args):
         if not self.locked:
             self.manager.current = "instruction"
     
     def start_experiment(self, *args):
+        self.begin_run()
+    
+    def begin_run(self, resume=None, item=None):
+        """
+        Start a new run, or continue the one described by run_journal.replay()
+
+        item is an experiment_queue entry when the batch scheduler starts the run.
+        """
         if self.locked:
-            return
+            return False
         
         self.locked = True
-        self.stop_requested = False
-        self.current_cycle = 0
-        self.data_records = []
+        from run_store import RunRecordStore  # numpy 在此首次导入
+        from synthetic_pcr import generate_runs
+        import random
+        
+        app = MDApp.get_running_app()
+        # 回放模式: TEC_REPLAY=<运行文件> 时用记录的数据和循环周期代替模拟数据
+        source = resume["meta"].get("replay") if resume is not None else replay.replay_source()
+        if source and not os.path.isfile(source[0]):
+            # 恢复的实验引用的回放文件已不存在：提示并改用模拟数据
+            MDSnackbar(MDSnackbarText(text=f"Replay file {os.path.basename(source[0])} not found, "
+                                           "using simulated data"),
+                       y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.8).open()
+            source = None
+        run_replay = None
+        if source and not replay.is_telemetry(source[0]):
+            run_replay = replay.RunReplay(*source)
+            self.total_cycles = run_replay.cycles
+        elif item is not None:
+            self.total_cycles = item["cycles"]
+        if resume is None:
+            meta = {
+                "project": getattr(app, 'current_project', 'Unnamed'),
+                "user": getattr(app, 'current_user', ''),
+                "csv_path": self.new_csv_path(),
+                "total_cycles": self.total_cycles,
+                "seed": random.randrange(2 ** 31),
+                "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "replay": list(source) if run_replay is not None else None,
+                "profile": item["profile"] if item is not None else getattr(app, 'current_profile', None),
+                "queue_id": item["id"] if item is not None else None,
+            }
+            done_rows = []
+        else:
+            meta = resume["meta"]
+            done_rows = resume["rows"]
+            self.total_cycles = meta["total_cycles"]
+        self.current_cycle = len(done_rows)
+        self.queue_item_id = meta.get("queue_id")
+        
+        # 温度程序：每个循环执行一遍所有步骤，循环周期为各步保持时间之和
+        period, self.setpoint = 1.0, 60
+        if meta.get("profile"):
+            # 排队后温度程序文件可能被修改或删除：报告失败而不是让 Clock 回调崩溃
+            try:
+                steps = load_profile(meta["profile"])
+                if not steps:
+                    raise ValueError("profile contains no steps")
+            except Exception as e:  # missing file, bad JSON/CSV, missing keys
+                print(f"Cannot load profile {meta['profile']}: {e}")
+                self.ui_binder.publish("status", "Failed: bad profile")
+                self.locked = False
+                if self.queue_item_id is not None:
+                    app.scheduler.run_finished(self.queue_item_id, "failed")
+                    return True  # handled - the scheduler must not put the item back
+                return False
+            period = sum(step.hold for step in steps) or period
+            self.setpoint = steps[0].setpoint
+        if run_replay is not None:
+            period = run_replay.period
+        
+        self.data_records = RunRecordStore(capacity=self.total_cycles)
+        self.data_records.extend(done_rows)
+        # 模拟数据：整条扩增曲线一次生成，每个循环取一行（固定种子，恢复后曲线连续）
+        if run_replay is not None:
+            self.simulated_rows = run_replay.rows
+        else:
+            self.simulated_rows = generate_runs(1, self.total_cycles, seed=meta["seed"])[0]
+        # 恢复时先原子替换日志（第一个检查点包含已完成的全部记录并已 fsync），
+        # 再原子替换 .part 文件，任何时刻断电都不会丢失之前的数据
+        resume_checkpoint = None
+        if done_rows:
+            resume_checkpoint = {"stage": "PCR Cycling", "stage_index": 0, "cycle": self.current_cycle,
+                                 "setpoint": self.setpoint, "rows": done_rows}
+        self.journal = run_journal.RunJournal(JOURNAL_PATH, fsync_every=5).begin(meta, resume_checkpoint)
+        self.run_writer = IncrementalCSVWriter(meta["csv_path"], initial_rows=done_rows).start()
+        
+        self.ui_binder.publish("cycle", self.current_cycle)
+        self.progress_bar.percentage = self.current_cycle / self.total_cycles * 100
         
         self.start_button.disabled = True
+        self.pause_button.disabled = False
         self.stop_button.disabled = False
         self.back_button.disabled = True
         self.step3_button.disabled = True
         
-        self.status_label.text = "Running..."
-        Clock.schedule_interval(self.simulate_cycle, 1.0)
+        self.ui_binder.publish("status", "Running...")
+        self.engine = ExperimentEngine([
+            Stage("PCR Cycling", cycles=self.total_cycles, period=period,
+                  action=self.simulate_cycle, setpoint=self.setpoint, start_cycle=self.current_cycle),
+        ])
+        self.engine.add_listener(self.on_engine_event)
+        self.engine.start()
+        return True
     
-    def simulate_cycle(self, dt):
-        if self.stop_requested:
-            Clock.unschedule(self.simulate_cycle)
-            self.status_label.text = "Stopped"
-            self.unlock_ui()
+    def simulate_cycle(self, cycle):
+        """One acquisition - runs on the engine thread, never touches widgets"""
+        import numpy as np  # 首次运行实验时才加载 numpy
+        
+        index = cycle - 1
+        values = self.simulated_rows[index, 1:]  # cy5 ×3, fam ×3, hex
+        
+        row = [index, *values.tolist()]
+        self.data_records.append(index, values[0:3], values[3:6], values[6])
+        self.run_writer.append_row(row)
+        self.journal.checkpoint("PCR Cycling", 0, cycle, self.setpoint, [row])
+        return self.setpoint + np.random.uniform(-0.5, 0.5)
+    
+    def on_engine_event(self, event):
+        """Engine thread -> UI: labels via UIBinder, widgets via Clock"""
+        if event["type"] == "cycle":
+            self.current_cycle = event["cycle"]
+            self.ui_binder.publish("cycle", event["cycle"])
+            self.ui_binder.publish("temp", event["result"])
+            percentage = event["cycle"] / event["cycles"] * 100
+            Clock.schedule_once(lambda dt: setattr(self.progress_bar, "percentage", percentage))
+        elif event["type"] == "state":
+            state = event["state"]
+            if state == "paused":
+                self.ui_binder.publish("status", "Paused")
+            elif state == "running":
+                self.ui_binder.publish("status", "Running...")
+            elif state == "complete":
+                Clock.schedule_once(lambda dt: self.complete_experiment())
+            elif state in ("stopped", "failed"):
+                Clock.schedule_once(lambda dt: self.abort_experiment(state))
+        elif event["type"] == "timing":
+            print(f"Stage timing - {event['stage']}: {event['timing']}")  # 每阶段实际时长与截止时间误差
+        elif event["type"] == "error":
+            print(f"Experiment failed: {event['error']}")
+    
+    def toggle_pause(self, *args):
+        if self.engine is None:
             return
-        
-        cy5_data = [np.random.uniform(100, 500) for _ in range(3)]
-        fam_data = [np.random.uniform(100, 500) for _ in range(3)]
-        hex_data = np.random.uniform(100, 500)
-        
-        self.data_records.append({
-            'elapsed': self.current_cycle,
-            'cy5_avg_values': cy5_data,
-            'fam_avg_values': fam_data,
-            'hex_value': hex_data
-        })
-        
-        self.current_cycle += 1
-        self.progress_label.text = f"Cycle: {self.current_cycle} / {self.total_cycles}"
-        self.progress_bar.percentage = (self.current_cycle / self.total_cycles) * 100
-        self.temp_label.text = f"Temp: {60 + np.random.uniform(-0.5, 0.5):.1f}°C"
-        
-        if self.current_cycle >= self.total_cycles:
-            Clock.unschedule(self.simulate_cycle)
-            self.complete_experiment()
+        if self.pause_button.icon == "play":
+            self.engine.resume()
+            self.pause_button.icon = "pause"
+        else:
+            self.engine.pause()
+            self.pause_button.icon = "play"
     
     def stop_experiment(self, *args):
-        self.stop_requested = True
+        if self.engine is not None:
+            self.engine.stop()
+    
+    def abort_experiment(self, state):
+        self.ui_binder.publish("status", "Stopped" if state == "stopped" else "Failed")
+        if state == "stopped":
+            self.journal.finish("stopped")  # 用户主动停止，无需恢复
+        else:
+            self.journal.close()  # 出错时保留日志，下次启动可恢复
+        partial = self.run_writer.abort()
+        print(f"Run {state}, partial data kept in {partial}")
+        self.unlock_ui()
+        if self.queue_item_id is not None:
+            MDApp.get_running_app().scheduler.run_finished(self.queue_item_id, state)
     
     def complete_experiment(self):
-        self.status_label.text = "Complete!"
-        self.save_results()
+        self.ui_binder.publish("status", "Complete!")
+        self.journal.finish("complete")
+        if self.queue_item_id is None:
+            self.save_results()
+            self.unlock_ui()
+            return
+        # 队列运行：保存、登记和分析交给后处理线程，同时开始下一个实验的预热
+        app = MDApp.get_running_app()
+        finished = {"run_writer": self.run_writer, "data_records": self.data_records,
+                    "project": app.current_project, "user": app.current_user}
         self.unlock_ui()
+        app.scheduler.run_finished(self.queue_item_id, "complete", finished)
     
-    def save_results(self):
+    def new_csv_path(self):
         app = MDApp.get_running_app()
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         project_name = getattr(app, 'current_project', 'Unnamed')
-        base = f"{project_name}_{ts}"
-        
-        save_dir = os.path.expanduser("~/csv_files")
-        os.makedirs(save_dir, exist_ok=True)
-        
-        csv_path = os.path.join(save_dir, f"{base}_data.csv")
-        export_to_csv(self.data_records, filename=csv_path)
+        return os.path.join(CSV_DIR, f"{project_name}_{ts}_data.csv")
+    
+    def save_results(self):
+        app = MDApp.get_running_app()
+        project_name = getattr(app, 'current_project', 'Unnamed')
         
+        csv_path, timestamp = save_run(self.run_writer, self.data_records, project_name,
+                                       getattr(app, 'current_user', ''))
+        if csv_path is None:
+            self.ui_binder.publish("status", "Save failed - data kept in .part file")
+            return
         app.last_csv = csv_path
         app.last_project = project_name
-        app.last_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        print(f"Results saved: {csv_path}")
+        app.last_time = timestamp
     
     def unlock_ui(self):
         self.locked = False
+        self.engine = None
         self.start_button.disabled = False
+        self.pause_button.disabled = True
+        self.pause_button.icon = "pause"
         self.stop_button.disabled = True
         self.back_button.disabled = False
         self.step3_button.disabled = False
 
+class RunRow(ButtonBehavior, MDBoxLayout):
+    """RecycleView 行视图：只创建一屏数量的控件，滚动时复用"""
+    headline = StringProperty("")
+    detail = StringProperty("")
+    path = StringProperty("")
+    
+    def __init__(self, **kwargs):
+        super().__init__(orientation="vertical", padding=[dp(16), dp(8)], **kwargs)
+        self.headline_label = MDLabel(font_style="Title", role="small")
+        self.detail_label = MDLabel(font_style="Body", role="small")
+        self.add_widget(self.headline_label)
+        self.add_widget(self.detail_label)
+        self.bind(headline=self.headline_label.setter("text"),
+                  detail=self.detail_label.setter("text"))
+    
+    def on_release(self):
+        MDApp.get_running_app().root.get_screen("report").show_plot(self.path)
+
 class ReportScreen(MDScreen):
+    PAGE_SIZE = 50
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
+        self.total_runs = 0
+        self._syncing = False
+        
         layout = MDFloatLayout()
         
         back_btn = MDIconButton(
@@ -729,54 +1036,323 @@ class ReportScreen(MDScreen):
         )
         layout.add_widget(title)
         
-        scroll = MDScrollView(
-            pos_hint={"center_x": 0.5, "center_y": 0.5},
-            size_hint=(0.9, 0.75)
+        self.run_list = RecycleView(
+            pos_hint={"x": 0.03, "center_y": 0.48},
+            size_hint=(0.5, 0.72)
+        )
+        self.run_list.viewclass = RunRow
+        rows = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, dp(64)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        rows.bind(minimum_height=rows.setter("height"))
+        self.run_list.add_widget(rows)
+        self.run_list.bind(scroll_y=self.on_list_scroll)
+        layout.add_widget(self.run_list)
+        
+        # 右侧：选中记录的曲线图（后台渲染，缓存命中时直接显示）
+        self.plot_image = Image(
+            pos_hint={"right": 0.98, "center_y": 0.48},
+            size_hint=(0.43, 0.72),
+            fit_mode="contain",
+            opacity=0
+        )
+        layout.add_widget(self.plot_image)
+        
+        self.plot_status = MDLabel(
+            text="Tap a run to view its curves",
+            halign="center",
+            pos_hint={"center_x": 0.765, "center_y": 0.48},
+            size_hint=(0.43, None),
+            height=dp(30)
+        )
+        layout.add_widget(self.plot_status)
+        
+        # 曲线分析结果（Ct 值、重复孔变异）
+        self.analysis_label = MDLabel(
+            text="",
+            halign="center",
+            font_style="Body",
+            role="small",
+            pos_hint={"center_x": 0.765, "y": 0.02},
+            size_hint=(0.43, None),
+            height=dp(60)
         )
+        layout.add_widget(self.analysis_label)
         
-        self.report_list = MDList()
-        scroll.add_widget(self.report_list)
-        layout.add_widget(scroll)
+        self.count_label = MDLabel(
+            text="No data",
+            halign="center",
+            pos_hint={"center_x": 0.5, "y": 0.02},
+            size_hint_y=None,
+            height=dp(30)
+        )
+        layout.add_widget(self.count_label)
         
         self.add_widget(layout)
     
     def on_enter(self):
         self.refresh_list()
+        # 后台增量同步 ~/csv_files（只重新读取有变化的文件）
+        if not self._syncing:
+            self._syncing = True
+            threading.Thread(target=self._sync_catalog, daemon=True).start()
+    
+    def _sync_catalog(self):
+        try:
+            updated, removed = get_catalog().sync_directory(CSV_DIR)
+        finally:
+            self._syncing = False
+        if updated or removed:
+            Clock.schedule_once(lambda dt: self.refresh_list())
     
     def refresh_list(self):
-        self.report_list.clear_widgets()
-        
-        app = MDApp.get_running_app()
-        
-        if hasattr(app, 'last_project'):
-            item = MDListItem()
-            item.add_widget(MDListItemLeadingIcon(icon="file-document"))
-            item.add_widget(MDListItemHeadlineText(text=f"{app.last_project} - {app.last_time}"))
-            self.report_list.add_widget(item)
+        self.total_runs = get_catalog().count()
+        self.run_list.data = []
+        self.run_list.scroll_y = 1
+        self.load_next_page()
+    
+    def load_next_page(self):
+        offset = len(self.run_list.data)
+        if offset and offset >= self.total_runs:
+            return
+        runs = get_catalog().page(offset=offset, limit=self.PAGE_SIZE)
+        self.run_list.data.extend(self.row_data(run) for run in runs)
+        self.update_count_label()
+    
+    def row_data(self, run):
+        user = f"  ·  {run['user']}" if run["user"] else ""
+        finals = ""
+        if run["cy5_final"] is not None:
+            finals = (f"  ·  Cy5 {run['cy5_final']:.0f}  FAM {run['fam_final']:.0f}"
+                      f"  HEX {run['hex_final']:.0f}")
+        return {
+            "headline": f"{run['project']} - {run['timestamp']}",
+            "detail": f"{run['cycles']} cycles{user}{finals}",
+            "path": run["path"],
+        }
+    
+    def update_count_label(self):
+        if not self.total_runs:
+            self.count_label.text = "No data"
         else:
-            empty_label = MDLabel(text="No data", halign="center")
-            self.report_list.add_widget(empty_label)
+            self.count_label.text = f"Showing {len(self.run_list.data)} of {self.total_runs} runs"
+    
+    def show_plot(self, run_path):
+        self.plot_image.opacity = 0
+        self.plot_status.text = "Rendering..."
+        get_plot_renderer().request(
+            run_path,
+            callback=lambda png: Clock.schedule_once(lambda dt: self._display_plot(png))
+        )
+        self.analysis_label.text = "Analysing..."
+        threading.Thread(target=self._analyse_run, args=(run_path,), daemon=True).start()
+    
+    def _analyse_run(self, run_path):
+        from run_store import RunRecordStore
+        import pcr_analysis
+        
+        try:
+            summary = pcr_analysis.summarize(pcr_analysis.analyse_run(RunRecordStore.load(run_path)))
+            text = self.format_analysis(summary)
+        except Exception as e:
+            text = f"Analysis failed: {e}"
+        Clock.schedule_once(lambda dt: setattr(self.analysis_label, "text", text))
+    
+    def format_analysis(self, summary):
+        parts = []
+        for name in ("cy5", "fam", "hex"):
+            ct = summary.get(f"ct_{name}_mean")
+            if ct is None:
+                parts.append(f"{name.upper()} Ct: --")
+                continue
+            sd = summary.get(f"ct_{name}_sd")
+            parts.append(f"{name.upper()} Ct: {ct:.2f}" + (f" ± {sd:.2f}" if sd is not None else ""))
+        return "\n".join(parts)
+    
+    def _display_plot(self, png_path):
+        if png_path is None:
+            self.plot_status.text = "Plot failed"
+            return
+        self.plot_image.source = png_path
+        self.plot_image.opacity = 1
+        self.plot_status.text = ""
+    
+    def on_list_scroll(self, instance, scroll_y):
+        # 接近底部时加载下一页
+        if scroll_y <= 0.05 and len(self.run_list.data) < self.total_runs:
+            self.load_next_page()
 
 class MainApp(MDApp):
     def build(self):
-        sm = MDScreenManager()
-        
-        sm.add_widget(HomingScreen(name="homing"))
-        sm.add_widget(LockScreen(name="lock"))
-        sm.add_widget(UserLoginScreen(name="user_login"))
-        sm.add_widget(CreateUserScreen(name="create_user"))
-        sm.add_widget(MainScreen(name="main"))
-        sm.add_widget(PreTestScreen(name="pretest"))
-        sm.add_widget(InstructionScreen(name="instruction"))
-        sm.add_widget(MotorControlScreen(name="isothermal"))
-        sm.add_widget(ReportScreen(name="report"))
+        # 渲染子进程必须在任何后台线程启动之前 fork
+        get_plot_renderer().start()
+        self.experiment_queue = ExperimentQueue(QUEUE_PATH)
+        self.scheduler = BatchScheduler(
+            self.experiment_queue,
+            start_run=self.start_queued_run,
+            preheat=self.preheat_block,
+            post_process=self.post_process_run,
+            dispatch=lambda fn: Clock.schedule_once(lambda dt: fn()),
+        )
+        
+        sm = LazyScreenManager()
+        
+        # 界面在首次进入时才创建；空闲帧预先创建下一步可能进入的界面
+        # (名称, 类, 在哪些界面之后预热, 内存不足时可释放)
+        screens = [
+            ("homing", HomingScreen, [], True),
+            ("lock", LockScreen, ["homing"], False),
+            ("user_login", UserLoginScreen, ["lock"], True),
+            ("create_user", CreateUserScreen, ["lock"], True),
+            ("main", MainScreen, ["user_login"], False),
+            ("pretest", PreTestScreen, ["main"], True),
+            ("instruction", InstructionScreen, ["pretest"], True),
+            ("isothermal", MotorControlScreen, ["instruction"], False),  # 运行中的实验不能释放
+            ("report", ReportScreen, ["main", "isothermal"], True),
+        ]
+        for name, screen_cls, prewarm_after, droppable in screens:
+            sm.register(name, screen_cls, prewarm_after=prewarm_after, droppable=droppable)
         
         sm.current = "homing"
         
         self.homed_ok = False
         self.current_user = "Guest"
+        self.current_profile = None
+        self.resume_offered = False
         
         return sm
+    
+    def on_start(self):
+        startup_profile.watch_first_frame()
+        # TEC_METRICS=1: Clock lag + /metrics endpoint; TEC_METRICS_OVERLAY=1 显示叠加层
+        # 根控件是 ScreenManager（只接受 Screen），叠加层加到窗口上，切换界面时一直可见
+        from kivy.core.window import Window
+        metrics_overlay.install(Window)
+    
+    def offer_resume(self):
+        """
+        上次实验未完成（崩溃/断电）时询问是否从最后的检查点继续
+        
+        Called after a successful login, once per session, so resuming never bypasses the lock screen.
+        """
+        if self.resume_offered:
+            return
+        self.resume_offered = True
+        state = run_journal.replay(JOURNAL_PATH)
+        if state is None:
+            return
+        meta = state["meta"]
+        if state["cycle"] >= meta["total_cycles"]:
+            self.finalize_interrupted_run(state)
+            return
+        from kivymd.uix.dialog import (
+            MDDialog, MDDialogIcon, MDDialogHeadlineText,
+            MDDialogContentContainer, MDDialogButtonContainer
+        )
+        
+        dialog = MDDialog(
+            MDDialogIcon(icon="restore"),
+            MDDialogHeadlineText(text="Resume Interrupted Run?"),
+            MDDialogContentContainer(
+                MDLabel(
+                    text=f"Project: {meta['project']}\nStarted: {meta['started']}\n"
+                         f"Completed cycles: {state['cycle']} / {meta['total_cycles']}",
+                    halign="center"
+                ),
+                orientation="vertical",
+            ),
+            MDDialogButtonContainer(
+                MDButton(
+                    MDButtonText(text="Discard"),
+                    style="text",
+                    on_release=lambda x: self.discard_interrupted_run(dialog, meta)
+                ),
+                MDButton(
+                    MDButtonText(text="Resume"),
+                    style="text",
+                    on_release=lambda x: self.resume_interrupted_run(dialog, state)
+                ),
+                spacing="8dp",
+            ),
+        )
+        dialog.open()
+    
+    def finalize_interrupted_run(self, state):
+        """所有循环已完成，但保存前崩溃：用日志中的记录补完 CSV 并登记，不再询问"""
+        from run_store import RunRecordStore
+        meta = state["meta"]
+        records = RunRecordStore(capacity=len(state["rows"]))
+        records.extend(state["rows"])
+        # 日志中的记录已全部 fsync；.part 可能缺少最后几行，按日志原子重写后再重命名
+        try:
+            writer = IncrementalCSVWriter(meta["csv_path"], initial_rows=state["rows"]).start()
+        except OSError as e:
+            print(f"Cannot finish interrupted run {meta['project']}: {e}")
+            return  # 保留日志，下次启动再试
+        csv_path, timestamp = save_run(writer, records, meta["project"], meta["user"])
+        if csv_path is None:
+            return
+        if meta.get("queue_id") is not None and self.experiment_queue.get(meta["queue_id"]):
+            self.experiment_queue.mark_finished(meta["queue_id"], "complete")
+        run_journal.discard(JOURNAL_PATH)
+        self.last_csv, self.last_project, self.last_time = csv_path, meta["project"], timestamp
+        print(f"Interrupted run {meta['project']} had finished all cycles, saved as {csv_path}")
+    
+    def resume_interrupted_run(self, dialog, state):
+        dialog.dismiss()
+        meta = state["meta"]
+        self.current_project = meta["project"]  # 用户保持为当前登录用户
+        self.root.current = "isothermal"
+        self.root.get_screen("isothermal").begin_run(resume=state)
+    
+    def discard_interrupted_run(self, dialog, meta):
+        dialog.dismiss()
+        run_journal.discard(JOURNAL_PATH)
+        print(f"Interrupted run discarded, partial data kept in {meta['csv_path']}.part")
+    
+    # ==================== 实验队列 ====================
+    def start_queued_run(self, item):
+        """Scheduler -> UI thread: run the next queued experiment; False if the instrument is busy"""
+        screen = self.root.get_screen("isothermal")
+        if screen.locked:
+            return False
+        self.current_project = item["project"]
+        self.current_user = item["user"] or self.current_user
+        self.root.current = "isothermal"
+        return screen.begin_run(item=item)
+    
+    def preheat_block(self, item):
+        """Preheat worker: bring the block to the first setpoint while the last run is post-processed"""
+        time.sleep(QUEUE_PREHEAT_SECONDS)
+    
+    def post_process_run(self, item, finished):
+        """Post worker: save, catalogue and analyse a completed queued run"""
+        if finished is None:
+            return None  # stopped / failed - the partial file was kept by abort_experiment
+        from pcr_analysis import analyse_run, summarize
+        
+        csv_path, timestamp = save_run(finished["run_writer"], finished["data_records"],
+                                       finished["project"], finished["user"])
+        if csv_path is None:
+            return {"error": f"save failed, partial data in {finished['run_writer'].part_path}"}
+        
+        def remember(dt):
+            self.last_csv = csv_path
+            self.last_project = finished["project"]
+            self.last_time = timestamp
+        Clock.schedule_once(remember)
+        
+        summary = summarize(analyse_run(finished["data_records"]))
+        return {"csv_path": csv_path,
+                "ct": {name: summary.get(f"ct_{name}_mean") for name in ("cy5", "fam", "hex")}}
+    
+    def on_stop(self):
+        self.scheduler.shutdown()
+        if _plot_renderer is not None:
+            _plot_renderer.shutdown()
 
 if __name__ == "__main__":
     MainApp().run()
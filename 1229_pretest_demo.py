@@ -12,7 +12,6 @@ Key Learning Topics:
 """
 
 from kivy.metrics import dp
-from kivy.clock import Clock
 from kivy.core.window import Window
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
@@ -30,6 +29,9 @@ from kivymd.uix.dialog import (
 )
 from datetime import datetime
 
+from ui_binding import UIBinder
+from ticker import TICKER
+
 
 class PreTestScreen(MDScreen):
     """
@@ -167,9 +169,23 @@ class PreTestScreen(MDScreen):
         self.time_card.add_widget(self.time_label)
         self.add_widget(self.time_card)
         
+        # ========== Per-frame Label Dispatcher ==========
+        # Timers publish values; labels are updated only when text changes
+        self.ui_binder = UIBinder()
+        self.ui_binder.bind("date", self.date_label)
+        self.ui_binder.bind("time", self.time_label)
+        # Dispatcher and timer are started in on_enter, stopped in on_leave
+    
+    def on_enter(self, *args):
+        """Screen shown - attach to the shared ticker"""
+        self.ui_binder.start()
         # ========== Start Timer ==========
-        Clock.schedule_interval(self.update_time, 1)
-        self.update_time(0)
+        TICKER.attach("time", self.update_time)
+    
+    def on_leave(self, *args):
+        """Screen hidden - detach so hidden screens cost nothing"""
+        TICKER.detach("time", self.update_time)
+        self.ui_binder.stop()
     
     def on_back_clicked(self, *args):
         """Back button click handler"""
@@ -266,24 +282,24 @@ class PreTestScreen(MDScreen):
         # Clear input field after starting
         self.name_field.text = ""
     
-    def update_time(self, dt):
+    def update_time(self, now):
         """
         Update date and time display
         
         Parameters:
-            dt: Time interval from Clock (required)
+            now: Current datetime from the shared ticker
         """
-        now = datetime.now()
-        
+        # Publish only - the dispatcher skips labels whose text is unchanged
         # Format date: Dec 29, 2025
-        self.date_label.text = now.strftime("%b %d, %Y")
+        self.ui_binder.publish("date", now.strftime("%b %d, %Y"))
         
         # Format time: 2:30 PM
         try:
-            self.time_label.text = now.strftime("%-I:%M %p")
+            time_text = now.strftime("%-I:%M %p")
         except ValueError:
             # Windows uses %#I instead of %-I
-            self.time_label.text = now.strftime("%#I:%M %p")
+            time_text = now.strftime("%#I:%M %p")
+        self.ui_binder.publish("time", time_text)
 
 
 class DemoApp(MDApp):
@@ -2,8 +2,99 @@ import spidev
 import RPi.GPIO as GPIO
 import time
 
+# 温度 (°C) -> MAX5144 DAC 码值
+TEMPERATURE_TO_DAC_VALUE = {
+    15: 10099,
+    16: 9912,
+    17: 9725,
+    18: 9548,
+    19: 9361,
+    20: 9174,
+    21: 8987,
+    22: 8811,
+    23: 8623,
+    24: 8447,
+    25: 8260,
+    26: 8084,
+    27: 7896,
+    28: 7720,
+    29: 7544,
+    30: 7368,
+    31: 7203,
+    32: 7026,
+    33: 6861,
+    34: 6696,
+    35: 6531,
+    36: 6366,
+    37: 6200,
+    38: 6046,
+    39: 5892,
+    40: 5738,
+    41: 5595,
+    42: 5441,
+    43: 5297,
+    44: 5165,
+    45: 5022,
+    46: 4890,
+    47: 4758,
+    48: 4626,
+    49: 4493,
+    50: 4372,
+    51: 4251,
+    52: 4141,
+    53: 4020,
+    54: 3910,
+    55: 3800,
+    56: 3689,
+    57: 3590,
+    58: 3491,
+    59: 3392,
+    60: 3293,
+    61: 3194,
+    62: 3106,
+    63: 3018,
+    64: 2930,
+    65: 2852,
+    66: 2764,
+    67: 2687,
+    68: 2610,
+    69: 2533,
+    70: 2467,
+    71: 2390,
+    72: 2324,
+    73: 2258,
+    74: 2192,
+    75: 2126,
+    76: 2070,
+    77: 2004,
+    78: 1949,
+    79: 1894,
+    80: 1839,
+    81: 1795,
+    82: 1740,
+    83: 1696,
+    84: 1641,
+    85: 1597,
+    86: 1553,
+    87: 1509,
+    88: 1465,
+    89: 1421,
+    90: 1388,
+    91: 1344,
+    92: 1311,
+    93: 1278,
+    94: 1233,
+    95: 1200,
+    96: 1167,
+    97: 1145,
+    98: 1112,
+    99: 1079,
+}
+
+
 class MAX5144:
     def __init__(self, spi_bus, spi_device, cs_pin):
+        self.spi_bus = spi_bus
         self.spi = spidev.SpiDev()
         self.spi.open(spi_bus, spi_device)
         self.spi.max_speed_hz = 500000
@@ -29,115 +120,39 @@ class MAX5144:
         self.spi.close()
 
 class TECController:
-    def __init__(self, max5144):
+    def __init__(self, max5144, enable_pin=4):
         self.max5144 = max5144
+        self.enable_pin = enable_pin  # MAX1978控制引脚（多通道时每个通道不同）
         GPIO.setmode(GPIO.BCM)
-        GPIO.setup(4, GPIO.OUT)  # MAX1978控制引脚
-        GPIO.output(4, GPIO.HIGH)  # 打开MAX1978
+        GPIO.setup(self.enable_pin, GPIO.OUT)
+        GPIO.output(self.enable_pin, GPIO.HIGH)  # 打开MAX1978
+        self.dac_value = None  # 最近一次写入的DAC码值
 
     def set_temperature(self, temperature):
-        temperature_to_dac_value = {
-        15: 10099,
-        16: 9912,
-        17: 9725,
-        18: 9548,
-        19: 9361,
-        20: 9174,
-        21: 8987,
-        22: 8811,
-        23: 8623,
-        24: 8447,
-        25: 8260,
-        26: 8084,
-        27: 7896,
-        28: 7720,
-        29: 7544,   
-        30: 7368,
-        31: 7203,
-        32: 7026,
-        33: 6861,
-        34: 6696,
-        35: 6531,
-        36: 6366,
-        37: 6200,
-        38: 6046,
-        39: 5892,
-        40: 5738,
-        41: 5595,
-        42: 5441,
-        43: 5297,
-        44: 5165,
-        45: 5022,
-        46: 4890,
-        47: 4758,
-        48: 4626,
-        49: 4493,
-        50: 4372,
-        51: 4251,
-        52: 4141,
-        53: 4020,
-        54: 3910,
-        55: 3800,
-        56: 3689,
-        57: 3590,
-        58: 3491,
-        59: 3392,
-        60: 3293,
-        61: 3194,
-        62: 3106,
-        63: 3018,
-        64: 2930,
-        65: 2852,
-        66: 2764,
-        67: 2687,
-        68: 2610,
-        69: 2533,
-        70: 2467,
-        71: 2390,
-        72: 2324,
-        73: 2258,
-        74: 2192,
-        75: 2126,
-        76: 2070,
-        77: 2004,
-        78: 1949,
-        79: 1894,
-        80: 1839,
-        81: 1795,
-        82: 1740,
-        83: 1696,
-        84: 1641,
-        85: 1597,
-        86: 1553,
-        87: 1509,
-        88: 1465,
-        89: 1421,
-        90: 1388,
-        91: 1344,
-        92: 1311,
-        93: 1278,
-        94: 1233,
-        95: 1200,
-        96: 1167,
-        97: 1145,
-        98: 1112,
-        99: 1079,    
-        }
-        dac_value = temperature_to_dac_value.get(temperature)
+        dac_value = TEMPERATURE_TO_DAC_VALUE.get(temperature)
         if dac_value is not None:
             self.max5144.set_dac_output(dac_value)
+            self.dac_value = dac_value
             print(f"Set temperature to {temperature}°C with DAC value {dac_value}")
+            return True
         else:
             print("Temperature out of range")
+            return False
+
+    def enable(self):
+        GPIO.output(self.enable_pin, GPIO.HIGH)
+
+    def disable(self):
+        GPIO.output(self.enable_pin, GPIO.LOW)
 
     def manual_control_max1978(self):
         while True:
             command = input("Enter 'on' to turn on MAX1978, 'off' to turn off, or 'exit' to quit: ").strip().lower()
             if command == 'on':
-                GPIO.output(4, GPIO.HIGH)
+                GPIO.output(self.enable_pin, GPIO.HIGH)
                 print("MAX1978 turned ON")
             elif command == 'off':
-                GPIO.output(4, GPIO.LOW)
+                GPIO.output(self.enable_pin, GPIO.LOW)
                 print("MAX1978 turned OFF")
             elif command == 'exit':
                 print("Exiting manual control")
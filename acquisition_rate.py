@@ -0,0 +1,94 @@
+"""
+Stage-aware acquisition rate - no Kivy dependency
+
+A fixed 0.5 s tick spends most of its SPI reads on long plateaus where the
+temperature does not move. RatePolicy picks the next tick interval from
+the control state of the profile engine (TECService.stage) and the last
+reading:
+
+    ramp                                  -> fast   (full resolution)
+    hold, within `settle` s of reaching
+      the setpoint or of a crossing       -> fast   (overshoot / ringing)
+    hold, off by more than `band` °C      -> normal (drifting, watch it)
+    hold, settled                         -> slow
+    idle (no setpoint)                    -> idle
+
+A crossing is a sign change of (temperature - setpoint) between two
+readings. Every call is counted per mode, so stats() shows how many reads
+the policy saved compared with ticking at `fast` all the time:
+
+    policy = RatePolicy(fast=0.1, normal=0.5, slow=2.0)
+    service = TECService(tec_controller, sensor, rate=policy)
+    policy.stats()
+    {"mode": "slow", "ticks": {"fast": 412, "normal": 3, "slow": 290, "idle": 1},
+     "seconds": {...}, "saved_reads": 5420}
+"""
+
+import time
+
+MODES = ("fast", "normal", "slow", "idle")
+
+
+class RatePolicy:
+    def __init__(self, fast=0.1, normal=0.5, slow=2.0, idle=5.0, band=1.0, settle=10.0,
+                 clock=time.monotonic):
+        self.intervals = {"fast": fast, "normal": normal, "slow": slow, "idle": idle}
+        self.band = band          # °C, a hold further off than this is sampled at `normal`
+        self.settle = settle      # seconds at `fast` after reaching the setpoint or crossing it
+        self.clock = clock
+
+        self.mode = "idle"
+        self._stage = None
+        self._setpoint = None
+        self._last_error = None
+        self._fast_until = 0.0
+
+        # Statistics
+        self.ticks = {mode: 0 for mode in MODES}
+        self.seconds = {mode: 0.0 for mode in MODES}
+
+    def reset(self):
+        """Forget the crossing history, e.g. when a new run starts"""
+        self._stage = None
+        self._setpoint = None
+        self._last_error = None
+        self._fast_until = 0.0
+
+    def choose(self, stage, setpoint, temperature, now=None):
+        """Mode for the next tick from the current stage and reading"""
+        now = self.clock() if now is None else now
+        if stage == "idle" or setpoint is None:
+            self.reset()
+            return "idle"
+
+        error = None if temperature is None else temperature - setpoint
+        if setpoint != self._setpoint:
+            self._last_error = None      # a new target is not a crossing
+        elif error and self._last_error and (error > 0) != (self._last_error > 0):
+            self._fast_until = now + self.settle
+        if stage == "hold" and self._stage != "hold":
+            self._fast_until = now + self.settle
+        self._stage = stage
+        self._setpoint = setpoint
+        self._last_error = error
+
+        if stage != "hold" or now < self._fast_until:
+            return "fast"
+        if error is None or abs(error) > self.band:
+            return "normal"
+        return "slow"
+
+    def interval(self, stage, setpoint, temperature, now=None):
+        """Seconds until the next tick; the choice is counted in stats()"""
+        self.mode = self.choose(stage, setpoint, temperature, now)
+        seconds = self.intervals[self.mode]
+        self.ticks[self.mode] += 1
+        self.seconds[self.mode] += seconds
+        return seconds
+
+    def stats(self):
+        fast_reads = sum(self.seconds.values()) / self.intervals["fast"]
+        return {"mode": self.mode, "ticks": dict(self.ticks),
+                "seconds": {mode: round(s, 1) for mode, s in self.seconds.items()},
+                "saved_reads": int(fast_reads - sum(self.ticks.values()))}
+
@@ -1,7 +1,6 @@
 import spidev
 import RPi.GPIO as GPIO
 import time
-from scipy.stats import zscore
 
 class TemperatureSensor:
     # Constants for the voltage divider
@@ -23,15 +22,16 @@ class TemperatureSensor:
     100: 0.095
     }
 
-    def __init__(self):
+    def __init__(self, spi_bus=5, spi_device=0, cs_pin=12, channel=6):
         # Setup SPI
+        self.spi_bus = spi_bus
         self.spi = spidev.SpiDev()
-        self.spi.open(5, 0)  # Use SPI port 1, device 0 (CE0)
+        self.spi.open(spi_bus, spi_device)  # Default: SPI port 5, device 0 (CE0)
         self.spi.max_speed_hz = 500000  # 1 MHz 
         self.spi.mode = 0b01
 
         # Define the chip select pin in BCM numbering system
-        self.CS_PIN = 12  # BCM GPIO16
+        self.CS_PIN = cs_pin  # Default: BCM GPIO12
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self.CS_PIN, GPIO.OUT)
         GPIO.output(self.CS_PIN, GPIO.HIGH)
@@ -41,7 +41,8 @@ class TemperatureSensor:
         self.AD7928_CODING = 0x0001    # Straight binary coding
         self.AD7928_PM_MODE_OPS = 0x0030  # Normal operation mode
         self.AD7928_SEQUENCE_OFF = 0x0000  # Sequence function off
-        self.CHANNEL = 6  # Select channel 4
+        self.CHANNEL = channel  # ADC input the thermistor is wired to (default 6)
+        self.last_raw = None  # Filtered mean ADC code of the last read_temperature()
 
         # Initialize AD7928
         command = self.AD7928_WRITE_CR | (self.CHANNEL << 6) | self.AD7928_CODING | self.AD7928_PM_MODE_OPS | self.AD7928_SEQUENCE_OFF
@@ -88,7 +89,10 @@ class TemperatureSensor:
     def read_temperature(self):
         # 收集多个温度读取值样本
         num_samples = 100   #!!!!!!!改这里！！！！！！
-        samples = [self.read_adc(6) for _ in range(num_samples)]
+        samples = [self.read_adc(self.CHANNEL) for _ in range(num_samples)]
+
+        # scipy 仅在首次读温度时导入，避免拖慢启动（无界面守护进程需要快速启动）
+        from scipy.stats import zscore
 
         # 计算z-score
         z_scores = zscore(samples) if len(samples) > 1 else [0] * len(samples)
@@ -102,6 +106,8 @@ class TemperatureSensor:
         else:
             filtered_mean = sum(samples) / len(samples)  # 如果所有样本都被过滤掉，则使用原始平均值
 
+        self.last_raw = filtered_mean
+
         # 将过滤后的平均值转换为温度
         temperature = self.adc_value_to_voltage(filtered_mean)
         temperature = self.get_temperature_from_voltage(temperature)
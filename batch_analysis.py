@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Batch re-analysis of saved runs
+
+Examples:
+    python3 batch_analysis.py                          # ~/csv_files -> ~/csv_files/analysis_summary.csv
+    python3 batch_analysis.py --threshold-sd 8 --baseline 3 12
+    python3 batch_analysis.py --dir /mnt/archive --out summary.csv --workers 8
+    python3 batch_analysis.py --force                  # ignore the manifest, redo everything
+
+Run CSVs (<project>_<YYYYmmdd_HHMMSS>_data.csv) are analysed with
+pcr_analysis in a process pool spread over all cores; workers return only the
+flat summary row, never the curves. Results go to one summary CSV, one row
+per run.
+
+A JSON manifest next to the summary records, per run, the file's
+mtime/size, a hash of the analysis parameters and the summary row. On the
+next pass a file is re-analysed only if it changed or the parameters did,
+and rows of deleted files are dropped.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from run_catalog import RUN_FILE_RE, parse_run_filename
+
+DEFAULT_DIR = os.path.expanduser("~/csv_files")
+SUMMARY_NAME = "analysis_summary.csv"
+MANIFEST_VERSION = 1
+
+
+# ========== Discovery ==========
+def discover_runs(directory):
+    """Run CSVs in directory, sorted by name"""
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return []
+    return sorted(e.path for e in entries if e.is_file() and RUN_FILE_RE.match(e.name))
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def params_hash(params):
+    blob = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+# ========== Worker side ==========
+def analyse_file(path, params):
+    """Analyse one run CSV (runs in a worker process) -> (path, row or None, error)"""
+    try:
+        import numpy as np
+
+        import pcr_analysis
+        from run_store import RunRecordStore
+
+        store = RunRecordStore.load(path)
+        result = pcr_analysis.analyse_run(
+            store,
+            baseline=tuple(params["baseline"]),
+            threshold=params["threshold"],
+            threshold_sd=params["threshold_sd"],
+            sigmoid=params["sigmoid"],
+        )
+        row = pcr_analysis.summarize(result)
+        if params["sigmoid"]:
+            # midpoint of the fitted curve, averaged over the wells of each channel
+            for c, name in enumerate(pcr_analysis.CHANNELS):
+                xhalf = result["sigmoid"][:, c, 2]
+                xhalf = xhalf[~np.isnan(xhalf)]
+                row[f"xhalf_{name}_mean"] = round(float(xhalf.mean()), 3) if xhalf.size else None
+        return path, row, None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def _analyse_task(task):
+    return analyse_file(*task)
+
+
+# ========== Manifest / output ==========
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("runs", {})
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".batch.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_manifest(path, runs):
+    _atomic_write(path, lambda f: json.dump({"version": MANIFEST_VERSION, "runs": runs}, f))
+
+
+def write_summary(path, runs):
+    """One row per run, newest first; columns are the union over all runs"""
+    rows = []
+    for run_path, entry in runs.items():
+        if entry.get("row") is None:
+            continue
+        project, timestamp = parse_run_filename(run_path)
+        rows.append({"file": os.path.basename(run_path), "project": project,
+                     "timestamp": timestamp, **entry["row"]})
+    rows.sort(key=lambda r: (r["timestamp"] or "", r["file"]), reverse=True)
+
+    fields = ["file", "project", "timestamp"]
+    for row in rows:
+        fields.extend(k for k in row if k not in fields)
+
+    def write(f):
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    _atomic_write(path, write)
+    return len(rows)
+
+
+# ========== Batch ==========
+def run_batch(directory, out_path, params, manifest_path=None, workers=None, force=False,
+              progress=None):
+    """
+    Analyse every changed run in directory and rewrite the summary table
+
+    Returns a stats dict (total, analysed, skipped, failed, removed, rows, seconds).
+    """
+    start = time.perf_counter()
+    manifest_path = manifest_path or out_path + ".manifest.json"
+    phash = params_hash(params)
+    old = {} if force else load_manifest(manifest_path)
+
+    paths = discover_runs(directory)
+    runs = {}
+    todo = []
+    for path in paths:
+        try:
+            stamp = file_stamp(path)
+        except FileNotFoundError:
+            continue
+        entry = old.get(path)
+        if (entry and entry["stamp"] == stamp and entry["params"] == phash
+                and entry.get("row") is not None):   # failed files are retried
+            runs[path] = entry
+        else:
+            runs[path] = {"stamp": stamp, "params": phash, "row": None}
+            todo.append(path)
+
+    failed = 0
+    if todo:
+        workers = workers or os.cpu_count() or 1
+        tasks = [(path, params) for path in todo]
+        # several files per task so short runs do not drown in IPC overhead
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, (path, row, error) in enumerate(pool.map(_analyse_task, tasks, chunksize=chunksize), 1):
+                if error is not None:
+                    failed += 1
+                    runs[path]["error"] = error
+                    print(f"Skipping {path}: {error}", file=sys.stderr)
+                runs[path]["row"] = row
+                if progress is not None:
+                    progress(done, len(tasks))
+
+    save_manifest(manifest_path, runs)
+    rows = write_summary(out_path, runs)
+    return {
+        "total": len(paths),
+        "analysed": len(todo) - failed,
+        "skipped": len(paths) - len(todo),
+        "failed": failed,
+        "removed": len(set(old) - set(runs)),
+        "rows": rows,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Re-analyse saved runs into one summary table")
+    parser.add_argument("--dir", default=DEFAULT_DIR,
+                        help=f"directory with run CSVs (default {DEFAULT_DIR})")
+    parser.add_argument("--out", help=f"summary CSV (default <dir>/{SUMMARY_NAME})")
+    parser.add_argument("--manifest", help="manifest file (default <out>.manifest.json)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--baseline", type=int, nargs=2, metavar=("START", "END"),
+                        default=None, help="baseline cycle window [START, END) (default 3 15)")
+    threshold = parser.add_mutually_exclusive_group()
+    threshold.add_argument("--threshold-sd", type=float, default=None,
+                           help="threshold in baseline SDs (default 10)")
+    threshold.add_argument("--threshold", type=float,
+                           help="fixed threshold in fluorescence units")
+    parser.add_argument("--no-sigmoid", action="store_true", help="skip the logistic fit")
+    parser.add_argument("--force", action="store_true", help="re-analyse every file")
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # pcr_analysis needs numpy; only its defaults are needed here
+    from pcr_analysis import DEFAULT_BASELINE, DEFAULT_THRESHOLD_SD
+
+    params = {
+        "baseline": list(args.baseline or DEFAULT_BASELINE),
+        "threshold": args.threshold,
+        "threshold_sd": args.threshold_sd if args.threshold_sd is not None else DEFAULT_THRESHOLD_SD,
+        "sigmoid": not args.no_sigmoid,
+    }
+    out_path = args.out or os.path.join(args.dir, SUMMARY_NAME)
+
+    def progress(done, total):
+        if not args.quiet and (done == total or done % 50 == 0):
+            print(f"  {done}/{total}", flush=True)
+
+    stats = run_batch(args.dir, out_path, params, manifest_path=args.manifest,
+                      workers=args.workers, force=args.force, progress=progress)
+    print(f"{stats['total']} runs: {stats['analysed']} analysed, {stats['skipped']} unchanged, "
+          f"{stats['failed']} failed, {stats['removed']} removed in {stats['seconds']} s -> {out_path}")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Per-update cost of the progress widgets' canvas code
+
+Compares the old update_canvas() (canvas.clear() and re-create every
+Color/Ellipse/Line) with the current widgets, which build their
+instructions once and only change angle_end / size / pos / points:
+
+    CircularProgressBar, ProcessFlow    (1119_gui.py)
+    ProcessFlowWidget                   (testscreen.py)
+
+Two cases per widget: a progress change (percentage / fill_percentage)
+and a geometry change (size). Prints microseconds per update.
+
+    python3 benchmarks/bench_canvas.py
+    python3 benchmarks/bench_canvas.py --updates 20000
+    xvfb-run python3 benchmarks/bench_canvas.py          # no display
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kivy.graphics import Color, Ellipse, Line, Rectangle  # noqa: E402
+from kivy.properties import NumericProperty  # noqa: E402
+from kivy.uix.widget import Widget  # noqa: E402
+
+
+def load_gui():
+    """1119_gui.py is not an importable module name"""
+    spec = importlib.util.spec_from_file_location("gui_1119", os.path.join(ROOT, "1119_gui.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ========== Previous implementations (canvas rebuilt on every update) ==========
+class LegacyCircularProgressBar(Widget):
+    percentage = NumericProperty(0)
+    bar_color = (0.2, 0.6, 1, 1)
+    background_color = (0.3, 0.3, 0.3, 0.3)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(pos=self.update_canvas, size=self.update_canvas, percentage=self.update_canvas)
+        self.update_canvas()
+
+    def update_canvas(self, *args):
+        self.canvas.clear()
+        with self.canvas:
+            Color(*self.background_color)
+            Ellipse(pos=self.pos, size=self.size, angle_start=0, angle_end=360)
+            Color(*self.bar_color)
+            angle = 360 * (self.percentage / 100)
+            Ellipse(pos=self.pos, size=self.size, angle_start=90, angle_end=90 + angle)
+
+
+class LegacyProcessFlow(Widget):
+    fill_percentage = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(pos=self.update_canvas, size=self.update_canvas, fill_percentage=self.update_canvas)
+        self.update_canvas()
+
+    def update_canvas(self, *args):
+        self.canvas.clear()
+        with self.canvas:
+            Color(0.5, 0.5, 0.5, 1)
+            Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
+            fill_height = self.height * (self.fill_percentage / 100)
+            Color(0.2, 0.6, 1, 0.5)
+            Rectangle(pos=(self.x, self.y), size=(self.width, fill_height))
+
+
+class LegacyProcessFlowWidget(Widget):
+    fill_percentage = NumericProperty(0)
+
+    def __init__(self, motor_screen=None, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(size=self.update_canvas, fill_percentage=self.update_canvas)
+        self.update_canvas()
+
+    def update_canvas(self, *args):
+        self.canvas.clear()
+        radius = min(self.width, self.height) / 2 - 20
+        center_x, center_y = self.center_x, self.center_y
+        with self.canvas:
+            Color(0.9, 0.9, 0.9, 1)
+            Ellipse(pos=(center_x - radius, center_y - radius), size=(radius * 2, radius * 2))
+            fill_angle = 360 * (self.fill_percentage / 100)
+            Color(0.3, 0.5, 0.9, 1)
+            Ellipse(pos=(center_x - radius, center_y - radius), size=(radius * 2, radius * 2),
+                    angle_start=0, angle_end=fill_angle)
+            Color(0, 0, 0, 1)
+            Line(circle=(center_x, center_y, radius), width=2)
+
+
+# ========== Measurement ==========
+def per_update_us(widget, prop, updates):
+    """Mean cost of one property change (including the bound canvas update)"""
+    if prop == "size":
+        values = [(200 + i % 50, 200 + i % 37) for i in range(updates)]
+    else:
+        values = [(i % 1000) / 10 for i in range(updates)]
+    start = time.perf_counter()
+    for value in values:
+        setattr(widget, prop, value)
+    return (time.perf_counter() - start) / updates * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--updates", type=int, default=5000, help="updates per case (default 5000)")
+    args = parser.parse_args(argv)
+
+    from kivy.clock import Clock
+    gui = load_gui()
+    import testscreen
+
+    cases = [
+        ("CircularProgressBar", LegacyCircularProgressBar, gui.CircularProgressBar, "percentage"),
+        ("ProcessFlow", LegacyProcessFlow, gui.ProcessFlow, "fill_percentage"),
+        ("ProcessFlowWidget", LegacyProcessFlowWidget, testscreen.ProcessFlowWidget, "fill_percentage"),
+    ]
+
+    print(f"{'widget':<22}{'update':<17}{'before µs':>11}{'after µs':>11}{'speedup':>9}")
+    for name, legacy_cls, current_cls, progress_prop in cases:
+        for prop in (progress_prop, "size"):
+            before_widget = legacy_cls(size=(200, 200))
+            if current_cls is testscreen.ProcessFlowWidget:
+                after_widget = current_cls(None, size=(200, 200))
+                Clock.unschedule(after_widget.update_timer)
+            else:
+                after_widget = current_cls(size=(200, 200))
+            before = per_update_us(before_widget, prop, args.updates)
+            after = per_update_us(after_widget, prop, args.updates)
+            print(f"{name:<22}{prop:<17}{before:>11.2f}{after:>11.2f}{before / after:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
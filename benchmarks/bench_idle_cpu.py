@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Idle CPU usage of a GUI app
+
+Starts the app, lets it settle, then samples its user+system CPU time
+from /proc/<pid>/stat over a window in which nobody touches the UI.
+Prints the average CPU percentage (100% = one core). Linux only.
+
+    python3 benchmarks/bench_idle_cpu.py                        # mainscreen.py
+    python3 benchmarks/bench_idle_cpu.py --app 1119_gui.py --seconds 60
+    python3 benchmarks/bench_idle_cpu.py --record benchmarks/idle_cpu_history.csv
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pid):
+    """utime + stime of a process in seconds"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+
+def measure(app, warmup, seconds):
+    proc = subprocess.Popen([sys.executable, app], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(warmup)
+        if proc.poll() is not None:
+            raise RuntimeError(f"{app} exited with code {proc.returncode}")
+        cpu0, t0 = cpu_seconds(proc.pid), time.monotonic()
+        time.sleep(seconds)
+        cpu1, t1 = cpu_seconds(proc.pid), time.monotonic()
+        return (cpu1 - cpu0) / (t1 - t0) * 100
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default="mainscreen.py")
+    parser.add_argument("--warmup", type=float, default=10, help="seconds before sampling")
+    parser.add_argument("--seconds", type=float, default=30, help="sampling window")
+    parser.add_argument("--record", help="append the result to this CSV file")
+    args = parser.parse_args(argv)
+
+    percent = measure(args.app, args.warmup, args.seconds)
+    print(f"{args.app}: idle CPU {percent:.2f}% over {args.seconds:g} s")
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["date", "revision", "app", "seconds", "cpu_percent"])
+            writer.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), git_revision(), args.app,
+                             args.seconds, round(percent, 3)])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
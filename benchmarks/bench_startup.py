@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-frame benchmark for the GUI apps
+
+Launches the app several times with TEC_PROFILE_STARTUP=1 and
+TEC_PROFILE_EXIT=1, parses the reported time_to_first_frame_ms and prints
+min / median / max. With --record the result is appended to a CSV file so
+startup time can be tracked across commits.
+
+    python3 benchmarks/bench_startup.py                       # 1119_gui.py, 5 runs
+    python3 benchmarks/bench_startup.py --app temp_control.py --runs 3
+    python3 benchmarks/bench_startup.py --record benchmarks/startup_history.csv
+"""
+
+import argparse
+import csv
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TTFF_RE = re.compile(r"time_to_first_frame_ms=([0-9.]+)")
+
+
+def run_once(app, timeout):
+    env = dict(os.environ, TEC_PROFILE_STARTUP="1", TEC_PROFILE_EXIT="1")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, app], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=timeout)
+    wall = time.perf_counter() - start
+    match = TTFF_RE.search(proc.stdout)
+    if not match:
+        sys.stderr.write(proc.stdout[-2000:] + proc.stderr[-2000:])
+        raise RuntimeError(f"{app} did not report time_to_first_frame_ms")
+    return float(match.group(1)), wall * 1000
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default="1119_gui.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--record", help="append the result to this CSV file")
+    args = parser.parse_args(argv)
+
+    ttff, wall = [], []
+    for i in range(args.runs):
+        first_frame, total = run_once(args.app, args.timeout)
+        ttff.append(first_frame)
+        wall.append(total)
+        print(f"run {i + 1}: first frame {first_frame:.1f} ms, process {total:.1f} ms")
+
+    median = statistics.median(ttff)
+    print(f"{args.app}: time to first frame min {min(ttff):.1f} / "
+          f"median {median:.1f} / max {max(ttff):.1f} ms")
+
+    if args.record:
+        new_file = not os.path.exists(args.record)
+        with open(args.record, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["date", "revision", "app", "runs", "ttff_min_ms",
+                                 "ttff_median_ms", "ttff_max_ms", "process_median_ms"])
+            writer.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), git_revision(), args.app,
+                             args.runs, f"{min(ttff):.1f}", f"{median:.1f}", f"{max(ttff):.1f}",
+                             f"{statistics.median(wall):.1f}"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Experiment execution engine - no Kivy dependency
+
+An experiment is a list of Stage objects run in order on the engine's own
+thread as an explicit state machine:
+
+    idle -> running <-> paused -> complete | stopped | failed
+
+A timed stage waits `duration` seconds; a cycling stage calls
+action(cycle) `cycles` times, one call per `period`. Deadlines are
+absolute (stage start + n * period), so a slow action or a busy UI never
+stretches the run; a late cycle runs immediately and the following ones
+keep their original deadlines. Time spent paused shifts the remaining
+deadlines. A resumed run starts at `start_index` with the first stage's
+`start_cycle` cycles already done.
+
+stop(), pause() and resume() wake the engine thread immediately; the wait
+between deadlines is also capped at `tick` seconds, so a command always
+takes effect within one control tick.
+
+How late each cycle ran and how late each stage ended is collected in
+engine.timing (stage_timer.TimingReport) and sent as a "timing" event
+when the stage ends.
+
+Listeners receive event dicts on the engine thread:
+
+    {"type": "state", "state": "running", ...}
+    {"type": "stage", "stage": "PCR Cycling", "stage_index": 0, ...}
+    {"type": "cycle", "cycle": 12, "cycles": 40, "result": ..., ...}
+    {"type": "timing", "timing": {"planned": ..., "end_error_ms": ..., ...}, ...}
+    {"type": "error", "error": "...", ...}
+
+GUI listeners must hand the event to the UI thread (UIBinder.publish or
+Clock.schedule_once).
+"""
+
+import threading
+import time
+
+from stage_timer import TimingReport
+
+
+class Stage:
+    def __init__(self, name, duration=0.0, cycles=0, period=1.0, action=None,
+                 on_enter=None, setpoint=None, start_cycle=0):
+        self.name = name
+        self.duration = duration      # seconds, timed stage
+        self.cycles = cycles          # > 0 makes this a cycling stage
+        self.period = period          # seconds per cycle
+        self.action = action          # action(cycle) -> result, cycle is 1-based
+        self.on_enter = on_enter      # on_enter(stage) when the stage starts
+        self.setpoint = setpoint      # °C, informational (journal / UI)
+        self.start_cycle = start_cycle  # cycles already done (resumed run)
+
+    def to_dict(self):
+        return {"name": self.name, "duration": self.duration, "cycles": self.cycles,
+                "period": self.period, "setpoint": self.setpoint}
+
+
+class ExperimentEngine:
+    STATES = ("idle", "running", "paused", "complete", "stopped", "failed")
+
+    def __init__(self, stages, tick=0.05, start_index=0):
+        self.stages = list(stages)
+        self.tick = tick                  # longest wait before re-checking commands
+        self.start_index = start_index    # first stage to run (resumed run)
+
+        self.state = "idle"
+        self.stage_index = -1
+        self.cycle = 0                    # cycles completed in the current stage
+        self.error = None
+        self.timing = TimingReport()
+
+        self._listeners = []
+        self._thread = None
+        self._stop_requested = False
+        self._pause_requested = False
+        self._wake = threading.Event()
+
+    # ========== Listeners ==========
+    def add_listener(self, callback):
+        """callback(event) is called from the engine thread"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event_type, **fields):
+        stage = self.current_stage
+        event = {
+            "type": event_type,
+            "time": time.monotonic(),
+            "state": self.state,
+            "stage": stage.name if stage else None,
+            "stage_index": self.stage_index,
+            "cycle": self.cycle,
+            "cycles": stage.cycles if stage else 0,
+        }
+        event.update(fields)
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Experiment listener failed: {e}")
+
+    def _set_state(self, state):
+        self.state = state
+        self._emit("state")
+
+    # ========== Control ==========
+    @property
+    def current_stage(self):
+        if 0 <= self.stage_index < len(self.stages):
+            return self.stages[self.stage_index]
+        return None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("experiment already running")
+        self._stop_requested = False
+        self._pause_requested = False
+        self._thread = threading.Thread(target=self._run, name="experiment-engine", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_requested = True
+        self._wake.set()
+
+    def pause(self):
+        self._pause_requested = True
+        self._wake.set()
+
+    def resume(self):
+        self._pause_requested = False
+        self._wake.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ========== Engine thread ==========
+    def _wait_until(self, deadline):
+        """
+        Sleep until the monotonic deadline, honouring pause/stop
+
+        Returns (completed, paused_seconds); completed is False when stopped.
+        """
+        paused = 0.0
+        while True:
+            if self._stop_requested:
+                return False, paused
+            if self._pause_requested:
+                pause_start = time.monotonic()
+                self._set_state("paused")
+                while self._pause_requested and not self._stop_requested:
+                    self._wake.wait(self.tick)
+                    self._wake.clear()
+                paused += time.monotonic() - pause_start
+                deadline += time.monotonic() - pause_start
+                if self._stop_requested:
+                    return False, paused
+                self._set_state("running")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True, paused
+            self._wake.wait(min(remaining, self.tick))
+            self._wake.clear()
+
+    def _run_stage(self, stage):
+        if stage.on_enter is not None:
+            stage.on_enter(stage)
+        start = base = time.monotonic()
+        if stage.cycles <= 0:
+            completed, paused = self._wait_until(base + stage.duration)
+            if completed:
+                self._stage_done(stage, stage.duration, start, base + paused + stage.duration, paused)
+            return completed
+
+        total_paused = 0.0
+        for n in range(stage.start_cycle + 1, stage.cycles + 1):
+            completed, paused = self._wait_until(base + (n - stage.start_cycle) * stage.period)
+            base += paused
+            total_paused += paused
+            if not completed:
+                return False
+            deadline = base + (n - stage.start_cycle) * stage.period
+            self.timing.record_tick(stage.name, time.monotonic() - deadline)
+            result = stage.action(n) if stage.action is not None else None
+            self.cycle = n
+            self._emit("cycle", result=result)
+        planned = (stage.cycles - stage.start_cycle) * stage.period
+        self._stage_done(stage, planned, start, base + planned, total_paused)
+        return True
+
+    def _stage_done(self, stage, planned, start, deadline, paused):
+        now = time.monotonic()
+        self.timing.record_stage(stage.name, planned, now - start - paused, now - deadline)
+        self._emit("timing", timing=self.timing.stats()[stage.name])
+
+    def _run(self):
+        self.error = None
+        self.timing = TimingReport()
+        self._set_state("running")
+        try:
+            for index in range(self.start_index, len(self.stages)):
+                stage = self.stages[index]
+                self.stage_index = index
+                self.cycle = stage.start_cycle
+                self._emit("stage", setpoint=stage.setpoint)
+                if not self._run_stage(stage):
+                    self._set_state("stopped")
+                    return
+            self._set_state("complete")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._emit("error", error=self.error)
+            self._set_state("failed")
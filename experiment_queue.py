@@ -0,0 +1,323 @@
+"""
+Persistent experiment queue and batch scheduler - no Kivy dependency
+
+ExperimentQueue is an ordered list of runs kept in a small JSON file
+(rewritten atomically on every change), so a queue survives restarts:
+
+    {"version": 1, "next_id": 4, "items": [
+        {"id": 1, "project": "Plate A", "user": "lab", "profile": "pcr.json",
+         "cycles": 40, "status": "done", "added": ..., "started": ...,
+         "finished": ..., "result": {...}},
+        ...
+    ]}
+
+status is pending -> running -> done | failed | stopped, or cancelled.
+A run that was still "running" when the file is loaded was interrupted;
+it becomes "interrupted" (run_journal offers to resume it) and can be
+put back with requeue().
+
+BatchScheduler runs the pending items back to back:
+
+    finish run N --+--> post_process(N)            (post worker)
+                   +--> preheat(N+1) --> start_run(N+1)   (preheat worker)
+
+Post-processing of a finished run (closing the CSV, cataloguing, analysis,
+plot) overlaps the preheat of the next one. start_run is called through
+`dispatch` (Clock.schedule_once in the GUI) and must report the outcome
+with run_finished(). The batch stops after a run that did not complete.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUE_VERSION = 1
+STATUSES = ("pending", "running", "done", "failed", "stopped", "cancelled", "interrupted")
+FINISHED = ("done", "failed", "stopped")
+
+
+class ExperimentQueue:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.items = []
+        self.next_id = 1
+        self._load()
+
+    # ========== Persistence ==========
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            print(f"Experiment queue {self.path} unreadable ({e}), starting empty")
+            return
+        if data.get("version") != QUEUE_VERSION:
+            return
+        self.items = data.get("items", [])
+        self.next_id = data.get("next_id", len(self.items) + 1)
+        interrupted = [item for item in self.items if item["status"] == "running"]
+        for item in interrupted:
+            item["status"] = "interrupted"
+        if interrupted:
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".queue.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": QUEUE_VERSION, "next_id": self.next_id,
+                           "items": self.items}, f, indent=1)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ========== Editing ==========
+    def add(self, project, user="", profile=None, cycles=40):
+        """Append a run; returns the new item"""
+        with self._lock:
+            item = {
+                "id": self.next_id,
+                "project": project,
+                "user": user,
+                "profile": profile,
+                "cycles": int(cycles),
+                "status": "pending",
+                "added": time.time(),
+                "started": None,
+                "finished": None,
+                "result": None,
+            }
+            self.next_id += 1
+            self.items.append(item)
+            self._save()
+            return dict(item)
+
+    def get(self, item_id):
+        with self._lock:
+            for item in self.items:
+                if item["id"] == item_id:
+                    return dict(item)
+        return None
+
+    def _update(self, item_id, **fields):
+        with self._lock:
+            for item in self.items:
+                if item["id"] == item_id:
+                    item.update(fields)
+                    self._save()
+                    return dict(item)
+        raise KeyError(item_id)
+
+    def cancel(self, item_id):
+        """Drop a pending run from the batch (kept in the file as cancelled)"""
+        with self._lock:
+            if self.get(item_id)["status"] == "pending":
+                self._update(item_id, status="cancelled")
+
+    def requeue(self, item_id):
+        """Put an interrupted, failed, stopped or cancelled run back at the end"""
+        with self._lock:
+            item = self.get(item_id)
+            if item is None or item["status"] in ("pending", "running", "done"):
+                return
+            self.items = [i for i in self.items if i["id"] != item_id]
+            item.update(status="pending", started=None, finished=None, result=None)
+            self.items.append(item)
+            self._save()
+
+    def clear_finished(self):
+        """Forget done / failed / stopped / cancelled runs"""
+        with self._lock:
+            self.items = [i for i in self.items if i["status"] not in FINISHED + ("cancelled",)]
+            self._save()
+
+    # ========== Run lifecycle ==========
+    def next_pending(self):
+        with self._lock:
+            for item in self.items:
+                if item["status"] == "pending":
+                    return dict(item)
+        return None
+
+    def mark_running(self, item_id):
+        return self._update(item_id, status="running", started=time.time())
+
+    def release(self, item_id):
+        """A run that could not be started goes back to pending, same place"""
+        return self._update(item_id, status="pending", started=None)
+
+    def mark_finished(self, item_id, status):
+        if status == "complete":
+            status = "done"
+        if status not in FINISHED:
+            raise ValueError(f"unknown run status {status!r}")
+        return self._update(item_id, status=status, finished=time.time())
+
+    def set_result(self, item_id, result):
+        return self._update(item_id, result=result)
+
+    # ========== Reporting ==========
+    def pending(self):
+        with self._lock:
+            return [dict(i) for i in self.items if i["status"] == "pending"]
+
+    def runs_per_hour(self, since=None):
+        """
+        Completed runs per hour of batch wall time
+
+        Wall time runs from the first start to the last finish of the done
+        items (finished after `since`, if given), so gaps for preheat and
+        post-processing count against throughput.
+        """
+        with self._lock:
+            done = [i for i in self.items if i["status"] == "done" and i["started"]
+                    and (since is None or i["finished"] >= since)]
+        if not done:
+            return None
+        span = max(i["finished"] for i in done) - min(i["started"] for i in done)
+        if span <= 0:
+            return None
+        return len(done) / (span / 3600)
+
+    def stats(self, since=None):
+        with self._lock:
+            counts = {status: 0 for status in STATUSES}
+            for item in self.items:
+                counts[item["status"]] += 1
+        counts["runs_per_hour"] = self.runs_per_hour(since)
+        return counts
+
+
+class BatchScheduler:
+    def __init__(self, queue, start_run, preheat=None, post_process=None, dispatch=None):
+        self.queue = queue
+        self.start_run = start_run        # start_run(item) -> bool, on the dispatch thread
+        self.preheat = preheat            # preheat(item), blocking, preheat worker
+        self.post_process = post_process  # post_process(item, result) -> dict | None, post worker
+        self.dispatch = dispatch or (lambda fn: fn())
+
+        self.active = False
+        self.current = None               # id of the item being preheated or run
+        self.batch_started = None
+        self._listeners = []
+        self._preheat_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-preheat")
+        self._post_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-post")
+
+    # ========== Listeners ==========
+    def add_listener(self, callback):
+        """callback(event) - from the dispatch thread or a worker thread"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event_type, **fields):
+        event = {"type": event_type, "active": self.active, "current": self.current}
+        event.update(fields)
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Batch listener failed: {e}")
+
+    # ========== Control ==========
+    def start(self):
+        """Start working through the pending items"""
+        if self.active:
+            return
+        self.active = True
+        if self.batch_started is None or self.current is None:
+            self.batch_started = time.time()
+        self._emit("state")
+        if self.current is None:
+            self._advance()
+        # else: an item is still preheating or running (stop() then start());
+        # its _launch / run_finished carries on, a second preheat would race it
+
+    def stop(self):
+        """Finish the current run but do not start another one"""
+        self.active = False
+        self._emit("state")
+
+    def shutdown(self):
+        self.stop()
+        self._preheat_pool.shutdown(wait=False)
+        self._post_pool.shutdown(wait=True)
+
+    def stats(self):
+        stats = self.queue.stats(since=self.batch_started)
+        stats["active"] = self.active
+        return stats
+
+    def run_finished(self, item_id, status, result=None):
+        """The run started by start_run() ended with status complete / stopped / failed"""
+        item = self.queue.mark_finished(item_id, status)
+        self.current = None
+        self._emit("finished", item=item)
+        if self.post_process is not None:
+            self._post_pool.submit(self._post_process, item, result)
+        if item["status"] != "done":
+            self.active = False
+            self._emit("state")
+        elif self.active:
+            self._advance()
+
+    # ========== Internals ==========
+    def _advance(self):
+        item = self.queue.next_pending()
+        if item is None:
+            self.active = False
+            self._emit("state", idle=True)
+            return
+        self.current = item["id"]
+        self._emit("preheat", item=item)
+        self._preheat_pool.submit(self._preheat, item)
+
+    def _preheat(self, item):
+        try:
+            if self.preheat is not None:
+                self.preheat(item)
+        except Exception as e:
+            print(f"Preheat for {item['project']} failed: {e}")
+            self.active = False
+            self.current = None
+            self._emit("state", error=str(e))
+            return
+        self.dispatch(lambda: self._launch(item))
+
+    def _launch(self, item):
+        if not self.active or self.queue.get(item["id"])["status"] != "pending":
+            self.current = None
+            if self.active:
+                self._advance()  # cancelled while preheating
+            return
+        item = self.queue.mark_running(item["id"])
+        self._emit("started", item=item)
+        if not self.start_run(item):
+            # Someone else is using the instrument - put the run back and stop
+            self.queue.release(item["id"])
+            self.current = None
+            self.active = False
+            self._emit("state")
+
+    def _post_process(self, item, result):
+        try:
+            summary = self.post_process(item, result)
+            if summary is not None:
+                self.queue.set_result(item["id"], summary)
+            self._emit("processed", item=self.queue.get(item["id"]))
+        except Exception as e:
+            print(f"Post-processing for {item['project']} failed: {e}")
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Several TEC / thermistor channels in one process
+
+Channels are described in a JSON config file:
+
+    {
+        "interval": 0.5,
+        "rate": {"fast": 0.1, "slow": 2.0},
+        "channels": [
+            {"name": "block_a",
+             "dac": {"bus": 1, "device": 1, "cs": 17},
+             "adc": {"bus": 5, "device": 0, "cs": 12, "channel": 6},
+             "enable_pin": 4,
+             "setpoints": ["95:30", "60"]},
+            {"name": "block_b",
+             "dac": {"bus": 1, "device": 1, "cs": 27},
+             "adc": {"bus": 5, "device": 0, "cs": 13, "channel": 7},
+             "enable_pin": 22,
+             "profile": "overnight.json",
+             "interval": 1.0}
+        ]
+    }
+
+Omitted hardware fields default to the single-channel wiring. "rate"
+(top level or per channel) switches a channel to a stage-aware interval,
+see acquisition_rate.RatePolicy; "interval" is then its `normal` rate.
+Each channel
+is a TECService; the manager only schedules it. One scheduler thread
+keeps a heap of per-channel deadlines and hands due ticks, earliest
+deadline first, to a small pool with one worker per SPI bus. A tick holds
+the lock of every bus it touches, so devices sharing a bus never
+interleave transfers (they must also share the bus's SPI mode). Thread
+count depends on the number of buses, not channels.
+
+    python3 instrument_manager.py channels.json
+    python3 instrument_manager.py channels.json --log-dir ~/tec_logs --quiet
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from acquisition_rate import RatePolicy
+from tec_service import TECService
+from thermal_profile import load_profile, parse_steps
+
+DEFAULT_DAC = {"bus": 1, "device": 1, "cs": 17}
+DEFAULT_ADC = {"bus": 5, "device": 0, "cs": 12, "channel": 6}
+DEFAULT_ENABLE_PIN = 4
+
+
+def load_config(path):
+    """Read a channel config file and fill in defaults"""
+    with open(path) as f:
+        data = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    interval = data.get("interval", 0.5)
+    tolerance = data.get("tolerance", 0.5)
+    rate = data.get("rate")
+    channels = []
+    for i, item in enumerate(data["channels"]):
+        channel = {
+            "name": item.get("name", f"ch{i}"),
+            "dac": {**DEFAULT_DAC, **item.get("dac", {})},
+            "adc": {**DEFAULT_ADC, **item.get("adc", {})},
+            "enable_pin": item.get("enable_pin", DEFAULT_ENABLE_PIN),
+            "interval": item.get("interval", interval),
+            "tolerance": item.get("tolerance", tolerance),
+            "rate": item.get("rate", rate),
+        }
+        if "profile" in item:
+            channel["steps"] = load_profile(os.path.join(base_dir, item["profile"]))
+        else:
+            channel["steps"] = parse_steps([str(s) for s in item.get("setpoints", [])])
+        channels.append(channel)
+    names = [c["name"] for c in channels]
+    if len(set(names)) != len(names):
+        raise ValueError("channel names must be unique")
+    return channels
+
+
+def build_hardware(channel):
+    """Open the MAX5144 / MAX1978 / AD7928 of one channel -> (tec_controller, sensor)"""
+    from TEC_0602_2025 import MAX5144, TECController
+    from ad7928_0917001 import TemperatureSensor
+
+    dac, adc = channel["dac"], channel["adc"]
+    max5144 = MAX5144(spi_bus=dac["bus"], spi_device=dac["device"], cs_pin=dac["cs"])
+    tec_controller = TECController(max5144, enable_pin=channel["enable_pin"])
+    sensor = TemperatureSensor(spi_bus=adc["bus"], spi_device=adc["device"],
+                               cs_pin=adc["cs"], channel=adc["channel"])
+    return tec_controller, sensor
+
+
+class Channel:
+    def __init__(self, name, service, steps, buses):
+        self.name = name
+        self.service = service
+        self.steps = list(steps)
+        self.step_index = -1
+        self.buses = sorted(set(buses))     # lock order, avoids deadlock
+        self.deadline = 0.0
+        self.interval = service.interval   # of the tick being waited for
+        self.done = not self.steps
+
+        # Statistics
+        self.ticks = 0
+        self.late_ticks = 0
+        self.max_late = 0.0
+        self.errors = 0
+
+    def stats(self):
+        stats = {"ticks": self.ticks, "late_ticks": self.late_ticks,
+                 "max_late_ms": round(self.max_late * 1000, 1), "errors": self.errors,
+                 "stage": self.service.stage, "setpoint": self.service.setpoint,
+                 "step": self.step_index, "done": self.done}
+        if self.service.rate is not None:
+            stats["rate"] = self.service.rate.stats()
+        return stats
+
+
+class InstrumentManager:
+    def __init__(self, channels, hardware=build_hardware):
+        self.channels = {}
+        self._bus_locks = {}
+        for config in channels:
+            tec_controller, sensor = hardware(config)
+            rate = config.get("rate")
+            if rate is not None:
+                rate = RatePolicy(**{"normal": config["interval"], **rate})
+            service = TECService(tec_controller, sensor, interval=config["interval"],
+                                 tolerance=config["tolerance"], rate=rate)
+            buses = [config["dac"]["bus"], config["adc"]["bus"]]
+            for bus in buses:
+                self._bus_locks.setdefault(bus, threading.Lock())
+            self.channels[config["name"]] = Channel(config["name"], service, config["steps"], buses)
+
+        self._listeners = []
+        self._heap = []
+        self._seq = itertools.count()       # tie-breaker: equal deadlines run round-robin
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self._bus_locks), 1),
+                                        thread_name_prefix="instrument")
+
+    # ========== Listeners / telemetry ==========
+    def add_listener(self, callback):
+        """callback(channel_name, sample) from a worker thread on every tick"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def latest(self):
+        """{channel name: last telemetry sample}"""
+        return {name: ch.service.last_sample for name, ch in self.channels.items()}
+
+    def stats(self):
+        return {name: ch.stats() for name, ch in self.channels.items()}
+
+    # ========== Control ==========
+    def _locked(self, channel):
+        return _MultiLock([self._bus_locks[bus] for bus in channel.buses])
+
+    def set_setpoint(self, name, temperature):
+        """Change one channel's setpoint from any thread (serialised on its buses)"""
+        channel = self.channels[name]
+        with self._locked(channel):
+            return channel.service.set_setpoint(temperature)
+
+    def start(self):
+        now = time.monotonic()
+        for channel in self.channels.values():
+            channel.deadline = now
+            heapq.heappush(self._heap, (now, next(self._seq), channel.name))
+        self._thread = threading.Thread(target=self._schedule, name="instrument-scheduler",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def done(self):
+        return all(ch.done for ch in self.channels.values())
+
+    def wait(self, timeout=None):
+        """Block until every profile has finished or stop() was called"""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._stopped and not self.done:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return self.done
+
+    def close(self):
+        self.stop()
+        if self._thread is not None:
+            self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    # ========== Scheduling ==========
+    def _schedule(self):
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, _, name = self._heap[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self._cond.wait(deadline - now)
+                    continue
+                heapq.heappop(self._heap)
+                self._pool.submit(self._tick, self.channels[name])
+
+    def _tick(self, channel):
+        start = time.monotonic()
+        late = start - channel.deadline
+        if late > channel.interval / 2:
+            channel.late_ticks += 1
+        channel.max_late = max(channel.max_late, late)
+
+        try:
+            with self._locked(channel):
+                if channel.step_index < 0 and not channel.done:
+                    self._next_step(channel)
+                sample = channel.service.tick()
+                if not channel.done and channel.service.advance(sample, time.monotonic()):
+                    self._next_step(channel)
+            channel.ticks += 1
+            for callback in list(self._listeners):
+                callback(channel.name, sample)
+        except Exception as e:
+            channel.errors += 1
+            print(f"[{channel.name}] tick failed: {e}")
+
+        channel.interval = channel.service.next_interval()
+        with self._cond:
+            channel.deadline += channel.interval
+            now = time.monotonic()
+            if channel.deadline < now:
+                channel.deadline = now  # fell behind, do not burst
+            heapq.heappush(self._heap, (channel.deadline, next(self._seq), channel.name))
+            self._cond.notify_all()
+
+    def _next_step(self, channel):
+        """Start the channel's next profile step (bus locks held)"""
+        while channel.step_index + 1 < len(channel.steps):
+            channel.step_index += 1
+            step = channel.steps[channel.step_index]
+            if channel.service.begin_step(step):
+                print(f"[{channel.name}] {step.name}: {step.setpoint}°C for "
+                      f"{'ever' if step.hold <= 0 else f'{step.hold:g} s'}")
+                return
+        channel.done = True
+        channel.service.stage = "idle"
+
+
+class _MultiLock:
+    """Acquire several locks in a fixed order"""
+
+    def __init__(self, locks):
+        self.locks = locks
+
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        for lock in reversed(self.locks):
+            lock.release()
+
+
+# ========== Command line ==========
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run several TEC channels from one config file")
+    parser.add_argument("config", help="channel config (.json)")
+    parser.add_argument("--log-dir", help="write <dir>/<channel>.csv telemetry logs")
+    parser.add_argument("--keep-on", action="store_true",
+                        help="leave every MAX1978 enabled after the profiles finish")
+    parser.add_argument("--quiet", action="store_true", help="do not print a line per tick")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    channels = load_config(args.config)
+    manager = InstrumentManager(channels)
+
+    if not args.quiet:
+        def print_sample(name, sample):
+            print(f"{name:<10} {sample['stage']:<5} set={sample['setpoint']}°C "
+                  f"actual={sample['temperature']}°C", flush=True)
+        manager.add_listener(print_sample)
+
+    loggers = {}
+    if args.log_dir:
+        from telemetry_log import TelemetryLogger
+        for name in manager.channels:
+            loggers[name] = TelemetryLogger(
+                os.path.join(os.path.expanduser(args.log_dir), f"{name}.csv")).start()
+        manager.add_listener(lambda name, sample: loggers[name].log(sample))
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: manager.stop())
+    completed = False
+    try:
+        manager.start()
+        completed = manager.wait()
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+    finally:
+        manager.close()
+        for name, channel in manager.channels.items():
+            service = channel.service
+            service.tec_controller.max5144.cleanup()
+            if not args.keep_on:
+                service.tec_controller.disable()
+            service.sensor.spi.close()  # GPIO.cleanup() would release the other enable pins
+            print(f"{name}: {channel.stats()}")
+        if not args.keep_on:
+            import RPi.GPIO as GPIO
+            GPIO.cleanup()
+            print("MAX1978 has been stopped.")
+        for logger in loggers.values():
+            logger.close()
+    return 0 if completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
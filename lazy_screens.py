@@ -0,0 +1,176 @@
+"""
+Lazy screen registry for MDScreenManager
+
+Screens are registered as factories and built the first time they are
+needed - when `current` is set to them or get_screen() asks for them - so
+the first frame only pays for the first screen.
+
+    sm = LazyScreenManager()
+    sm.register("lock", LockScreen, prewarm_after=["homing"])
+    sm.register("report", ReportScreen, droppable=True)
+    sm.current = "lock"                  # builds LockScreen now
+
+prewarm_after lists the screens from which this one is a likely next
+step. After a screen is shown, its likely successors are built one per
+frame during idle frames (never during a transition).
+
+Screens registered with droppable=True are removed again when the system
+is short of memory (MemAvailable in /proc/meminfo below
+`low_memory_fraction` of MemTotal), least recently shown first. They are
+rebuilt on the next visit. The current screen is never dropped.
+
+Build times are recorded in `build_times` (name -> list of seconds),
+printed as each screen is built and included in the startup_profile report.
+"""
+
+import gc
+import time
+
+from kivy.clock import Clock
+from kivy.properties import AliasProperty
+from kivymd.uix.screenmanager import MDScreenManager
+
+import startup_profile
+
+
+def memory_available_fraction(path="/proc/meminfo"):
+    """MemAvailable / MemTotal, or None where /proc/meminfo is unavailable"""
+    info = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    if not info.get("MemTotal") or "MemAvailable" not in info:
+        return None
+    return info["MemAvailable"] / info["MemTotal"]
+
+
+class LazyScreenManager(MDScreenManager):
+    def __init__(self, low_memory_fraction=0.1, memory_check_interval=30.0, **kwargs):
+        self._factories = {}        # name -> (factory, kwargs), in registration order
+        self._droppable = set()
+        self._successors = {}       # name -> [names worth prewarming after it]
+        self._last_shown = {}       # name -> monotonic time
+        self._prewarm_queue = []
+        self._prewarm_event = None
+        self.build_times = {}
+        self.low_memory_fraction = low_memory_fraction
+        super().__init__(**kwargs)
+        self.bind(current=self._on_current_changed)
+        if memory_check_interval:
+            Clock.schedule_interval(lambda dt: self.trim(), memory_check_interval)
+
+    # ========== Registry ==========
+    def register(self, name, factory, prewarm_after=(), droppable=False, **kwargs):
+        """Register a screen factory; factory(name=name, **kwargs) builds it"""
+        self._factories[name] = (factory, kwargs)
+        if droppable:
+            self._droppable.add(name)
+        for previous in prewarm_after:
+            self._successors.setdefault(previous, []).append(name)
+        self.property("screen_names").dispatch(self)
+
+    def is_built(self, name):
+        return any(s.name == name for s in self.screens)
+
+    def _build(self, name):
+        factory, kwargs = self._factories[name]
+        start = time.perf_counter()
+        with startup_profile.timed(f"screen:{name}"):
+            screen = factory(name=name, **kwargs)
+            self.add_widget(screen)
+        elapsed = time.perf_counter() - start
+        self.build_times.setdefault(name, []).append(elapsed)
+        print(f"Screen '{name}' built in {elapsed * 1000:.1f} ms")
+        return screen
+
+    # ========== ScreenManager overrides ==========
+    def get_screen(self, name):
+        for screen in self.screens:
+            if screen.name == name:
+                return screen
+        if name in self._factories:
+            return self._build(name)
+        return super().get_screen(name)  # raises ScreenManagerException
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def _get_screen_names(self):
+        names = [s.name for s in self.screens]
+        return names + [name for name in self._factories if name not in names]
+
+    screen_names = AliasProperty(_get_screen_names, bind=("screens",))
+
+    # ========== Prewarming ==========
+    def _on_current_changed(self, instance, name):
+        if name is None:
+            return
+        self._last_shown[name] = time.monotonic()
+        self.prewarm(self._successors.get(name, ()))
+
+    def prewarm(self, names):
+        """Build these screens in the background, one per idle frame"""
+        for name in names:
+            if name not in self._prewarm_queue and not self.is_built(name):
+                self._prewarm_queue.append(name)
+        if self._prewarm_queue and self._prewarm_event is None:
+            self._prewarm_event = Clock.schedule_once(self._prewarm_next, 0)
+
+    def _prewarm_next(self, dt):
+        self._prewarm_event = None
+        if self.transition.is_active:
+            # building mid-animation would drop frames; try again later
+            self._prewarm_event = Clock.schedule_once(self._prewarm_next, 0.1)
+            return
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if not self.is_built(name):
+                self._build(name)
+                break
+        if self._prewarm_queue:
+            self._prewarm_event = Clock.schedule_once(self._prewarm_next, 0)
+
+    # ========== Memory pressure ==========
+    def trim(self, force=False):
+        """
+        Drop built droppable screens (least recently shown first) while
+        memory is low; with force=True drop all of them. Returns the names.
+        """
+        if not force:
+            fraction = memory_available_fraction()
+            if fraction is None or fraction >= self.low_memory_fraction:
+                return []
+        candidates = [
+            s for s in self.screens
+            if s.name in self._droppable and s is not self.current_screen and s.parent is None
+        ]
+        candidates.sort(key=lambda s: self._last_shown.get(s.name, 0))
+        dropped = []
+        while candidates:
+            screen = candidates.pop(0)
+            self.remove_widget(screen)
+            dropped.append(screen.name)
+            del screen  # let gc.collect() free the widget tree
+            if not force:
+                gc.collect()
+                fraction = memory_available_fraction()
+                if fraction is None or fraction >= self.low_memory_fraction:
+                    break
+        if dropped:
+            print(f"Dropped screens under memory pressure: {', '.join(dropped)}")
+        return dropped
+
+    def stats(self):
+        """{name: {"built": bool, "builds": n, "last_ms": ms}}"""
+        return {
+            name: {
+                "built": self.is_built(name),
+                "builds": len(self.build_times.get(name, [])),
+                "last_ms": round(self.build_times[name][-1] * 1000, 1) if name in self.build_times else None,
+            }
+            for name in self._factories
+        }
@@ -9,13 +9,12 @@ Key Learning Topics:
 3. MDCard - card component usage
 4. AnchorLayout - center alignment
 5. MDButton - buttons and icons
-6. Clock.schedule_interval - timer updates
+6. Shared ticker - timer updates only while the screen is visible
 7. size_hint and pos_hint usage
 8. Theme color settings
 """
 
 from kivy.metrics import dp
-from kivy.clock import Clock
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.screenmanager import MDScreenManager
@@ -25,7 +24,9 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.button import MDButton, MDButtonIcon, MDButtonText
 from kivymd.uix.label import MDLabel
 from kivy.uix.anchorlayout import AnchorLayout
-from datetime import datetime
+
+from ui_binding import UIBinder
+from ticker import TICKER
 
 
 class MainScreen(MDScreen):
@@ -220,11 +221,25 @@ class MainScreen(MDScreen):
         layout.add_widget(self.right_layout)
         self.add_widget(layout)
         
+        # ========== Per-frame Label Dispatcher ==========
+        # Timers publish values; labels are updated only when text changes
+        self.ui_binder = UIBinder()
+        self.ui_binder.bind("date", self.date_label)
+        self.ui_binder.bind("time", self.time_label)
+        # Dispatcher and timer only run while this screen is visible
+        # (see on_enter / on_leave)
+    
+    def on_enter(self, *args):
+        """Screen shown - attach to the shared ticker"""
+        self.ui_binder.start()
         # ========== Timer Update for Time ==========
-        # Call update_time method every second
-        Clock.schedule_interval(self.update_time, 1)
-        # Update immediately once
-        self.update_time(0)
+        # Call update_time every second (also called immediately once)
+        TICKER.attach("time", self.update_time)
+    
+    def on_leave(self, *args):
+        """Screen hidden - stop updating labels nobody can see"""
+        TICKER.detach("time", self.update_time)
+        self.ui_binder.stop()
     
     def on_report_clicked(self, *args):
         """Report button click event"""
@@ -238,25 +253,25 @@ class MainScreen(MDScreen):
         # In real application, would navigate to test page
         # self.manager.current = "pretest"
     
-    def update_time(self, dt):
+    def update_time(self, now):
         """
         Update date and time display
         
         Parameters:
-            dt: Time interval passed by Clock (automatically passed, must receive)
+            now: Current datetime, passed by the shared ticker
         """
-        now = datetime.now()
-        
+        # Publish only - the dispatcher skips labels whose text is unchanged
         # Format date: Nov 24, 2025
-        self.date_label.text = now.strftime("%b %d, %Y")
+        self.ui_binder.publish("date", now.strftime("%b %d, %Y"))
         
         # Format time: 2:30 PM
         # Note: %-I removes leading zero (Linux/Mac), Windows uses %#I
         try:
-            self.time_label.text = now.strftime("%-I:%M %p")
+            time_text = now.strftime("%-I:%M %p")
         except ValueError:
             # Windows system uses %#I
-            self.time_label.text = now.strftime("%#I:%M %p")
+            time_text = now.strftime("%#I:%M %p")
+        self.ui_binder.publish("time", time_text)
 
 
 class DemoApp(MDApp):
@@ -289,7 +304,7 @@ class DemoApp(MDApp):
         print("  3. MDCard component - rounded corners, shadows, styles")
         print("  4. AnchorLayout - component centering")
         print("  5. MDButton + MDButtonIcon - buttons and icons")
-        print("  6. Clock.schedule_interval - timer updates")
+        print("  6. Shared ticker - timer updates only while visible")
         print("  7. size_hint and pos_hint - responsive layout")
         print("  8. Theme settings - theme_cls global theme")
         print("\n💡 Layout Description:")
@@ -0,0 +1,220 @@
+"""
+Runtime metrics - counters and HDR-style latency histograms
+
+Nothing is measured unless metrics are enabled (TEC_METRICS=1, or
+metrics.enable() from a command line flag). Instrumentation is installed
+by wrapping methods at start-up, so when metrics are disabled the hot
+paths run the original, unwrapped code and pay nothing.
+
+    import metrics
+    if metrics.ENABLED:
+        metrics.instrument_hardware(tec_controller, sensor)
+        metrics.MetricsHTTPServer(port=9100).start()
+
+    curl http://127.0.0.1:9100/metrics          # Prometheus text format
+
+Histograms use log-linear buckets (8 sub-buckets per power of two, 1 µs to
+~17 min), so any recorded latency is kept with <= 12.5 % relative error in
+constant memory, like an HDR histogram.
+"""
+
+import functools
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("TEC_METRICS") == "1"
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def prometheus_lines(self):
+        return [f"{self.name} {self.value}"]
+
+
+class Histogram:
+    kind = "histogram"
+    SUB_BUCKETS = 8
+    MIN_EXP = -19   # 2**-20 s ~ 1 µs
+    MAX_EXP = 10    # 2**10 s ~ 17 min
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.counts = [0] * ((self.MAX_EXP - self.MIN_EXP + 1) * self.SUB_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, value):
+        if value <= 0:
+            return 0
+        mantissa, exp = math.frexp(value)        # value = mantissa * 2**exp, 0.5 <= mantissa < 1
+        exp = min(max(exp, self.MIN_EXP), self.MAX_EXP)
+        sub = min(int((mantissa - 0.5) * 2 * self.SUB_BUCKETS), self.SUB_BUCKETS - 1)
+        return (exp - self.MIN_EXP) * self.SUB_BUCKETS + max(sub, 0)
+
+    def _upper_bound(self, index):
+        exp, sub = divmod(index, self.SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub + 1) / (2 * self.SUB_BUCKETS), exp + self.MIN_EXP)
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[self._index(seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        target = math.ceil(self.count * p / 100.0)
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def prometheus_lines(self):
+        # Export one cumulative bucket per power of two to keep the scrape small
+        lines = []
+        cumulative = 0
+        for exp_index in range(self.MAX_EXP - self.MIN_EXP + 1):
+            start = exp_index * self.SUB_BUCKETS
+            cumulative += sum(self.counts[start:start + self.SUB_BUCKETS])
+            le = math.ldexp(1.0, exp_index + self.MIN_EXP)
+            lines.append(f'{self.name}_bucket{{le="{le:.9g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum:.9g}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text)
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._get(Counter, name, help_text)
+
+    def histogram(self, name, help_text=""):
+        return self._get(Histogram, name, help_text)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render_prometheus(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ========== Instrumentation ==========
+def instrument(target, method_name, histogram_name, help_text="", counter_name=None):
+    """
+    Replace target.method_name with a timed wrapper
+
+    Does nothing when metrics are disabled. target may be an instance or a
+    class. counter_name, if given, counts calls as well.
+    """
+    if not ENABLED:
+        return
+    original = getattr(target, method_name)
+    histogram = REGISTRY.histogram(histogram_name, help_text)
+    counter = REGISTRY.counter(counter_name) if counter_name else None
+    perf_counter = time.perf_counter
+
+    @functools.wraps(original)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            histogram.record(perf_counter() - start)
+            if counter is not None:
+                counter.inc()
+
+    setattr(target, method_name, timed)
+
+
+def instrument_hardware(tec_controller, sensor):
+    """Time SPI transfers, temperature reads and DAC writes"""
+    instrument(tec_controller.max5144, "set_dac_output", "tec_dac_write_seconds",
+               "MAX5144 DAC write (SPI) duration", counter_name="tec_dac_writes_total")
+    instrument(sensor, "read_adc", "tec_adc_spi_transfer_seconds",
+               "AD7928 single conversion SPI transfer duration")
+    instrument(sensor, "read_temperature", "tec_read_temperature_seconds",
+               "TemperatureSensor.read_temperature duration (100 samples + filter)")
+
+
+# ========== Prometheus endpoint ==========
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of stdout
+
+
+class MetricsHTTPServer:
+    def __init__(self, host="127.0.0.1", port=9100):
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        print(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
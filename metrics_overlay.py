@@ -0,0 +1,87 @@
+"""
+Kivy side of the metrics layer
+
+ClockLagMonitor  - schedules a fixed-interval Clock callback and records
+                   how late it fires (tec_clock_callback_lag_seconds)
+MetricsOverlay   - small on-screen label with the key numbers, refreshed
+                   once a second
+
+Both are only created when metrics.ENABLED is set, see install().
+"""
+
+import os
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivymd.uix.label import MDLabel
+
+import metrics
+
+
+class ClockLagMonitor:
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.histogram = metrics.REGISTRY.histogram(
+            "tec_clock_callback_lag_seconds", "Kivy Clock callback lateness")
+        self._event = Clock.schedule_interval(self._tick, interval)
+
+    def _tick(self, dt):
+        self.histogram.record(max(0.0, dt - self.interval))
+
+    def cancel(self):
+        self._event.cancel()
+
+
+class MetricsOverlay(MDLabel):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("size_hint", (None, None))
+        kwargs.setdefault("size", (dp(260), dp(90)))
+        kwargs.setdefault("pos_hint", {"right": 1, "top": 1})
+        kwargs.setdefault("font_style", "Label")
+        kwargs.setdefault("role", "small")
+        super().__init__(**kwargs)
+        self._last_dac_writes = 0
+        Clock.schedule_interval(self.refresh, 1)
+
+    def refresh(self, dt):
+        registry = metrics.REGISTRY
+        lines = []
+
+        read = registry.get("tec_read_temperature_seconds")
+        if read is not None and read.count:
+            lines.append(f"read_temperature p50 {read.percentile(50) * 1000:.1f} ms "
+                         f"p99 {read.percentile(99) * 1000:.1f} ms")
+        spi = registry.get("tec_adc_spi_transfer_seconds")
+        if spi is not None and spi.count:
+            lines.append(f"SPI xfer p99 {spi.percentile(99) * 1e6:.0f} µs")
+        lag = registry.get("tec_clock_callback_lag_seconds")
+        if lag is not None and lag.count:
+            lines.append(f"Clock lag p99 {lag.percentile(99) * 1000:.1f} ms, "
+                         f"max {lag.max * 1000:.1f} ms")
+        writes = registry.get("tec_dac_writes_total")
+        if writes is not None:
+            rate = (writes.value - self._last_dac_writes) / dt if dt else 0.0
+            self._last_dac_writes = writes.value
+            lines.append(f"DAC writes {rate:.1f}/s")
+
+        text = "\n".join(lines)
+        if text != self.text:
+            self.text = text
+
+
+def install(layout=None, port=None):
+    """
+    Start the Clock lag monitor and the Prometheus endpoint; add the overlay
+    to layout when TEC_METRICS_OVERLAY=1. Returns None when metrics are off.
+    """
+    if not metrics.ENABLED:
+        return None
+    monitor = ClockLagMonitor()
+    port = port or int(os.environ.get("TEC_METRICS_PORT", 9100))
+    try:
+        metrics.MetricsHTTPServer(port=port).start()
+    except OSError as e:  # e.g. port in use - keep the GUI, lose only the endpoint
+        print(f"Metrics endpoint on port {port} not started: {e}")
+    if layout is not None and os.environ.get("TEC_METRICS_OVERLAY") == "1":
+        layout.add_widget(MetricsOverlay())
+    return monitor
@@ -0,0 +1,233 @@
+"""
+Vectorised amplification-curve analysis
+
+Every function works on the whole run at once as a (cycles, wells,
+channels) array - no per-cycle or per-well Python loops. A run CSV has
+three cy5 wells, three fam wells and one hex well; missing wells are NaN
+(see RunRecordStore.cube()).
+
+    baseline_subtract()  linear baseline fitted over a cycle window
+    replicate_stats()    mean / SD / CV across replicate wells
+    threshold_cycles()   Ct with linear sub-cycle interpolation
+    fit_sigmoid()        4-parameter logistic, batched Levenberg-Marquardt
+    analyse_run()        all of the above -> result dict
+    summarize()          flat {name: float} row for reports and tables
+"""
+
+import warnings
+
+import numpy as np
+
+CHANNELS = ("cy5", "fam", "hex")
+
+DEFAULT_BASELINE = (3, 15)      # cycles [start, end) used for the baseline
+DEFAULT_THRESHOLD_SD = 10.0     # threshold = this many baseline SDs
+
+
+def _baseline_window(n_cycles, window):
+    start, end = window
+    end = min(end, n_cycles)
+    start = min(start, max(end - 3, 0))
+    return start, end
+
+
+def baseline_subtract(data, cycles=None, window=DEFAULT_BASELINE):
+    """
+    Subtract a straight line fitted to the baseline window of every trace
+
+    Returns (corrected, noise) where noise is the residual SD of each trace
+    inside the window, shape (wells, channels).
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n = data.shape[0]
+    if n == 0:  # run with no cycles yet - nothing to fit
+        return data.copy(), np.full(data.shape[1:], np.nan)
+    x = np.arange(n, dtype=np.float64) if cycles is None else np.asarray(cycles, dtype=np.float64)
+    start, end = _baseline_window(n, window)
+
+    xb = x[start:end]
+    yb = data[start:end]
+    xm = xb.mean()
+    dx = (xb - xm)[:, None, None]
+    ym = yb.mean(axis=0)
+    denom = (dx ** 2).sum()
+    slope = (dx * (yb - ym)).sum(axis=0) / denom if denom > 0 else np.zeros_like(ym)
+
+    fitted = ym + slope * (x[:, None, None] - xm)
+    corrected = data - fitted
+    noise = corrected[start:end].std(axis=0, ddof=1) if end - start > 1 else np.zeros_like(ym)
+    return corrected, noise
+
+
+def replicate_stats(data):
+    """Mean, SD and CV (%) across the wells axis -> each (cycles, channels)"""
+    with warnings.catch_warnings():
+        # single-replicate channels (hex) give NaN SD by design
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(data, axis=1)
+        sd = np.nanstd(data, axis=1, ddof=1)
+        cv = 100.0 * sd / np.abs(mean)
+    return mean, sd, cv
+
+
+def threshold_cycles(data, threshold, cycles=None):
+    """
+    First upward threshold crossing of every trace, interpolated linearly
+    between the two bracketing cycles
+
+    data       (cycles, wells, channels), baseline-corrected
+    threshold  scalar or array broadcastable to (wells, channels)
+    Returns Ct in cycle units, NaN where a trace never crosses.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n = data.shape[0]
+    if n == 0:
+        return np.full(data.shape[1:], np.nan)
+    x = np.arange(n, dtype=np.float64) if cycles is None else np.asarray(cycles, dtype=np.float64)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), data.shape[1:])
+
+    above = data >= threshold                       # NaN compares False
+    crossed = above.any(axis=0)
+    first = above.argmax(axis=0)                     # first cycle at/above threshold
+    prev = np.maximum(first - 1, 0)
+
+    y1 = np.take_along_axis(data, first[None], axis=0)[0]
+    y0 = np.take_along_axis(data, prev[None], axis=0)[0]
+    x1 = x[first]
+    x0 = x[prev]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(y1 > y0, (threshold - y0) / (y1 - y0), 0.0)
+    ct = x0 + np.clip(frac, 0.0, 1.0) * (x1 - x0)
+    ct = np.where(first == 0, x[0], ct)              # already above at the first cycle
+    return np.where(crossed, ct, np.nan)
+
+
+def _logistic(params, x):
+    f0, fmax, xhalf, slope = (params[..., i, None] for i in range(4))
+    z = np.clip(-(x - xhalf) / slope, -60, 60)
+    e = np.exp(z)
+    return f0 + fmax / (1.0 + e), e
+
+
+def fit_sigmoid(data, cycles=None, iterations=60):
+    """
+    Fit y = f0 + fmax / (1 + exp(-(x - xhalf) / slope)) to every trace
+
+    All traces are solved together: each Levenberg-Marquardt iteration is
+    one batched 4x4 solve. Returns (params, r2) with params shaped
+    (wells, channels, 4) = [f0, fmax, xhalf, slope]; NaN for empty traces.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n, wells, channels = data.shape
+    x = np.arange(n, dtype=np.float64) if cycles is None else np.asarray(cycles, dtype=np.float64)
+
+    traces = data.reshape(n, wells * channels).T     # (T, n)
+    valid = np.isfinite(traces).all(axis=1) & (n >= 4)
+    params = np.full((traces.shape[0], 4), np.nan)
+    r2 = np.full(traces.shape[0], np.nan)
+    if not valid.any():
+        return params.reshape(wells, channels, 4), r2.reshape(wells, channels)
+
+    y = traces[valid]
+    lo = y.min(axis=1)
+    hi = y.max(axis=1)
+    mid = (lo + hi) / 2
+    p = np.stack([
+        lo,
+        np.maximum(hi - lo, 1e-9),
+        x[np.abs(y - mid[:, None]).argmin(axis=1)],
+        np.full(len(y), max((x[-1] - x[0]) / 20.0, 1e-3)),
+    ], axis=1)
+    lam = np.full(len(y), 1e-2)
+
+    def sse(p):
+        model, _ = _logistic(p, x)
+        return ((y - model) ** 2).sum(axis=1)
+
+    err = sse(p)
+    eye = np.eye(4)
+    for _ in range(iterations):
+        model, e = _logistic(p, x)
+        denom = 1.0 + e
+        fmax, xhalf, slope = p[:, 1, None], p[:, 2, None], p[:, 3, None]
+        d_fmax = 1.0 / denom
+        d_xhalf = -fmax * e / denom ** 2 / slope
+        d_slope = -fmax * e * (x - xhalf) / denom ** 2 / slope ** 2
+        J = np.stack([np.ones_like(model), d_fmax, d_xhalf, d_slope], axis=2)   # (T, n, 4)
+        r = y - model
+        JtJ = np.einsum("tni,tnj->tij", J, J)
+        Jtr = np.einsum("tni,tn->ti", J, r)
+        A = JtJ + lam[:, None, None] * (JtJ * eye + eye * 1e-12)
+        step = np.linalg.solve(A, Jtr[..., None])[..., 0]
+        candidate = p + step
+        candidate[:, 3] = np.where(np.abs(candidate[:, 3]) < 1e-3, 1e-3, candidate[:, 3])
+        new_err = sse(candidate)
+        better = np.isfinite(new_err) & (new_err < err)
+        p = np.where(better[:, None], candidate, p)
+        err = np.where(better, new_err, err)
+        lam = np.where(better, lam * 0.3, lam * 10.0)
+
+    total = ((y - y.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2[valid] = 1.0 - err / total
+    params[valid] = p
+    return params.reshape(wells, channels, 4), r2.reshape(wells, channels)
+
+
+def analyse_run(data, cycles=None, baseline=DEFAULT_BASELINE, threshold=None,
+                threshold_sd=DEFAULT_THRESHOLD_SD, sigmoid=True):
+    """
+    Full analysis of one run
+
+    data is a (cycles, wells, channels) array or a RunRecordStore. threshold
+    may be a scalar or per-(well, channel) array; by default it is
+    threshold_sd x the baseline noise of each trace.
+    """
+    if hasattr(data, "cube"):
+        cycles = data.elapsed if cycles is None else cycles
+        data = data.cube()
+    data = np.asarray(data, dtype=np.float64)
+
+    corrected, noise = baseline_subtract(data, cycles, baseline)
+    if threshold is None:
+        threshold = np.maximum(threshold_sd * noise, 1e-9)
+    ct = threshold_cycles(corrected, threshold, cycles)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        ct_mean = np.nanmean(ct, axis=0)
+        ct_sd = np.nanstd(ct, axis=0, ddof=1)
+    mean, sd, cv = replicate_stats(corrected)
+
+    result = {
+        "cycles": data.shape[0],
+        "corrected": corrected,
+        "threshold": np.broadcast_to(threshold, data.shape[1:]),
+        "ct": ct,                       # (wells, channels)
+        "ct_mean": ct_mean,             # (channels,)
+        "ct_sd": ct_sd,
+        "replicate_mean": mean,         # (cycles, channels)
+        "replicate_sd": sd,
+        "replicate_cv": cv,
+    }
+    if sigmoid:
+        result["sigmoid"], result["sigmoid_r2"] = fit_sigmoid(corrected, cycles)
+    return result
+
+
+def summarize(result):
+    """Flatten analyse_run() output to {column: float} (NaN -> None)"""
+    def value(v):
+        v = float(v)
+        return None if np.isnan(v) else round(v, 3)
+
+    row = {"cycles": result["cycles"]}
+    for c, name in enumerate(CHANNELS):
+        for w in range(result["ct"].shape[0]):
+            if not np.all(np.isnan(result["corrected"][:, w, c])):
+                row[f"ct_{name}_{w + 1}"] = value(result["ct"][w, c])
+        row[f"ct_{name}_mean"] = value(result["ct_mean"][c])
+        row[f"ct_{name}_sd"] = value(result["ct_sd"][c])
+        row[f"{name}_final_cv"] = value(result["replicate_cv"][-1, c]) if result["cycles"] else None
+    return row
@@ -0,0 +1,229 @@
+"""
+Background plot rendering with a content-addressed PNG cache
+
+render_run_plot() draws the amplification curves of one run CSV with
+matplotlib (Agg) and returns PNG bytes. PlotRenderer runs it in a process
+pool so the UI thread never renders, and stores the result in PlotCache:
+
+    key  = sha256(sha256(run file) + plot options as sorted JSON)
+    file = <cache dir>/<key>.png
+
+A cache hit is just a file path, so reopening a report shows the image
+immediately. The cache is LRU by file mtime (touched on every hit) and is
+trimmed to `max_bytes` after each insert.
+
+This module does not import Kivy, and the worker function only touches
+numpy/matplotlib. Workers are forked, so they do not re-run the GUI
+script's top level (imports, Config, window) the way spawn/forkserver
+workers would. Forking a process with live threads can leave the child
+holding a lock nobody will release, so a GUI calls start() early - before
+it starts any worker threads - and the pool forks its workers right then.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+DEFAULT_OPTIONS = {"channels": ["cy5", "fam", "hex"], "width": 6.4, "height": 4.0, "dpi": 100}
+
+
+# ========== Worker side ==========
+def render_run_plot(csv_path, options):
+    """Render one run to PNG bytes (runs in a worker process)"""
+    from io import BytesIO
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from run_store import RunRecordStore
+
+    store = RunRecordStore.load(csv_path)
+    channels = options.get("channels", DEFAULT_OPTIONS["channels"])
+    colors = {"cy5": "tab:red", "fam": "tab:blue", "hex": "tab:green"}
+
+    fig, ax = plt.subplots(figsize=(options.get("width", 6.4), options.get("height", 4.0)))
+    try:
+        cycles = store.elapsed
+        for name in channels:
+            values = store.channel(name)
+            if values.ndim == 1:
+                ax.plot(cycles, values, color=colors.get(name), label=name.upper())
+            else:
+                for i in range(values.shape[1]):
+                    ax.plot(cycles, values[:, i], color=colors.get(name),
+                            alpha=0.8, label=f"{name.upper()} {i + 1}")
+        ax.set_xlabel("Cycle")
+        ax.set_ylabel("Fluorescence")
+        ax.set_title(options.get("title") or os.path.basename(csv_path))
+        ax.legend(fontsize="small", ncol=2)
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=options.get("dpi", 100))
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+# ========== Cache ==========
+def file_digest(path, chunk_size=1 << 16):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PlotCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._digests = {}      # path -> ((mtime_ns, size), digest)
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, run_path, options):
+        """Content-addressed key; the run file is re-hashed only if it changed"""
+        archived = "::" in run_path  # run_archive reference, the index holds its digest
+        st = os.stat(run_path.split("::", 1)[0])
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._digests.get(run_path)
+        if cached is not None and cached[0] == stamp:
+            digest = cached[1]
+        else:
+            if archived:
+                import run_archive
+                digest = run_archive.ref_digest(run_path)
+            else:
+                digest = file_digest(run_path)
+            self._digests[run_path] = (stamp, digest)
+        opts = json.dumps(options, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{digest}:{opts}".encode()).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + ".png")
+
+    def get(self, key):
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, png_bytes):
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(png_bytes)
+        os.replace(tmp_path, path)
+        self._evict()
+        return path
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".png"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+            entries.sort()  # least recently used first
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+
+
+# ========== Renderer ==========
+class PlotRenderer:
+    def __init__(self, cache, max_workers=1):
+        self.cache = cache
+        self.max_workers = max_workers
+        self._executor = None
+        # Hashing the run file is disk I/O - never on the caller's (UI) thread
+        self._lookup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-lookup")
+        self._inflight = {}     # key -> [callbacks]
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def start(self):
+        """Fork the worker processes now, while the caller is still single-threaded"""
+        # With fork, the first submit() launches every worker before the
+        # executor's manager thread starts
+        self._pool().submit(os.getpid)
+        return self
+
+    def request(self, run_path, options=None, callback=None):
+        """
+        Get the PNG for run_path, rendering it in the background if needed
+
+        The cache key (a hash of the run file) is computed on a lookup
+        thread. callback(png_path) is called from that thread on a cache
+        hit, otherwise from a pool thread once rendering finishes.
+        png_path is None if the run file is gone or rendering failed.
+        GUI callers must hop back to the UI thread.
+        """
+        self._lookup_pool.submit(self._lookup, run_path, options or DEFAULT_OPTIONS, callback)
+
+    def _lookup(self, run_path, options, callback):
+        try:
+            key = self.cache.key(run_path, options)
+        except (OSError, KeyError, ValueError) as e:  # removed before the catalog noticed
+            print(f"Plot for {run_path} unavailable: {e}")
+            if callback is not None:
+                callback(None)
+            return
+        cached = self.cache.get(key)
+        if cached is not None:
+            if callback is not None:
+                callback(cached)
+            return
+
+        with self._lock:
+            waiting = self._inflight.get(key)
+            if waiting is not None:  # already rendering, just wait for it
+                if callback is not None:
+                    waiting.append(callback)
+                return
+            self._inflight[key] = [callback] if callback is not None else []
+
+        future = self._pool().submit(render_run_plot, run_path, options)
+        future.add_done_callback(lambda f: self._done(key, f))
+
+    def _done(self, key, future):
+        try:
+            path = self.cache.put(key, future.result())
+        except Exception as e:
+            print(f"Plot rendering failed: {e}")
+            path = None
+        with self._lock:
+            callbacks = self._inflight.pop(key, [])
+        for callback in callbacks:
+            callback(path)
+
+    def shutdown(self):
+        self._lookup_pool.shutdown(wait=False, cancel_futures=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
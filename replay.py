@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Replay recorded telemetry or runs through the live interfaces
+
+Two kinds of recording can be replayed, so rendering, logging and analysis
+can be profiled under exactly the same load without hardware:
+
+* Telemetry logs (telemetry_log.TelemetryLogger CSV) - ReplaySensor and
+  ReplayTECController stand in for TemperatureSensor / TECController, and
+  run_replay() drives a TECService from the recording. The daemon exposes
+  this as `tec_daemon.py --replay telemetry.csv --speed 10`.
+* Run files (run CSV / .npy / .npz, see run_store) - RunReplay hands the
+  recorded rows to the experiment engine one cycle per recorded period.
+
+Speed is a multiplier of recorded time: 1 is real time, 10 is ten times
+faster and "max" (or 0) does not wait at all - every read returns the next
+sample and every cycle runs back to back.
+
+The GUIs pick a recording up from the environment:
+
+    TEC_REPLAY=~/tec_logs/telemetry.csv TEC_REPLAY_SPEED=5 python3 temp_control.py
+    TEC_REPLAY=~/csv_files/run.csv TEC_REPLAY_SPEED=max python3 1119_gui.py
+
+The command line replays a run file through the engine, the CSV writer and
+the analysis and prints how long each took:
+
+    python3 replay.py ~/csv_files/run.csv --speed max --analyse
+"""
+
+import argparse
+import bisect
+import csv
+import os
+import sys
+import time
+
+TELEMETRY_COLUMNS = ("timestamp", "temperature")
+
+
+def parse_speed(text):
+    """'max' or 0 -> 0.0 (no waiting), otherwise a positive multiplier"""
+    if str(text).strip().lower() in ("max", "0", "0.0"):
+        return 0.0
+    speed = float(text)
+    if speed <= 0:
+        raise ValueError(f"replay speed must be positive or 'max', got {text!r}")
+    return speed
+
+
+def replay_source():
+    """
+    (path, speed) from TEC_REPLAY / TEC_REPLAY_SPEED, or None
+
+    A missing file or a bad speed is reported and ignored (None), so the
+    caller falls back to live or simulated data instead of failing.
+    """
+    path = os.environ.get("TEC_REPLAY")
+    if not path:
+        return None
+    path = os.path.expanduser(path)
+    if not os.path.isfile(path):
+        print(f"TEC_REPLAY: {path} not found, replay disabled")
+        return None
+    try:
+        speed = parse_speed(os.environ.get("TEC_REPLAY_SPEED", "1"))
+    except ValueError as e:
+        print(f"TEC_REPLAY_SPEED: {e}, replay disabled")
+        return None
+    return path, speed
+
+
+def is_telemetry(path):
+    """True for a telemetry log, False for a run file"""
+    if not path.endswith(".csv"):
+        return False
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), [])
+    return all(column in header for column in TELEMETRY_COLUMNS)
+
+
+def _number(value):
+    return None if value in ("", None) else float(value)
+
+
+def load_telemetry(path):
+    """Telemetry rows as dicts, timestamps rebased to 0, in file order"""
+    samples = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                sample = {key: _number(value) for key, value in row.items()}
+            except ValueError:
+                continue  # torn last line of a live log
+            if sample.get("timestamp") is None or sample.get("temperature") is None:
+                continue
+            samples.append(sample)
+    if not samples:
+        raise ValueError(f"{path}: no telemetry samples")
+    start = samples[0]["timestamp"]
+    for sample in samples:
+        sample["t"] = sample["timestamp"] - start
+    return samples
+
+
+class ReplayClock:
+    """Recorded-time position: monotonic time since start() x speed"""
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self._start = None
+
+    def start(self):
+        self._start = time.monotonic()
+        return self
+
+    def now(self):
+        if self._start is None:
+            self.start()
+        return (time.monotonic() - self._start) * self.speed
+
+
+class ReplaySensor:
+    """
+    TemperatureSensor stand-in that reads from a telemetry log
+
+    At a finite speed read_temperature() returns the sample recorded at the
+    current replay position; at max speed each call returns the next sample.
+    With loop=True the recording restarts at the end, otherwise the last
+    sample is repeated and `finished` becomes True.
+    """
+
+    def __init__(self, path, speed=1.0, loop=False):
+        self.path = path
+        self.samples = load_telemetry(path)
+        self.times = [sample["t"] for sample in self.samples]
+        self.duration = self.times[-1]
+        self.loop = loop
+        self.clock = ReplayClock(speed)
+        self.spi = _NullDevice()
+        self.last_raw = None
+        self.index = -1         # index of the sample returned last
+        self.finished = False
+        self.reads = 0
+
+    @property
+    def speed(self):
+        return self.clock.speed
+
+    def _locate(self):
+        """(index, finished) of the sample at the replay position"""
+        if self.speed == 0:
+            index = self.index + 1
+            if index >= len(self.samples):
+                index = 0 if self.loop else len(self.samples) - 1
+            return index, not self.loop and index == len(self.samples) - 1
+        position = self.clock.now()
+        finished = False
+        if position > self.duration:
+            if self.loop and self.duration > 0:
+                position %= self.duration
+            else:
+                finished = True
+        return max(bisect.bisect_right(self.times, position) - 1, 0), finished
+
+    def peek(self):
+        """The sample the next read will return, without consuming it"""
+        return self.samples[self._locate()[0]]
+
+    def current(self):
+        """The sample at the replay position (advances at max speed)"""
+        self.index, finished = self._locate()
+        self.finished = self.finished or finished
+        return self.samples[self.index]
+
+    def read_temperature(self):
+        sample = self.current()
+        self.reads += 1
+        raw = sample.get("raw_code")
+        self.last_raw = int(raw) if raw is not None else None
+        return sample["temperature"]
+
+    def cleanup(self):
+        pass
+
+
+class ReplayTECController:
+    """TECController stand-in; remembers the setpoint, drives no hardware"""
+
+    def __init__(self):
+        self.max5144 = _NullDevice()
+        self.dac_value = None
+        self.enabled = True
+
+    def set_temperature(self, temperature, dac_value=None):
+        self.dac_value = dac_value
+        return True
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def cleanup(self):
+        pass
+
+
+class _NullDevice:
+    def close(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+
+def run_replay(service, sensor):
+    """
+    Tick service until the recording ends or service.stop() is called
+
+    The recorded setpoint and DAC code are applied before every tick, so
+    listeners (log, server, metrics) see the recording as a live run. The
+    tick interval is divided by the replay speed; at max speed there is no
+    wait. Returns True if the whole recording was replayed.
+    """
+    interval = service.interval / sensor.speed if sensor.speed else 0.0
+    service.stage = "replay"
+    sensor.clock.start()
+    next_tick = time.monotonic()
+    try:
+        while not service.stopped and not sensor.finished:
+            sample = sensor.peek()
+            if sample.get("setpoint") is not None:
+                service.setpoint = int(sample["setpoint"])
+                service.tec_controller.set_temperature(service.setpoint, sample.get("dac_code"))
+            service.tick()
+
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now  # fell behind, do not burst
+            if interval and service.wait(next_tick - now):
+                break
+        return sensor.finished
+    finally:
+        service.stage = "idle"
+
+
+class RunReplay:
+    """
+    Recorded PCR run for the experiment engine
+
+    rows is the (cycles, 8) array in FIELDNAMES order; period is the median
+    spacing of the recorded elapsed column (1 s if it is not increasing),
+    divided by speed.
+    """
+
+    def __init__(self, path, speed=1.0):
+        from run_store import RunRecordStore  # numpy is only needed for run files
+        import numpy as np
+
+        self.path = path
+        self.speed = speed
+        self.rows = RunRecordStore.load(path).as_array().copy()
+        if not len(self.rows):
+            raise ValueError(f"{path}: no records")
+        steps = np.diff(self.rows[:, 0])
+        recorded = float(np.median(steps)) if len(steps) and np.all(steps > 0) else 1.0
+        self.recorded_period = recorded
+        self.period = recorded / speed if speed else 0.0
+
+    @property
+    def cycles(self):
+        return len(self.rows)
+
+    def row(self, cycle):
+        """Row of a 1-based cycle, as a list"""
+        return self.rows[cycle - 1].tolist()
+
+    def stage(self, action, name="PCR Cycling", setpoint=None, start_cycle=0):
+        from experiment_engine import Stage
+        return Stage(name, cycles=self.cycles, period=self.period, action=action,
+                     setpoint=setpoint, start_cycle=start_cycle)
+
+
+# ========== Command line ==========
+def build_parser():
+    parser = argparse.ArgumentParser(description="Replay a recorded run through the experiment engine")
+    parser.add_argument("path", help="run file (.csv / .npy / .npz)")
+    parser.add_argument("--speed", default="max", help="N x recorded speed, or 'max' (default)")
+    parser.add_argument("--out", help="also stream the rows to this CSV (IncrementalCSVWriter)")
+    parser.add_argument("--analyse", action="store_true", help="analyse the run when it finishes")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from experiment_engine import ExperimentEngine
+    from run_store import RunRecordStore
+
+    replay = RunReplay(args.path, parse_speed(args.speed))
+    store = RunRecordStore(capacity=replay.cycles)
+    writer = None
+    if args.out:
+        from run_writer import IncrementalCSVWriter
+        writer = IncrementalCSVWriter(args.out).start()
+
+    def action(cycle):
+        row = replay.row(cycle)
+        store.append(row[0], row[1:4], row[4:7], row[7])
+        if writer is not None:
+            writer.append_row(row)
+        return row
+
+    engine = ExperimentEngine([replay.stage(action)])
+    start = time.perf_counter()
+    engine.start().join()
+    elapsed = time.perf_counter() - start
+    if writer is not None:
+        writer.close()
+    speed = f"{replay.speed:g}x" if replay.speed else "max speed"
+    print(f"{replay.cycles} cycles at {speed}: {elapsed * 1000:.1f} ms "
+          f"(recorded period {replay.recorded_period:g} s, state {engine.state})")
+
+    if args.analyse:
+        from pcr_analysis import analyse_run, summarize
+        start = time.perf_counter()
+        result = analyse_run(store)
+        print(f"Analysis: {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(summarize(result))
+    return 0 if engine.state == "complete" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
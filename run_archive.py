@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Compressed archive of completed runs with a random-access index
+
+One archive file holds many runs. Each run is stored column-wise in the
+run_store channel groups (elapsed, cy5, fam, hex); every group is split
+into chunks of CHUNK_ROWS cycles and each chunk is compressed on its own
+(zlib or lzma, standard library only). Before compression the float64
+bytes are shuffled (all first bytes, then all second bytes, ...), which
+makes slowly changing curves compress several times better.
+
+    "TECARC\\x01\\n"                     8-byte header
+    chunk, chunk, ...                    compressed blocks
+    index                                zlib-compressed JSON
+    footer                               index offset (8), length (4), crc32 (4), "TECIDX\\x01\\n"
+
+The index maps run name -> metadata and, per channel, the (offset, length,
+rows, crc32) of every chunk, so one run - or one channel of one run, or a
+range of cycles - is read by seeking straight to its blocks. Adding runs
+appends new blocks and a new index + footer after the old ones; a reader
+always uses the last valid footer, so a write torn by a crash leaves the
+previous state readable.
+
+A run inside an archive is addressed as "<archive>::<run name>", which
+RunRecordStore.load() and the plot cache accept like a CSV path.
+
+    python3 run_archive.py migrate                          # ~/csv_files -> ~/csv_files/runs.tecarc
+    python3 run_archive.py migrate --workers 8 --codec lzma --delete
+    python3 run_archive.py list
+    python3 run_archive.py extract Plate_A_20250101_120000_data.csv --out plate_a.csv
+    python3 run_archive.py verify
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+HEADER = b"TECARC\x01\n"
+FOOTER_MAGIC = b"TECIDX\x01\n"
+FOOTER = struct.Struct("<QII8s")
+INDEX_VERSION = 1
+CHUNK_ROWS = 4096
+REF_SEPARATOR = "::"
+DEFAULT_DIR = os.path.expanduser("~/csv_files")
+ARCHIVE_NAME = "runs.tecarc"
+
+# run_store.CHANNEL_COLUMNS as (first column, width)
+CHANNELS = {"elapsed": (0, 1), "cy5": (1, 3), "fam": (4, 3), "hex": (7, 1)}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def split_ref(path):
+    """'<archive>::<name>' -> (archive, name); None for a plain file path"""
+    if REF_SEPARATOR not in path:
+        return None
+    archive, name = path.split(REF_SEPARATOR, 1)
+    return archive, name
+
+
+def make_ref(archive, name):
+    return f"{os.path.abspath(archive)}{REF_SEPARATOR}{name}"
+
+
+# ========== Block codec ==========
+def _compress(data, codec, level):
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    raise ArchiveError(f"unknown codec {codec!r}")
+
+
+def _decompress(data, codec):
+    return zlib.decompress(data) if codec == "zlib" else lzma.decompress(data)
+
+
+def encode_channel(values, codec="zlib", level=6, chunk_rows=CHUNK_ROWS):
+    """(n, k) float64 -> [(compressed bytes, rows, crc32), ...] in chunks of chunk_rows cycles"""
+    import numpy as np
+
+    columns = np.ascontiguousarray(np.asarray(values, dtype="<f8").reshape(len(values), -1).T)
+    chunks = []
+    for start in range(0, columns.shape[1], chunk_rows):
+        chunk = np.ascontiguousarray(columns[:, start:start + chunk_rows])
+        shuffled = chunk.view(np.uint8).reshape(-1, 8).T.tobytes()
+        block = _compress(shuffled, codec, level)
+        chunks.append((block, chunk.shape[1], zlib.crc32(block)))
+    return chunks
+
+
+def decode_chunk(block, rows, width, codec):
+    import numpy as np
+
+    raw = np.frombuffer(_decompress(block, codec), dtype=np.uint8)
+    values = raw.reshape(8, -1).T.copy().view("<f8").reshape(width, rows)
+    return values.T
+
+
+def rows_digest(rows):
+    import numpy as np
+    return hashlib.sha256(np.ascontiguousarray(rows, dtype="<f8").tobytes()).hexdigest()
+
+
+def encode_run(name, rows, meta=None, codec="zlib", level=6):
+    """Compress one (cycles, 8) run -> picklable dict for RunArchive.add_encoded()"""
+    import numpy as np
+
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, 8)
+    channels = {channel: encode_channel(rows[:, first:first + width], codec, level)
+                for channel, (first, width) in CHANNELS.items()}
+    summary = None
+    if len(rows):
+        last = rows[-1]
+        summary = {"cycles": len(rows), "cy5_final": float(last[1:4].mean()),
+                   "fam_final": float(last[4:7].mean()), "hex_final": float(last[7])}
+    return {"name": name, "meta": dict(meta or {}), "cycles": len(rows), "codec": codec,
+            "digest": rows_digest(rows), "summary": summary, "channels": channels,
+            "raw_bytes": rows.nbytes}
+
+
+# ========== Archive ==========
+class RunArchive:
+    def __init__(self, path, mode="r"):
+        if mode not in ("r", "a"):
+            raise ValueError("mode must be 'r' or 'a'")
+        self.path = path
+        self.mode = mode
+        self.runs = {}          # name -> index entry
+        self._dirty = False
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if mode == "r" and not exists:
+            raise FileNotFoundError(path)
+        if exists:
+            self._file = open(path, "r+b" if mode == "a" else "rb")
+            if self._file.read(len(HEADER)) != HEADER:
+                self._file.close()
+                raise ArchiveError(f"{path} is not a run archive")
+            self.runs, end = self._read_index()
+            if mode == "a" and end != self._file.seek(0, os.SEEK_END):
+                self._file.truncate(end)  # drop the torn tail before appending
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "w+b")
+            self._file.write(HEADER)
+            self._dirty = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self.runs
+
+    def __len__(self):
+        return len(self.runs)
+
+    # ========== Index ==========
+    def _read_index(self):
+        """(runs, end offset) of the last valid footer; a torn tail is skipped"""
+        size = self._file.seek(0, os.SEEK_END)
+        if size == len(HEADER):
+            return {}, size  # created, nothing flushed yet
+        end = size
+        while end >= len(HEADER) + FOOTER.size:
+            self._file.seek(end - FOOTER.size)
+            offset, length, crc, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+            if magic == FOOTER_MAGIC and offset + length == end - FOOTER.size:
+                self._file.seek(offset)
+                blob = self._file.read(length)
+                if zlib.crc32(blob) == crc:
+                    index = json.loads(zlib.decompress(blob))
+                    if index.get("version") != INDEX_VERSION:
+                        raise ArchiveError(f"{self.path}: unsupported index version")
+                    if end != size:
+                        print(f"{self.path}: ignoring {size - end} bytes after the last index")
+                    return index["runs"], end
+            end = self._find_footer(end - 1)
+        raise ArchiveError(f"{self.path}: no valid index")
+
+    def _find_footer(self, before):
+        """End offset of the last footer magic that finishes before `before`"""
+        window = 1 << 16
+        pos = before
+        while pos > len(HEADER):
+            start = max(len(HEADER), pos - window)
+            self._file.seek(start)
+            data = self._file.read(pos - start + len(FOOTER_MAGIC))
+            hit = data.rfind(FOOTER_MAGIC)
+            if hit >= 0 and start + hit + len(FOOTER_MAGIC) <= before:
+                return start + hit + len(FOOTER_MAGIC)
+            pos = start
+        return 0
+
+    def flush(self):
+        """Write the index and footer; everything added so far becomes durable"""
+        if self.mode != "a" or not self._dirty:
+            return
+        blob = zlib.compress(json.dumps({"version": INDEX_VERSION, "runs": self.runs},
+                                        separators=(",", ":")).encode())
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(blob)
+        self._file.write(FOOTER.pack(offset, len(blob), zlib.crc32(blob), FOOTER_MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    # ========== Writing ==========
+    def add_encoded(self, encoded):
+        """Append a run produced by encode_run(); a run with the same name is replaced"""
+        if self.mode != "a":
+            raise ArchiveError("archive opened read-only")
+        self._file.seek(0, os.SEEK_END)
+        channels = {}
+        stored = 0
+        for channel, chunks in encoded["channels"].items():
+            entries = []
+            for block, rows, crc in chunks:
+                entries.append([self._file.tell(), len(block), rows, crc])
+                self._file.write(block)
+                stored += len(block)
+            channels[channel] = entries
+        self.runs[encoded["name"]] = {
+            "meta": encoded["meta"],
+            "cycles": encoded["cycles"],
+            "codec": encoded["codec"],
+            "digest": encoded["digest"],
+            "summary": encoded["summary"],
+            "raw_bytes": encoded["raw_bytes"],
+            "stored_bytes": stored,
+            "channels": channels,
+        }
+        self._dirty = True
+        return stored
+
+    def add(self, name, rows, meta=None, codec="zlib", level=6):
+        return self.add_encoded(encode_run(name, rows, meta, codec, level))
+
+    # ========== Reading ==========
+    def entry(self, name):
+        try:
+            return self.runs[name]
+        except KeyError:
+            raise KeyError(f"{name} not in {self.path}") from None
+
+    def read_channel(self, name, channel, start=0, stop=None):
+        """
+        Cycles [start, stop) of one channel as an (m, width) array
+
+        Only the chunks overlapping the range are read and decompressed.
+        """
+        import numpy as np
+
+        entry = self.entry(name)
+        width = CHANNELS[channel][1]
+        stop = entry["cycles"] if stop is None else min(stop, entry["cycles"])
+        parts = []
+        first = 0
+        for offset, length, rows, crc in entry["channels"][channel]:
+            last = first + rows
+            if last > start and first < stop:
+                self._file.seek(offset)
+                block = self._file.read(length)
+                if zlib.crc32(block) != crc:
+                    raise ArchiveError(f"{name}/{channel}: chunk at {offset} is corrupt")
+                values = decode_chunk(block, rows, width, entry["codec"])
+                parts.append(values[max(start - first, 0):stop - first])
+            first = last
+        if not parts:
+            return np.empty((0, width))
+        return np.concatenate(parts)
+
+    def read(self, name):
+        """Whole run as a (cycles, 8) array in FIELDNAMES order"""
+        import numpy as np
+        return np.hstack([self.read_channel(name, channel) for channel in CHANNELS])
+
+    def load(self, name):
+        from run_store import RunRecordStore
+        return RunRecordStore.from_array(self.read(name))
+
+    def verify(self, name):
+        """True if the run decodes to the rows it was archived from"""
+        return rows_digest(self.read(name)) == self.entry(name)["digest"]
+
+    def stats(self):
+        raw = sum(e["raw_bytes"] for e in self.runs.values())
+        csv_bytes = sum(e["meta"].get("csv_bytes", 0) for e in self.runs.values())
+        stored = sum(e["stored_bytes"] for e in self.runs.values())
+        return {"runs": len(self.runs), "raw_bytes": raw, "csv_bytes": csv_bytes,
+                "stored_bytes": stored, "file_bytes": os.path.getsize(self.path),
+                "ratio": round(csv_bytes / stored, 2) if stored and csv_bytes else None}
+
+
+def load_ref(ref):
+    """RunRecordStore for '<archive>::<name>'"""
+    archive, name = split_ref(ref)
+    with RunArchive(archive) as ar:
+        return ar.load(name)
+
+
+def ref_digest(ref):
+    """Content digest of an archived run (sha256 of its rows)"""
+    archive, name = split_ref(ref)
+    with RunArchive(archive) as ar:
+        return ar.entry(name)["digest"]
+
+
+# ========== Migration ==========
+def encode_file(path, codec, level):
+    """Read and compress one run CSV (runs in a worker process) -> (path, encoded or None, error)"""
+    try:
+        from batch_analysis import file_stamp
+        from run_catalog import parse_run_filename
+        from run_store import RunRecordStore
+
+        stamp = file_stamp(path)
+        project, timestamp = parse_run_filename(path)
+        rows = RunRecordStore.load(path).as_array()
+        meta = {"project": project, "timestamp": timestamp, "stamp": stamp,
+                "source": os.path.abspath(path), "csv_bytes": stamp[1]}
+        return path, encode_run(os.path.basename(path), rows, meta, codec, level), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def _encode_task(task):
+    return encode_file(*task)
+
+
+def migrate(directory, archive_path, workers=None, codec="zlib", level=6, delete=False,
+            catalog_path=None, flush_every=200, progress=None):
+    """
+    Archive every run CSV in directory that is new or changed since it was archived
+
+    CSVs are parsed and compressed in a process pool; this process only
+    appends the finished blocks. With delete=True each CSV is removed once
+    its archived copy reads back identically, and its catalog row (if any)
+    is pointed at the archive. Returns a stats dict.
+    """
+    from batch_analysis import discover_runs, file_stamp
+
+    start = time.perf_counter()
+    paths = discover_runs(directory)
+    archived = failed = 0
+    moved = {}
+    with RunArchive(archive_path, "a") as ar:
+        todo = []
+        for path in paths:
+            entry = ar.runs.get(os.path.basename(path))
+            if entry is None or entry["meta"].get("stamp") != file_stamp(path):
+                todo.append(path)
+
+        if todo:
+            workers = workers or os.cpu_count() or 1
+            tasks = [(path, codec, level) for path in todo]
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_encode_task, tasks, chunksize=chunksize)
+                for done, (path, encoded, error) in enumerate(results, 1):
+                    if error is not None:
+                        failed += 1
+                        print(f"Skipping {path}: {error}", file=sys.stderr)
+                    else:
+                        ar.add_encoded(encoded)
+                        archived += 1
+                    if done % flush_every == 0:
+                        ar.flush()
+                    if progress is not None:
+                        progress(done, len(tasks))
+        ar.flush()
+
+        if delete:
+            for path in paths:
+                name = os.path.basename(path)
+                if name in ar and ar.entry(name)["meta"].get("stamp") == file_stamp(path) \
+                        and ar.verify(name):
+                    os.remove(path)
+                    moved[os.path.abspath(path)] = make_ref(archive_path, name)
+        stats = ar.stats()
+
+    if moved and catalog_path and os.path.exists(catalog_path):
+        from run_catalog import RunCatalog
+        catalog = RunCatalog(catalog_path)
+        catalog.relocate(moved)
+        catalog.close()
+
+    stats.update({"total": len(paths), "archived": archived, "skipped": len(paths) - len(todo),
+                  "failed": failed, "deleted": len(moved),
+                  "seconds": round(time.perf_counter() - start, 2)})
+    return stats
+
+
+# ========== Command line ==========
+def build_parser():
+    parser = argparse.ArgumentParser(description="Compressed archive of completed runs")
+    parser.add_argument("--archive", help=f"archive file (default <dir>/{ARCHIVE_NAME})")
+    parser.add_argument("--dir", default=DEFAULT_DIR,
+                        help=f"directory with run CSVs (default {DEFAULT_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="archive new or changed run CSVs")
+    migrate_cmd.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    migrate_cmd.add_argument("--codec", choices=("zlib", "lzma"), default="zlib")
+    migrate_cmd.add_argument("--level", type=int, default=6, help="compression level (default 6)")
+    migrate_cmd.add_argument("--delete", action="store_true",
+                             help="remove each CSV once its archived copy is verified")
+    migrate_cmd.add_argument("--quiet", action="store_true", help="no progress output")
+
+    commands.add_parser("list", help="list archived runs")
+
+    extract_cmd = commands.add_parser("extract", help="write one run (or one channel) as CSV")
+    extract_cmd.add_argument("name", help="run name (the original CSV file name)")
+    extract_cmd.add_argument("--channel", choices=tuple(CHANNELS), help="only this channel")
+    extract_cmd.add_argument("--out", help="output file (default stdout)")
+
+    commands.add_parser("verify", help="decode every run and check its digest")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    archive_path = args.archive or os.path.join(args.dir, ARCHIVE_NAME)
+
+    if args.command == "migrate":
+        def progress(done, total):
+            if not args.quiet and (done == total or done % 100 == 0):
+                print(f"  {done}/{total}", flush=True)
+
+        stats = migrate(args.dir, archive_path, workers=args.workers, codec=args.codec,
+                        level=args.level, delete=args.delete,
+                        catalog_path=os.path.join(args.dir, "catalog.sqlite3"), progress=progress)
+        print(f"{stats['total']} runs: {stats['archived']} archived, {stats['skipped']} unchanged, "
+              f"{stats['failed']} failed, {stats['deleted']} CSVs removed in {stats['seconds']} s; "
+              f"{stats['runs']} runs in {archive_path} ({stats['file_bytes']} bytes, "
+              f"{stats['ratio']}x smaller than the CSVs)")
+        return 1 if stats["failed"] else 0
+
+    with RunArchive(archive_path) as ar:
+        if args.command == "list":
+            for name in sorted(ar.runs):
+                entry = ar.runs[name]
+                print(f"{name}  {entry['cycles']} cycles  {entry['stored_bytes']} bytes")
+            print(ar.stats())
+            return 0
+
+        if args.command == "extract":
+            import numpy as np
+            from run_writer import FIELDNAMES
+
+            if args.channel:
+                first, width = CHANNELS[args.channel]
+                values = ar.read_channel(args.name, args.channel)
+                header = FIELDNAMES[first:first + width]
+            else:
+                values, header = ar.read(args.name), FIELDNAMES
+            np.savetxt(args.out or sys.stdout, values, delimiter=",", fmt="%.10g",
+                       header=",".join(header), comments="")
+            return 0
+
+        bad = [name for name in sorted(ar.runs) if not ar.verify(name)]
+        for name in bad:
+            print(f"Digest mismatch: {name}", file=sys.stderr)
+        print(f"{len(ar.runs) - len(bad)} / {len(ar.runs)} runs OK")
+        return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
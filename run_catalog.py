@@ -0,0 +1,187 @@
+"""
+SQLite catalog of saved runs
+
+One row per run CSV in ~/csv_files with project, user, timestamp, path and
+summary statistics. Runs are added as they are saved (add_run) and the
+directory can be re-scanned incrementally (sync_directory) - only files
+whose mtime or size changed are re-read. The history screen pages through
+the catalog instead of listing the directory.
+
+Only the standard library is used, so the catalog is also usable from the
+headless tools.
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+RUN_FILE_RE = re.compile(r"^(?P<project>.*)_(?P<ts>\d{8}_\d{6})_data\.csv$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT UNIQUE NOT NULL,
+    project     TEXT NOT NULL,
+    user        TEXT NOT NULL DEFAULT '',
+    timestamp   TEXT NOT NULL,
+    cycles      INTEGER NOT NULL DEFAULT 0,
+    cy5_final   REAL,
+    fam_final   REAL,
+    hex_final   REAL,
+    file_mtime  REAL,
+    file_size   INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS runs_by_project ON runs (project);
+"""
+
+COLUMNS = ["id", "path", "project", "user", "timestamp", "cycles",
+           "cy5_final", "fam_final", "hex_final"]
+
+
+def parse_run_filename(path):
+    """'<project>_<YYYYmmdd_HHMMSS>_data.csv' -> (project, 'YYYY-mm-dd HH:MM:SS')"""
+    match = RUN_FILE_RE.match(os.path.basename(path))
+    if not match:
+        return None, None
+    ts = datetime.strptime(match.group("ts"), "%Y%m%d_%H%M%S")
+    return match.group("project"), ts.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def summarize_csv(path):
+    """Stream a run CSV once: cycle count and replicate means of the last cycle"""
+    cycles = 0
+    last = None
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        for row in reader:
+            if row:
+                cycles += 1
+                last = row
+    if last is None:
+        return {"cycles": 0, "cy5_final": None, "fam_final": None, "hex_final": None}
+    values = [float(v) for v in last]
+    return {
+        "cycles": cycles,
+        "cy5_final": sum(values[1:4]) / 3,
+        "fam_final": sum(values[4:7]) / 3,
+        "hex_final": values[7],
+    }
+
+
+class RunCatalog:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # One connection shared by the UI and the sync thread, serialised by a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ========== Updates ==========
+    def add_run(self, path, project=None, user="", timestamp=None, summary=None):
+        """Insert or update one run; summary is read from the CSV if not given"""
+        path = os.path.abspath(path)
+        name_project, name_ts = parse_run_filename(path)
+        project = project or name_project or os.path.basename(path)
+        timestamp = timestamp or name_ts or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        summary = summary or summarize_csv(path)
+        st = os.stat(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO runs (path, project, user, timestamp, cycles,
+                                     cy5_final, fam_final, hex_final, file_mtime, file_size)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                       project=excluded.project, user=excluded.user, timestamp=excluded.timestamp,
+                       cycles=excluded.cycles, cy5_final=excluded.cy5_final,
+                       fam_final=excluded.fam_final, hex_final=excluded.hex_final,
+                       file_mtime=excluded.file_mtime, file_size=excluded.file_size""",
+                (path, project, user or "", timestamp, summary["cycles"], summary["cy5_final"],
+                 summary["fam_final"], summary["hex_final"], st.st_mtime, st.st_size),
+            )
+
+    def sync_directory(self, directory):
+        """
+        Bring the catalog in line with the run CSVs in directory
+
+        New or modified files are (re)summarised, rows for deleted files are
+        removed, unchanged files are skipped. Returns (added_or_updated, removed).
+        """
+        directory = os.path.abspath(directory)
+        # Range bounds instead of LIKE: run names contain "_" (a LIKE wildcard).
+        # Everything under directory sorts between "<dir>/" and "<dir>0".
+        prefix = os.path.join(directory, "")
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        with self._lock:
+            known = {
+                row["path"]: (row["file_mtime"], row["file_size"])
+                for row in self._conn.execute(
+                    "SELECT path, file_mtime, file_size FROM runs WHERE path >= ? AND path < ?",
+                    (prefix, upper))
+                # not in a subdirectory, and not an archived run (no CSV any more)
+                if os.path.dirname(row["path"]) == directory and "::" not in row["path"]
+            }
+
+        seen = set()
+        updated = 0
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if not entry.is_file() or not RUN_FILE_RE.match(entry.name):
+                continue
+            seen.add(entry.path)
+            st = entry.stat()
+            if known.get(entry.path) == (st.st_mtime, st.st_size):
+                continue
+            try:
+                self.add_run(entry.path)
+            except (OSError, ValueError) as e:
+                print(f"Skipping {entry.path}: {e}")
+                continue
+            updated += 1
+
+        removed = [p for p in known if p not in seen]
+        if removed:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM runs WHERE path = ?", [(p,) for p in removed])
+        return updated, len(removed)
+
+    def relocate(self, moves):
+        """Point rows at new paths, e.g. {csv path: run_archive reference}"""
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE runs SET path = ? WHERE path = ?",
+                                   [(new, old) for old, new in moves.items()])
+
+    # ========== Queries ==========
+    def count(self, project=None):
+        sql, args = "SELECT COUNT(*) FROM runs", ()
+        if project:
+            sql, args = sql + " WHERE project = ?", (project,)
+        with self._lock:
+            return self._conn.execute(sql, args).fetchone()[0]
+
+    def page(self, offset=0, limit=50, project=None):
+        """Newest runs first, as a list of dicts"""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs"
+        args = []
+        if project:
+            sql += " WHERE project = ?"
+            args.append(project)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
+        args += [limit, offset]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, args)]
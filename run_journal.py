@@ -0,0 +1,192 @@
+"""
+Checkpoint journal for an in-progress run
+
+One small append-only file per active run. Every line is a self-checking
+record:
+
+    <crc32 of json, 8 hex digits> <json>\\n
+
+    {"type": "begin", "meta": {...}}                      run parameters
+    {"type": "checkpoint", "stage": ..., "stage_index": ..., "cycle": ...,
+     "setpoint": ..., "rows": [[...], ...]}               state + new records
+    {"type": "end", "status": "complete"}                 run finished
+
+A checkpoint carries only the records added since the previous one, so
+each write is a few hundred bytes. Lines are flushed and fsynced (every
+`fsync_every` checkpoints), so after a crash or power cut the file holds
+every checkpoint up to the last sync plus possibly one torn line.
+
+begin() never truncates the old journal in place: the begin record (and,
+on resume, a checkpoint with every completed row) goes to a temporary
+file that is fsynced and renamed over the old journal, so a power cut
+right after resuming still leaves the earlier run recoverable.
+
+replay() reads the longest valid prefix. It stops at the first line with
+a bad checksum, bad JSON or no trailing newline, so a torn tail is simply
+ignored. It returns the state of the last consistent checkpoint, or None
+if there is nothing to resume.
+"""
+
+import json
+import os
+import tempfile
+import zlib
+
+
+def _encode(record):
+    body = json.dumps(record, separators=(",", ":"))
+    return f"{zlib.crc32(body.encode()):08x} {body}\n"
+
+
+def _decode(line):
+    """Parsed record, or None if the line is torn or corrupt"""
+    if not line.endswith("\n") or len(line) < 10 or line[8] != " ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body.encode()):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class RunJournal:
+    def __init__(self, path, fsync_every=1):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._unsynced = 0
+
+        # Statistics
+        self.checkpoints = 0
+        self.bytes_written = 0
+
+    def begin(self, meta, resume=None):
+        """
+        Start a new journal, atomically replacing any previous one
+
+        resume is a dict of checkpoint() arguments (stage, stage_index,
+        cycle, setpoint, rows) written with the begin record, so a resumed
+        run carries all of its completed rows before the old file goes.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".journal.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(_encode({"type": "begin", "meta": meta}))
+                if resume is not None:
+                    f.write(_encode(self._checkpoint_record(**resume)))
+                    self.checkpoints += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _sync_directory(directory)
+        self._file = open(self.path, "a")
+        return self
+
+    def checkpoint(self, stage, stage_index, cycle, setpoint=None, rows=(), sync=False):
+        """Record the current state and the rows added since the last checkpoint"""
+        self._write(self._checkpoint_record(stage, stage_index, cycle, setpoint, rows), sync=sync)
+        self.checkpoints += 1
+
+    @staticmethod
+    def _checkpoint_record(stage, stage_index, cycle, setpoint=None, rows=()):
+        return {
+            "type": "checkpoint",
+            "stage": stage,
+            "stage_index": stage_index,
+            "cycle": cycle,
+            "setpoint": setpoint,
+            "rows": [[float(v) for v in row] for row in rows],
+        }
+
+    def finish(self, status="complete"):
+        """Mark the run finished and remove the journal - nothing left to resume"""
+        if self._file is None:
+            return
+        self._write({"type": "end", "status": status}, sync=True)
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record, sync=False):
+        line = _encode(record)
+        self._file.write(line)
+        self._file.flush()
+        self.bytes_written += len(line)
+        self._unsynced += 1
+        if sync or self._unsynced >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+
+def _sync_directory(directory):
+    # Make a rename durable
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def replay(path):
+    """
+    State of the last consistent checkpoint of an unfinished run
+
+    Returns None if there is no journal, it has no valid begin record or
+    the run finished. Otherwise a dict:
+        {"meta": {...}, "stage": ..., "stage_index": ..., "cycle": ...,
+         "setpoint": ..., "rows": [...], "checkpoints": n, "torn": bool}
+    """
+    try:
+        f = open(path)
+    except FileNotFoundError:
+        return None
+    state = None
+    torn = False
+    with f:
+        for line in f:
+            record = _decode(line)
+            if record is None:
+                torn = True
+                break
+            kind = record.get("type")
+            if kind == "begin":
+                state = {"meta": record["meta"], "stage": None, "stage_index": 0, "cycle": 0,
+                         "setpoint": None, "rows": [], "checkpoints": 0}
+            elif state is None:
+                break
+            elif kind == "checkpoint":
+                for key in ("stage", "stage_index", "cycle", "setpoint"):
+                    state[key] = record[key]
+                state["rows"].extend(record["rows"])
+                state["checkpoints"] += 1
+            elif kind == "end":
+                return None
+    if state is None:
+        return None
+    state["torn"] = torn
+    return state
+
+
+def discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,148 @@
+"""
+Columnar in-memory store for PCR run records
+
+All cycles live in one preallocated float64 block of shape (capacity, 8),
+columns in CSV order (see run_writer.FIELDNAMES). Capacity doubles when it
+runs out, so appends are amortised O(1) and no per-row dicts or lists are
+kept. Each channel is a view into the block:
+
+    store.elapsed   (n,)
+    store.cy5       (n, 3)
+    store.fam       (n, 3)
+    store.hex       (n,)
+
+Export is vectorised: to_csv() / save_npy() / save_npz() write the whole
+block at once.
+"""
+
+import numpy as np
+
+from run_writer import FIELDNAMES
+
+N_COLUMNS = len(FIELDNAMES)
+CHANNEL_COLUMNS = {
+    "elapsed": 0,
+    "cy5": slice(1, 4),
+    "fam": slice(4, 7),
+    "hex": 7,
+}
+
+
+class RunRecordStore:
+    def __init__(self, capacity=64):
+        self._data = np.empty((max(int(capacity), 1), N_COLUMNS), dtype=np.float64)
+        self._n = 0
+
+    # ========== Building ==========
+    def _reserve(self, extra):
+        needed = self._n + extra
+        capacity = len(self._data)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty((capacity, N_COLUMNS), dtype=np.float64)
+        grown[:self._n] = self._data[:self._n]
+        self._data = grown
+
+    def append(self, elapsed, cy5, fam, hex_value):
+        self._reserve(1)
+        row = self._data[self._n]
+        row[0] = elapsed
+        row[1:4] = cy5
+        row[4:7] = fam
+        row[7] = hex_value
+        self._n += 1
+        return row
+
+    def append_record(self, record):
+        """Append a legacy data_records dict"""
+        return self.append(record['elapsed'], record['cy5_avg_values'],
+                           record['fam_avg_values'], record['hex_value'])
+
+    def extend(self, rows):
+        """Append an (m, 8) array of rows in one copy"""
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, N_COLUMNS)
+        self._reserve(len(rows))
+        self._data[self._n:self._n + len(rows)] = rows
+        self._n += len(rows)
+
+    def clear(self):
+        self._n = 0
+
+    # ========== Access ==========
+    def __len__(self):
+        return self._n
+
+    def as_array(self):
+        """(n, 8) view of all rows, columns in FIELDNAMES order"""
+        return self._data[:self._n]
+
+    def channel(self, name):
+        return self._data[:self._n, CHANNEL_COLUMNS[name]]
+
+    elapsed = property(lambda self: self.channel("elapsed"))
+    cy5 = property(lambda self: self.channel("cy5"))
+    fam = property(lambda self: self.channel("fam"))
+    hex = property(lambda self: self.channel("hex"))
+
+    def cube(self):
+        """
+        (cycles, wells, channels) = (n, 3, 3) copy for pcr_analysis
+
+        Channels are cy5, fam, hex; hex has a single well, wells 2-3 are NaN.
+        """
+        cube = np.full((self._n, 3, 3), np.nan)
+        cube[:, :, 0] = self.cy5
+        cube[:, :, 1] = self.fam
+        cube[:, 0, 2] = self.hex
+        return cube
+
+    def row(self, index):
+        return self._data[:self._n][index]
+
+    def summary(self):
+        """Cycle count and last-cycle replicate means (run_catalog summary fields)"""
+        if not self._n:
+            return {"cycles": 0, "cy5_final": None, "fam_final": None, "hex_final": None}
+        last = self._data[self._n - 1]
+        return {
+            "cycles": self._n,
+            "cy5_final": float(last[1:4].mean()),
+            "fam_final": float(last[4:7].mean()),
+            "hex_final": float(last[7]),
+        }
+
+    # ========== Export ==========
+    def to_csv(self, path):
+        np.savetxt(path, self.as_array(), delimiter=",", fmt="%.10g",
+                   header=",".join(FIELDNAMES), comments="")
+
+    def save_npy(self, path):
+        np.save(path, self.as_array())
+
+    def save_npz(self, path, compressed=True):
+        save = np.savez_compressed if compressed else np.savez
+        save(path, **{name: self.channel(name) for name in CHANNEL_COLUMNS})
+
+    # ========== Import ==========
+    @classmethod
+    def from_array(cls, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, N_COLUMNS)
+        store = cls(capacity=len(rows))
+        store.extend(rows)
+        return store
+
+    @classmethod
+    def load(cls, path):
+        """Load a run saved by to_csv(), save_npy(), save_npz() or a run_archive reference"""
+        if "::" in path:  # "<archive>::<run name>"
+            import run_archive
+            return run_archive.load_ref(path)
+        if path.endswith(".npy"):
+            return cls.from_array(np.load(path))
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                columns = [data["elapsed"][:, None], data["cy5"], data["fam"], data["hex"][:, None]]
+                return cls.from_array(np.hstack(columns))
+        return cls.from_array(np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2))
@@ -0,0 +1,155 @@
+"""
+Streaming, crash-safe CSV export for a PCR run
+
+Each cycle record is appended as it arrives; a background thread writes
+rows to "<path>.part" through a buffered file and fsyncs it every few
+records / seconds. close() flushes everything and atomically renames the
+.part file to its final name, so a finished CSV is always complete. If the
+run is stopped or the process dies, the .part file keeps every record
+written up to the last fsync.
+
+A resumed run passes its completed rows as `initial_rows`; they are
+written to a temporary file that is fsynced and renamed over the old
+.part file, which is never truncated in place.
+
+    writer = IncrementalCSVWriter(csv_path).start()
+    writer.append(record)        # from any thread, never blocks on disk
+    writer.append_row(row)       # or a row already in FIELDNAMES order
+    ...
+    writer.close()               # -> csv_path, or None if a write failed
+
+A write or fsync error (full disk, SD card fault) stops the writer; it is
+kept in `error`, close() then returns None and leaves the .part file.
+"""
+
+import csv
+import os
+import queue
+import threading
+import time
+
+FIELDNAMES = ['elapsed', 'cy5_avg_value1', 'cy5_avg_value2', 'cy5_avg_value3',
+              'fam_avg_value1', 'fam_avg_value2', 'fam_avg_value3', 'hex_value']
+
+_CLOSE = object()
+_ABORT = object()
+
+
+def record_to_row(record):
+    """Flatten one data_records entry into CSV column order"""
+    cy5 = record['cy5_avg_values']
+    fam = record['fam_avg_values']
+    return [record['elapsed'], cy5[0], cy5[1], cy5[2], fam[0], fam[1], fam[2], record['hex_value']]
+
+
+class IncrementalCSVWriter:
+    def __init__(self, path, fsync_every=10, fsync_interval=5.0, initial_rows=()):
+        self.path = path
+        self.part_path = path + ".part"
+        self.initial_rows = [list(row) for row in initial_rows]
+        self.fsync_every = fsync_every          # records between fsyncs
+        self.fsync_interval = fsync_interval    # seconds between fsyncs
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+        self.error = None                       # OSError that stopped the writer thread
+
+        # Statistics
+        self.written = 0
+        self.fsyncs = 0
+
+    def start(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._write_initial()
+        self._thread = threading.Thread(target=self._run, name="run-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def append(self, record):
+        self._queue.put(record_to_row(record))
+
+    def append_row(self, row):
+        self._queue.put(row)
+
+    def close(self, timeout=10.0):
+        """
+        Write remaining records, fsync and rename <path>.part -> <path>
+
+        Returns the final path, or None if writing failed (see `error`);
+        whatever was written is then still in <path>.part.
+        """
+        self._finish(_CLOSE, timeout)
+        if self.error is not None or not os.path.exists(self.path):
+            return None
+        return self.path
+
+    def abort(self, timeout=10.0):
+        """Stop writing but keep <path>.part (partial run) on disk"""
+        self._finish(_ABORT, timeout)
+        return self.part_path
+
+    def _finish(self, marker, timeout):
+        if self._thread is None:
+            return
+        self._queue.put(marker)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _write_initial(self):
+        """Header and initial rows -> <path>.part, replaced atomically"""
+        tmp_path = self.part_path + ".tmp"
+        with open(tmp_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDNAMES)
+            writer.writerows(self.initial_rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.part_path)
+        self._sync_directory()
+        self.written += len(self.initial_rows)
+
+    def _run(self):
+        try:
+            self._write_rows()
+        except OSError as e:
+            self.error = e
+            print(f"Writing {self.part_path} failed: {e}")
+
+    def _write_rows(self):
+        with open(self.part_path, "a", newline="", buffering=64 * 1024) as f:
+            writer = csv.writer(f)
+            unsynced = 0
+            last_sync = time.monotonic()
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE or item is _ABORT:
+                    break
+                writer.writerow(item)
+                self.written += 1
+                unsynced += 1
+                if unsynced >= self.fsync_every or time.monotonic() - last_sync >= self.fsync_interval:
+                    self._sync(f)
+                    unsynced = 0
+                    last_sync = time.monotonic()
+            self._sync(f)
+
+        if item is _CLOSE:
+            os.replace(self.part_path, self.path)
+            self._sync_directory()
+
+    def _sync(self, f):
+        f.flush()
+        os.fsync(f.fileno())
+        self.fsyncs += 1
+
+    def _sync_directory(self):
+        # Make the rename itself durable
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
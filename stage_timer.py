@@ -0,0 +1,172 @@
+"""
+Drift-free stage and hold timers - no Kivy dependency
+
+Timers are computed from time.monotonic() deadlines instead of counting
+callbacks, so a dropped frame, a slow callback or a Clock event that
+fires late never stretches a stage:
+
+    timer = StageTimer("Holding", 30).start()
+    timer.remaining()          # seconds left, from the deadline
+    timer.expired()
+
+    ticks = PeriodicSchedule(1.0).start()
+    for n in ticks.due():      # every tick whose deadline has passed, in order
+        ...                    # a late callback catches up on the missed ticks
+
+A stage that follows another starts at the previous stage's deadline
+(StageTimer.start(at=...)), not at the moment the late callback noticed
+it, so the error does not accumulate across stages.
+
+TimingReport collects, per stage, how late the stage ended and how late
+its ticks ran:
+
+    {"Holding": {"planned": 30.0, "actual": 30.004, "end_error_ms": 4.1,
+                 "ticks": 30, "late_ticks": 0, "max_tick_error_ms": 3.2,
+                 "mean_tick_error_ms": 0.8}}
+"""
+
+import time
+
+
+class StageTimer:
+    def __init__(self, name, duration, clock=time.monotonic):
+        self.name = name
+        self.duration = duration
+        self.clock = clock
+        self.started = None
+        self.deadline = None
+        self._paused_at = None
+
+    def start(self, at=None):
+        """Start now, or at an earlier deadline so back-to-back stages do not drift"""
+        self.started = self.clock() if at is None else at
+        self.deadline = self.started + self.duration
+        self._paused_at = None
+        return self
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.clock()
+
+    def resume(self):
+        """Shift the deadline by the time spent paused"""
+        if self._paused_at is not None:
+            self.deadline += self.clock() - self._paused_at
+            self._paused_at = None
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def _now(self, now):
+        if self._paused_at is not None:
+            return self._paused_at
+        return self.clock() if now is None else now
+
+    def remaining(self, now=None):
+        return max(self.deadline - self._now(now), 0.0)
+
+    def elapsed(self, now=None):
+        return min(self.duration - (self.deadline - self._now(now)), self.duration)
+
+    def fraction(self, now=None):
+        return self.elapsed(now) / self.duration if self.duration > 0 else 1.0
+
+    def expired(self, now=None):
+        return self._now(now) >= self.deadline
+
+    def lateness(self, now=None):
+        """Seconds past the deadline (negative while still running)"""
+        return self._now(now) - self.deadline
+
+
+class PeriodicSchedule:
+    """
+    Ticks at start + n * period
+
+    due() returns the numbers of all ticks whose deadline has passed since
+    the last call, so a late caller catches up instead of losing ticks.
+    With max_catch_up set, older missed ticks beyond that many are skipped
+    (counted in `skipped`).
+    """
+
+    def __init__(self, period, clock=time.monotonic, max_catch_up=None):
+        self.period = period
+        self.clock = clock
+        self.max_catch_up = max_catch_up
+        self.base = None
+        self.next_tick = 1
+        self.skipped = 0
+        self.errors = []          # lateness of each tick when it was handed out
+
+    def start(self, at=None):
+        self.base = self.clock() if at is None else at
+        self.next_tick = 1
+        self.skipped = 0
+        self.errors = []
+        return self
+
+    def deadline(self, tick):
+        return self.base + tick * self.period
+
+    def shift(self, seconds):
+        """Move all future deadlines, e.g. by the time spent paused"""
+        self.base += seconds
+
+    def due(self, now=None):
+        now = self.clock() if now is None else now
+        last = int((now - self.base) // self.period)
+        if last < self.next_tick:
+            return []
+        first = self.next_tick
+        if self.max_catch_up is not None and last - first + 1 > self.max_catch_up:
+            self.skipped += last - first + 1 - self.max_catch_up
+            first = last - self.max_catch_up + 1
+        ticks = list(range(first, last + 1))
+        self.errors.extend(now - self.deadline(n) for n in ticks)
+        self.next_tick = last + 1
+        return ticks
+
+
+class TimingReport:
+    def __init__(self, late_threshold=0.1):
+        self.late_threshold = late_threshold  # seconds; a tick later than this counts as late
+        self.stages = {}
+
+    def _stage(self, name):
+        return self.stages.setdefault(name, {"planned": 0.0, "actual": 0.0, "end_error": 0.0,
+                                             "tick_errors": []})
+
+    def record_tick(self, stage, error):
+        self._stage(stage)["tick_errors"].append(error)
+
+    def record_stage(self, stage, planned, actual, end_error):
+        entry = self._stage(stage)
+        entry["planned"] += planned
+        entry["actual"] += actual
+        entry["end_error"] = end_error
+
+    def stats(self):
+        stats = {}
+        for name, entry in self.stages.items():
+            errors = entry["tick_errors"]
+            stats[name] = {
+                "planned": round(entry["planned"], 3),
+                "actual": round(entry["actual"], 3),
+                "end_error_ms": round(entry["end_error"] * 1000, 1),
+                "ticks": len(errors),
+                "late_ticks": sum(1 for e in errors if e > self.late_threshold),
+                "max_tick_error_ms": round(max(errors) * 1000, 1) if errors else None,
+                "mean_tick_error_ms": round(sum(errors) / len(errors) * 1000, 1) if errors else None,
+            }
+        return stats
+
+    def format(self):
+        lines = []
+        for name, s in self.stats().items():
+            line = f"{name}: {s['actual']:.3f} s (planned {s['planned']:.3f} s, end {s['end_error_ms']:+.1f} ms)"
+            if s["ticks"]:
+                line += (f", {s['ticks']} ticks, max {s['max_tick_error_ms']:.1f} ms late,"
+                         f" {s['late_ticks']} late")
+            lines.append(line)
+        return "\n".join(lines)
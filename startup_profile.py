@@ -0,0 +1,141 @@
+"""
+Startup-time profiling for the GUI apps
+
+Enabled with the environment variable TEC_PROFILE_STARTUP=1 (Kivy parses
+sys.argv itself, so a command line flag is not used). When disabled every
+function here is a cheap no-op.
+
+    import startup_profile
+    startup_profile.begin()              # first line of the app, hooks __import__
+    ...imports...
+    startup_profile.end_imports()
+
+    with startup_profile.timed("screen:lock"):
+        sm.add_widget(LockScreen(name="lock"))
+
+    def on_start(self):
+        startup_profile.watch_first_frame()   # prints the report after the first frame
+
+With TEC_PROFILE_EXIT=1 the app stops right after printing the report,
+which is what benchmarks/bench_startup.py uses.
+"""
+
+import builtins
+import os
+import sys
+import time
+
+ENABLED = os.environ.get("TEC_PROFILE_STARTUP") == "1"
+EXIT_AFTER_REPORT = os.environ.get("TEC_PROFILE_EXIT") == "1"
+
+_t0 = time.perf_counter()
+_imports = []           # (depth, name, seconds) in completion order
+_sections = []          # (name, seconds)
+_marks = {}             # name -> seconds since _t0
+_depth = 0
+_original_import = None
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _depth
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _depth -= 1
+        _imports.append((_depth, name, time.perf_counter() - start))
+
+
+def begin():
+    """Start recording first-time imports"""
+    global _original_import
+    if ENABLED and _original_import is None:
+        _original_import = builtins.__import__
+        builtins.__import__ = _timed_import
+
+
+def end_imports():
+    """Stop recording imports and remember how long module import took"""
+    global _original_import
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+    mark("imports done")
+
+
+def mark(name):
+    if ENABLED:
+        _marks[name] = time.perf_counter() - _t0
+
+
+class _Section:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _sections.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+def timed(name):
+    """Context manager timing one block (e.g. a screen constructor)"""
+    return _Section(name) if ENABLED else _NULL_SECTION
+
+
+def watch_first_frame():
+    """Record time-to-first-frame on the next Window draw, then print the report"""
+    if not ENABLED:
+        return
+    from kivy.core.window import Window
+
+    def on_first_draw(*args):
+        Window.unbind(on_draw=on_first_draw)
+        mark("first frame")
+        report()
+        if EXIT_AFTER_REPORT:
+            from kivy.app import App
+            App.get_running_app().stop()
+
+    Window.bind(on_draw=on_first_draw)
+
+
+def report(top=25, out=None):
+    out = out or sys.stdout
+    print("\n========== Startup profile ==========", file=out)
+
+    print(f"Slowest imports (top {top}, inclusive, depth <= 1):", file=out)
+    shown = sorted((i for i in _imports if i[0] <= 1), key=lambda i: i[2], reverse=True)
+    for depth, name, seconds in shown[:top]:
+        print(f"  {seconds * 1000:8.1f} ms  {'  ' * depth}{name}", file=out)
+
+    if _sections:
+        print("Sections:", file=out)
+        for name, seconds in _sections:
+            print(f"  {seconds * 1000:8.1f} ms  {name}", file=out)
+
+    print("Milestones (since app start):", file=out)
+    for name, seconds in _marks.items():
+        print(f"  {seconds * 1000:8.1f} ms  {name}", file=out)
+
+    if "first frame" in _marks:
+        # Parsed by benchmarks/bench_startup.py
+        print(f"time_to_first_frame_ms={_marks['first frame'] * 1000:.1f}", file=out)
+    print("=====================================\n", file=out, flush=True)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Vectorised synthetic PCR data
+
+amplification_curves() draws any number of runs in one call as a
+(runs, cycles, wells, channels) array of logistic amplification curves:
+
+    y = baseline + drift * cycle + plateau / (1 + exp(-(cycle - ct) / slope)) + noise
+
+Ct, plateau, baseline and drift vary per trace; noise varies per cycle.
+No Python loops run over runs, cycles or wells. generate_runs() reshapes
+the result into run-record rows (run_writer.FIELDNAMES order), which is
+what RunRecordStore, the CSV writer and the catalog consume.
+
+Examples:
+    python3 synthetic_pcr.py --runs 1000 --out /tmp/pcr_stress          # export + catalog timing
+    python3 synthetic_pcr.py --runs 200 --cycles 45 --ct 20 24 30 --out /tmp/pcr --analyse
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+CHANNELS = ("cy5", "fam", "hex")
+DEFAULT_CT = (22.0, 25.0, 28.0)     # cy5, fam, hex
+
+
+def amplification_curves(runs=1, cycles=40, wells=3, channels=3, ct=DEFAULT_CT, ct_sd=0.3,
+                         plateau=1000.0, plateau_cv=0.1, slope=1.6, baseline=150.0,
+                         baseline_sd=20.0, drift=0.5, noise=3.0, negative_fraction=0.0,
+                         seed=None):
+    """
+    (runs, cycles, wells, channels) float64 array of amplification curves
+
+    ct may be a scalar, a per-channel sequence or any array broadcastable
+    to (runs, wells, channels); ct_sd adds per-trace scatter around it.
+    negative_fraction of the traces get no amplification (plateau 0).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (runs, wells, channels)
+
+    ct = np.broadcast_to(np.asarray(ct, dtype=np.float64), shape)
+    ct = ct + rng.normal(0.0, ct_sd, shape)
+    height = plateau * np.maximum(rng.normal(1.0, plateau_cv, shape), 0.0)
+    if negative_fraction > 0:
+        height[rng.random(shape) < negative_fraction] = 0.0
+    base = rng.normal(baseline, baseline_sd, shape)
+    tilt = rng.normal(drift, abs(drift) * 0.5, shape)
+
+    x = np.arange(cycles, dtype=np.float64)[None, :, None, None]
+    z = np.clip(-(x - ct[:, None]) / slope, -60, 60)
+    curves = base[:, None] + tilt[:, None] * x + height[:, None] / (1.0 + np.exp(z))
+    curves += rng.normal(0.0, noise, curves.shape)
+    return curves
+
+
+def to_rows(curves, elapsed=None):
+    """
+    (runs, cycles, wells, channels) -> (runs, cycles, 8) run-record rows
+
+    Columns: elapsed, cy5 wells 1-3, fam wells 1-3, hex well 1.
+    """
+    runs, cycles = curves.shape[:2]
+    rows = np.empty((runs, cycles, 8))
+    rows[:, :, 0] = np.arange(cycles) if elapsed is None else elapsed
+    rows[:, :, 1:4] = curves[:, :, :3, 0]
+    rows[:, :, 4:7] = curves[:, :, :3, 1]
+    rows[:, :, 7] = curves[:, :, 0, 2]
+    return rows
+
+
+def generate_runs(runs=1, cycles=40, **kwargs):
+    """(runs, cycles, 8) rows ready for RunRecordStore.from_array()"""
+    return to_rows(amplification_curves(runs, cycles, wells=3, channels=3, **kwargs))
+
+
+def write_runs(directory, rows, project="synthetic", start=None):
+    """Write each run as <project>_<YYYYmmdd_HHMMSS>_data.csv; returns the paths"""
+    from run_store import RunRecordStore
+
+    os.makedirs(directory, exist_ok=True)
+    start = start or datetime.now().replace(microsecond=0)
+    paths = []
+    for i, run in enumerate(rows):
+        ts = (start + timedelta(minutes=i)).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"{project}_{ts}_data.csv")
+        RunRecordStore.from_array(run).to_csv(path)
+        paths.append(path)
+    return paths
+
+
+# ========== Stress test ==========
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate synthetic runs and time the pipeline")
+    parser.add_argument("--runs", type=int, default=100, help="number of runs (default 100)")
+    parser.add_argument("--cycles", type=int, default=40, help="cycles per run (default 40)")
+    parser.add_argument("--ct", type=float, nargs=3, metavar=("CY5", "FAM", "HEX"),
+                        default=DEFAULT_CT, help="mean Ct per channel (default 22 25 28)")
+    parser.add_argument("--ct-sd", type=float, default=0.3, help="per-well Ct scatter")
+    parser.add_argument("--noise", type=float, default=3.0, help="per-cycle noise SD")
+    parser.add_argument("--negative", type=float, default=0.0,
+                        help="fraction of wells without amplification")
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--out", help="write run CSVs here and index them in a catalog")
+    parser.add_argument("--project", default="synthetic", help="project name in file names")
+    parser.add_argument("--analyse", action="store_true",
+                        help="run batch_analysis over the written runs (needs --out)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    def timed(label, func, *a, **kw):
+        t0 = time.perf_counter()
+        result = func(*a, **kw)
+        dt = max(time.perf_counter() - t0, 1e-9)
+        print(f"{label:<10} {dt * 1000:9.1f} ms  ({args.runs / dt:,.0f} runs/s)")
+        return result
+
+    rows = timed("generate", generate_runs, args.runs, args.cycles, ct=args.ct, ct_sd=args.ct_sd,
+                 noise=args.noise, negative_fraction=args.negative, seed=args.seed)
+    print(f"{rows.shape[0]} runs x {rows.shape[1]} cycles, {rows.nbytes / 1e6:.1f} MB")
+    if not args.out:
+        return 0
+
+    from run_catalog import RunCatalog
+
+    paths = timed("export", write_runs, args.out, rows, project=args.project)
+    catalog = RunCatalog(os.path.join(args.out, "catalog.sqlite3"))
+    timed("catalog", catalog.sync_directory, args.out)
+    print(f"catalog holds {catalog.count()} runs")
+    catalog.close()
+
+    if args.analyse:
+        import batch_analysis
+        from pcr_analysis import DEFAULT_BASELINE, DEFAULT_THRESHOLD_SD
+
+        params = {"baseline": list(DEFAULT_BASELINE), "threshold": None,
+                  "threshold_sd": DEFAULT_THRESHOLD_SD, "sigmoid": True}
+        stats = timed("analyse", batch_analysis.run_batch, args.out,
+                      os.path.join(args.out, batch_analysis.SUMMARY_NAME), params, force=True)
+        print(f"{stats['analysed']} analysed, {stats['failed']} failed")
+    print(f"{len(paths)} files in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Headless TEC daemon - acquisition, control and logging without Kivy
+
+Examples:
+    python3 tec_daemon.py --setpoint 60                 # hold 60°C until Ctrl+C / SIGTERM
+    python3 tec_daemon.py --setpoint 95:30 --setpoint 60:45
+    python3 tec_daemon.py --profile overnight.json --interval 1.0 --log ~/tec_logs/telemetry.csv
+    python3 tec_daemon.py --setpoint 60 --serve 8765    # stream telemetry / accept commands
+    python3 tec_daemon.py --profile pcr.json --adaptive # 0.1 s while ramping, 2 s on settled holds
+    python3 tec_daemon.py --replay telemetry.csv --speed max --log /tmp/replay.csv --quiet
+
+Only the hardware drivers and the standard library are imported, so the
+daemon starts quickly and can run unattended from cron or systemd.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+from acquisition_rate import RatePolicy
+from thermal_profile import load_profile, parse_steps
+from tec_service import TECService
+from telemetry_log import TelemetryLogger
+from telemetry_server import TelemetryServer
+import metrics
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the TEC controller without the GUI")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--setpoint", action="append", metavar="TEMP[:HOLD]",
+                        help="setpoint in °C with optional hold seconds (repeatable)")
+    source.add_argument("--profile", help="thermal profile file (.json or .csv)")
+    source.add_argument("--replay", metavar="CSV",
+                        help="replay a recorded telemetry log instead of driving hardware")
+    parser.add_argument("--speed", default="1",
+                        help="replay speed: N x recorded time, or 'max' (default 1)")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="seconds between acquisition ticks (default 0.5)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="pick the tick interval from the control stage; --interval is "
+                             "then the rate for a hold that drifts off the setpoint")
+    parser.add_argument("--fast-interval", type=float, default=0.1,
+                        help="adaptive: seconds between ticks while ramping or settling (default 0.1)")
+    parser.add_argument("--slow-interval", type=float, default=2.0,
+                        help="adaptive: seconds between ticks on a settled hold or idle (default 2)")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="°C band that ends a ramp and starts the hold timer")
+    parser.add_argument("--keep-on", action="store_true",
+                        help="leave MAX1978 enabled after the profile finishes")
+    parser.add_argument("--log", metavar="CSV",
+                        help="record every tick to this file (buffered, rotated)")
+    parser.add_argument("--log-max-mb", type=float, default=10,
+                        help="rotate the log when it reaches this size (default 10 MB)")
+    parser.add_argument("--log-rotate-hours", type=float, default=24,
+                        help="rotate the log after this many hours (default 24)")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="stream telemetry and accept commands on 127.0.0.1:PORT")
+    parser.add_argument("--serve-unix", metavar="PATH",
+                        help="same as --serve, on a Unix socket")
+    parser.add_argument("--metrics", type=int, metavar="PORT",
+                        help="collect timing metrics and serve them on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not print a line per tick")
+    return parser
+
+
+def print_sample(sample):
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sample["timestamp"]))
+    print(f"{stamp}  {sample['stage']:<5}  set={sample['setpoint']}°C  "
+          f"actual={sample['temperature']}°C  dac={sample['dac_code']}  raw={sample['raw_code']}",
+          flush=True)
+
+
+def make_command_handler(service):
+    """Commands accepted from the telemetry server"""
+    def handle(cmd):
+        if cmd["cmd"] == "setpoint":
+            return service.set_setpoint(cmd["value"])
+        if cmd["cmd"] == "stop":
+            service.stop()
+            return True
+        raise ValueError(f"unknown command {cmd['cmd']!r}")
+    return handle
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.replay:
+        import replay
+        steps = None
+        tec_controller = replay.ReplayTECController()
+        sensor = replay.ReplaySensor(os.path.expanduser(args.replay), replay.parse_speed(args.speed))
+        max5144 = tec_controller.max5144
+    else:
+        steps = load_profile(args.profile) if args.profile else parse_steps(args.setpoint)
+        if not steps:
+            print("Profile contains no steps", file=sys.stderr)
+            return 2
+
+        # Hardware drivers are imported here so that --help works anywhere
+        from TEC_0602_2025 import MAX5144, TECController
+        from ad7928_0917001 import TemperatureSensor
+
+        max5144 = MAX5144(spi_bus=1, spi_device=1, cs_pin=17)
+        tec_controller = TECController(max5144)
+        sensor = TemperatureSensor()
+    rate = None
+    if args.adaptive and not args.replay:  # a replay keeps the recorded spacing
+        rate = RatePolicy(fast=args.fast_interval, normal=args.interval, slow=args.slow_interval,
+                          idle=args.slow_interval, band=max(2 * args.tolerance, 1.0))
+    service = TECService(tec_controller, sensor, interval=args.interval, tolerance=args.tolerance,
+                         rate=rate)
+    metrics_server = None
+    if args.metrics:
+        metrics.enable()
+        if not args.replay:
+            metrics.instrument_hardware(tec_controller, sensor)
+        metrics.instrument(service, "tick", "tec_control_tick_seconds",
+                           "Full control tick (read + listeners)")
+        try:
+            metrics_server = metrics.MetricsHTTPServer(port=args.metrics).start()
+        except OSError as e:
+            print(f"Metrics endpoint on port {args.metrics} not started: {e}", file=sys.stderr)
+    if not args.quiet:
+        service.add_listener(print_sample)
+    telemetry_log = None
+    if args.log:
+        telemetry_log = TelemetryLogger(os.path.expanduser(args.log),
+                                        max_bytes=int(args.log_max_mb * 1024 * 1024),
+                                        rotate_seconds=args.log_rotate_hours * 3600).start()
+        service.add_listener(telemetry_log)
+    server = None
+
+    # SIGTERM (systemd stop) ends the run like Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+
+    completed = False
+    try:
+        if args.serve or args.serve_unix:
+            try:
+                server = TelemetryServer(port=args.serve or 8765, unix_path=args.serve_unix,
+                                         on_command=make_command_handler(service)).start()
+            except OSError as e:
+                print(f"Cannot start telemetry server: {e}", file=sys.stderr)
+                return 2
+            service.add_listener(server)
+        if args.replay:
+            completed = replay.run_replay(service, sensor)
+        else:
+            completed = service.run_profile(steps)
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+    finally:
+        max5144.cleanup()
+        if args.keep_on:
+            sensor.spi.close()  # GPIO.cleanup() would release the enable pin
+        else:
+            tec_controller.disable()
+            print("MAX1978 has been stopped.")
+            sensor.cleanup()
+        if server is not None:
+            server.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if telemetry_log is not None:
+            telemetry_log.close()
+            print(f"Telemetry log: {telemetry_log.stats()}")
+        if rate is not None:
+            print(f"Acquisition rate: {rate.stats()}")
+
+    return 0 if completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
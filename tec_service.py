@@ -0,0 +1,147 @@
+"""
+TEC acquisition and control service - no Kivy/KivyMD dependency
+
+TECService owns one TECController / TemperatureSensor pair. Each tick()
+reads the thermistor and hands a telemetry sample to every listener:
+
+    {"timestamp": ..., "setpoint": ..., "dac_code": ..., "raw_code": ...,
+     "temperature": ..., "stage": ...}
+
+run_profile() walks a list of thermal_profile.ProfileStep. A step first
+ramps until the reading is within `tolerance` of the setpoint, then holds
+for step.hold seconds. Ticks follow monotonic deadlines, so a slow SPI
+read does not stretch the loop period. With an acquisition_rate.RatePolicy
+the interval follows the stage (fast while ramping, slow on a settled
+hold) instead of staying fixed.
+
+The step logic itself is non-blocking - begin_step() and advance() - so
+instrument_manager can drive many services from one scheduler.
+"""
+
+import threading
+import time
+
+
+class TECService:
+    def __init__(self, tec_controller, sensor, interval=0.5, tolerance=0.5, ramp_timeout=600, rate=None):
+        self.tec_controller = tec_controller
+        self.sensor = sensor
+        self.interval = interval          # seconds between ticks
+        self.tolerance = tolerance        # °C, ramp -> hold threshold
+        self.ramp_timeout = ramp_timeout  # seconds, start holding anyway after this
+        self.rate = rate                  # acquisition_rate.RatePolicy, None = fixed interval
+
+        self.setpoint = None
+        self.stage = "idle"               # idle / ramp / hold
+        self.step = None                  # current ProfileStep
+        self.last_sample = None
+
+        self._ramp_start = None
+        self._hold_end = None
+        self._listeners = []
+        self._stop_event = threading.Event()
+
+    # ========== Listeners ==========
+    def add_listener(self, callback):
+        """callback(sample) is called from the control thread on every tick"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ========== Control ==========
+    def set_setpoint(self, temperature):
+        temperature = int(round(float(temperature)))
+        if self.tec_controller.set_temperature(temperature):
+            self.setpoint = temperature
+            return True
+        return False
+
+    def stop(self):
+        """Ask run_step()/run_profile() to return before the next tick"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds; True if stop() was called meanwhile"""
+        return self._stop_event.wait(timeout)
+
+    # ========== Acquisition ==========
+    def tick(self):
+        temperature = self.sensor.read_temperature()
+        sample = {
+            "timestamp": time.time(),
+            "setpoint": self.setpoint,
+            "dac_code": self.tec_controller.dac_value,
+            "raw_code": self.sensor.last_raw,
+            "temperature": temperature,
+            "stage": self.stage,
+        }
+        self.last_sample = sample
+        for callback in list(self._listeners):
+            callback(sample)
+        return sample
+
+    def next_interval(self, sample=None):
+        """Seconds until the next tick, from the rate policy if there is one"""
+        if self.rate is None:
+            return self.interval
+        sample = sample or self.last_sample
+        return self.rate.interval(self.stage, self.setpoint,
+                                  sample["temperature"] if sample else None)
+
+    def begin_step(self, step):
+        """Apply step.setpoint and start ramping; False if it is out of range"""
+        self.step = step
+        if not self.set_setpoint(step.setpoint):
+            return False
+        self.stage = "ramp"
+        self._ramp_start = time.monotonic()
+        self._hold_end = None
+        return True
+
+    def advance(self, sample, now):
+        """Update ramp/hold from one sample; True once the step's hold is over"""
+        if self._hold_end is None:
+            reached = abs(sample["temperature"] - self.setpoint) <= self.tolerance
+            if reached or now - self._ramp_start >= self.ramp_timeout:
+                if not reached:
+                    print(f"Ramp to {self.setpoint}°C timed out, holding anyway")
+                self.stage = "hold"
+                self._hold_end = now + self.step.hold if self.step.hold > 0 else float("inf")
+        return self._hold_end is not None and now >= self._hold_end
+
+    def run_step(self, step):
+        """Ramp to step.setpoint and hold it; returns False if stopped early"""
+        if not self.begin_step(step):
+            return True  # out of range, skip this step
+
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            sample = self.tick()
+            now = time.monotonic()
+            if self.advance(sample, now):
+                return True
+
+            next_tick += self.next_interval(sample)
+            if next_tick < now:
+                next_tick = now  # fell behind, do not burst
+            if self._stop_event.wait(next_tick - now):
+                break
+        return False
+
+    def run_profile(self, steps):
+        """Run every step in order; returns True if the profile completed"""
+        self._stop_event.clear()
+        try:
+            for step in steps:
+                if not self.run_step(step):
+                    return False
+            return True
+        finally:
+            self.stage = "idle"
+            self.step = None
@@ -0,0 +1,185 @@
+"""
+Buffered telemetry logger with rotation
+
+The control loop calls log(sample) (or passes the logger itself as a
+TECService listener). log() only does a non-blocking put on a bounded
+queue; a background thread batches rows into a CSV file, flushes on a
+schedule and rotates the file by size or age. When the queue is full the
+sample is dropped and counted instead of stalling the control path. A
+write error (e.g. a full disk) is printed and counted; the batch is
+dropped and the file is reopened on the next flush, so the thread keeps
+draining the queue.
+
+Rotated files are renamed to <name>.<YYYYmmdd-HHMMSS><ext>; only the
+newest `backup_count` of them are kept.
+"""
+
+import csv
+import glob
+import os
+import queue
+import threading
+import time
+
+FIELDS = ["timestamp", "setpoint", "dac_code", "raw_code", "temperature"]
+
+_STOP = object()
+
+
+class TelemetryLogger:
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, rotate_seconds=24 * 3600,
+                 backup_count=30, flush_interval=1.0, batch_size=256, queue_size=10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._file = None
+        self._writer = None
+        self._opened_at = 0.0
+
+        # Statistics
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.rotations = 0
+        self.errors = 0
+
+    # ========== Producer side (control thread) ==========
+    def log(self, sample):
+        try:
+            self._queue.put_nowait(sample)
+        except queue.Full:
+            self.dropped += 1
+
+    __call__ = log  # usable directly as a TECService listener
+
+    # ========== Lifecycle ==========
+    def start(self):
+        if self._thread is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="telemetry-log", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout=5.0):
+        """Write everything still queued, then stop the thread (gives up after timeout)"""
+        if self._thread is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=min(0.5, max(deadline - time.monotonic(), 0.01)))
+                break
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    print(f"Telemetry log {self.path}: writer not draining, {self._queue.qsize()} samples lost")
+                    break
+        self._thread.join(max(deadline - time.monotonic(), 0.0))
+        self._thread = None
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+            "errors": self.errors,
+        }
+
+    # ========== Writer thread ==========
+    def _run(self):
+        batch = []
+        failing = False
+        next_flush = time.monotonic() + self.flush_interval
+        running = True
+        while running:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is _STOP:
+                    running = False
+                else:
+                    batch.append(item)
+                # Drain whatever else is already waiting, up to one batch
+                while running and len(batch) < self.batch_size:
+                    item = self._queue.get_nowait()
+                    if item is _STOP:
+                        running = False
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            flush = now >= next_flush or not running
+            if flush:
+                next_flush = now + self.flush_interval
+            try:
+                if self._file is None:
+                    self._open()
+                if batch:
+                    self._writer.writerows(
+                        [sample.get(field) for field in FIELDS] for sample in batch
+                    )
+                    self.written += len(batch)
+                if flush:
+                    self._file.flush()
+                    self.flushes += 1
+                    if self._should_rotate():
+                        self._rotate()
+                failing = False
+            except OSError as e:
+                if not failing:  # report once per outage, not on every retry
+                    print(f"Telemetry log {self.path} write failed: {e}")
+                failing = True
+                self.errors += 1
+                self.dropped += len(batch)
+                self._close_file()  # reopened on the next pass
+            batch = []
+        self._close_file()
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+
+    def _open(self):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", newline="", buffering=64 * 1024)
+        self._writer = csv.writer(self._file)
+        if new_file:
+            self._writer.writerow(FIELDS)
+        self._opened_at = time.monotonic()
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._opened_at >= self.rotate_seconds
+
+    def _rotate(self):
+        self._file.close()
+        base, ext = os.path.splitext(self.path)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        rotated = f"{base}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(rotated):
+            rotated = f"{base}.{stamp}-{n}{ext}"
+            n += 1
+        os.replace(self.path, rotated)
+        self.rotations += 1
+
+        backups = sorted(glob.glob(f"{glob.escape(base)}.*{ext}"), key=os.path.getmtime)
+        for old in backups[:-self.backup_count] if self.backup_count else []:
+            os.remove(old)
+        self._open()
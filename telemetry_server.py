@@ -0,0 +1,191 @@
+"""
+Local streaming telemetry and control API
+
+An asyncio server on localhost TCP (default 127.0.0.1:8765) or a Unix
+socket. It runs on its own thread so the control loop never waits on it.
+
+Protocol - newline-delimited JSON in both directions:
+    server -> client   every telemetry sample, e.g.
+                       {"timestamp": ..., "setpoint": 60, "temperature": 59, ...}
+    client -> server   {"cmd": "setpoint", "value": 60}
+                       {"cmd": "stop"}
+                       {"cmd": "ping"}
+    server -> client   {"reply": "setpoint", "ok": true}   (answer to a command)
+
+Each client has a bounded send queue. A client that cannot keep up loses
+its oldest samples (counted in "dropped") instead of slowing the producer
+or the other clients.
+
+    nc 127.0.0.1 8765            # watch telemetry
+    echo '{"cmd": "setpoint", "value": 60}' | nc -q 1 127.0.0.1 8765
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+
+class _Client:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.sent = 0
+
+
+class TelemetryServer:
+    def __init__(self, host="127.0.0.1", port=8765, unix_path=None,
+                 on_command=None, client_queue=256):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.on_command = on_command    # on_command(cmd_dict) -> bool, runs in a worker thread
+        self.client_queue = client_queue
+
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None              # startup failure, re-raised by start()
+
+        # Statistics
+        self.published = 0
+        self.commands = 0
+
+    # ========== Producer side (any thread) ==========
+    def publish(self, sample):
+        if not self._clients or self._loop is None:
+            return
+        data = (json.dumps(sample, separators=(",", ":"), default=str) + "\n").encode()
+        self._loop.call_soon_threadsafe(self._fanout, data)
+
+    __call__ = publish  # usable directly as a TECService listener
+
+    # ========== Lifecycle ==========
+    def start(self):
+        """Start serving; raises the bind error (e.g. port in use) if startup fails"""
+        if self._thread is None:
+            self._error = None
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="telemetry-server", daemon=True)
+            self._thread.start()
+            self._ready.wait(5)
+            if self._error is not None:
+                self._thread.join()
+                self._thread = None
+                raise self._error
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        return {
+            "clients": len(self._clients),
+            "published": self.published,
+            "commands": self.commands,
+            "dropped": sum(c.dropped for c in list(self._clients)),
+        }
+
+    # ========== Event loop thread ==========
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            if self.unix_path:
+                if os.path.exists(self.unix_path):
+                    os.remove(self.unix_path)
+                coro = asyncio.start_unix_server(self._handle_client, path=self.unix_path)
+            else:
+                coro = asyncio.start_server(self._handle_client, self.host, self.port)
+            self._server = self._loop.run_until_complete(coro)
+        except Exception as e:
+            self._error = e
+            self._loop.close()
+            self._loop = None
+            return
+        finally:
+            self._ready.set()
+        where = self.unix_path or f"{self.host}:{self.port}"
+        print(f"Telemetry server listening on {where}")
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+            self._loop = None
+            if self.unix_path and os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+
+    def _fanout(self, data):
+        self.published += 1
+        for client in self._clients:
+            self._enqueue(client, data)
+
+    def _enqueue(self, client, data):
+        if client.queue.full():
+            client.queue.get_nowait()  # drop the oldest sample for this client only
+            client.dropped += 1
+        client.queue.put_nowait(data)
+
+    async def _handle_client(self, reader, writer):
+        client = _Client(writer, self.client_queue)
+        self._clients.add(client)
+        sender = asyncio.ensure_future(self._send_loop(client))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._handle_command(line)
+                self._enqueue(client, (json.dumps(reply) + "\n").encode())
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # client went away or the server is shutting down
+        except (ValueError, asyncio.LimitOverrunError) as e:
+            # line longer than the stream limit - drop this client only
+            print(f"Telemetry client sent an oversized line, closing connection: {e}")
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    async def _send_loop(self, client):
+        try:
+            while True:
+                data = await client.queue.get()
+                client.writer.write(data)
+                await client.writer.drain()
+                client.sent += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def _handle_command(self, line):
+        try:
+            cmd = json.loads(line)
+            name = cmd["cmd"]
+        except (ValueError, KeyError, TypeError):
+            return {"reply": "error", "ok": False, "error": "expected {\"cmd\": ...}"}
+        self.commands += 1
+        if name == "ping":
+            return {"reply": "ping", "ok": True, **self.stats()}
+        if self.on_command is None:
+            return {"reply": name, "ok": False, "error": "commands disabled"}
+        try:
+            # Hardware access may block - keep it off the event loop
+            ok = await self._loop.run_in_executor(None, self.on_command, cmd)
+        except Exception as e:
+            return {"reply": name, "ok": False, "error": str(e)}
+        return {"reply": name, "ok": bool(ok)}
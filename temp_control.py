@@ -1,3 +1,6 @@
+import startup_profile  # 启动分析: TEC_PROFILE_STARTUP=1 python3 temp_control.py
+startup_profile.begin()
+
 from kivy.metrics import dp
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
@@ -6,17 +9,47 @@ from kivymd.uix.label import MDLabel
 from kivymd.uix.floatlayout import MDFloatLayout
 from kivymd.uix.slider import MDSlider, MDSliderHandle, MDSliderValueLabel
 from kivymd.uix.fitimage import FitImage
-from kivy.clock import Clock
-from datetime import datetime
-import RPi.GPIO as GPIO
+from kivy.core.window import Window
+import os
+import threading
+import time
 from TEC_0602_2025 import MAX5144, TECController    #注意TEC初始化版本 新 (TEC_1010) 旧 （TEC_0903） (TEC_0602_2025)
 from ad7928_0917001 import TemperatureSensor  # 导入温度传感器类 注意热明电阻初始化版本 新 （ad7928_1010001） 旧 （ad7928_0917001）
+from ui_binding import UIBinder
+from ticker import TICKER
+from telemetry_log import TelemetryLogger
+import metrics
+import metrics_overlay
+import replay
+from acquisition_rate import RatePolicy
+
+startup_profile.end_imports()
 
 class MotorControlApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.tec_controller = TECController(MAX5144(spi_bus=1, spi_device=1, cs_pin=17))
-        self.sensor = TemperatureSensor()  # 初始化温度传感器
+        source = replay.replay_source()
+        if source and replay.is_telemetry(source[0]):
+            # 回放模式: TEC_REPLAY=<温度日志> 时不访问硬件，按 TEC_REPLAY_SPEED 倍速播放记录
+            self.tec_controller = replay.ReplayTECController()
+            self.sensor = replay.ReplaySensor(*source, loop=True)
+        else:
+            self.tec_controller = TECController(MAX5144(spi_bus=1, spi_device=1, cs_pin=17))
+            self.sensor = TemperatureSensor()  # 初始化温度传感器
+            metrics.instrument_hardware(self.tec_controller, self.sensor)  # 仅在 TEC_METRICS=1 时生效
+        self.ui_binder = UIBinder()  # 每帧合并标签更新
+        # 每次采样写入温度日志（后台线程批量写盘，自动轮转）
+        self.telemetry_log = TelemetryLogger(os.path.expanduser("~/tec_logs/telemetry.csv")).start()
+        self.current_setpoint = None
+        # 自适应采样: 升降温和越过设定点时 0.1 秒，稳定保持时 2 秒，未设定时 2 秒
+        self.stage = "idle"  # idle / ramp / hold
+        self.rate = RatePolicy(fast=0.1, normal=0.5, slow=2.0, idle=2.0)
+        self.sample_interval = self.rate.intervals["idle"]
+        self.actual_temperature = None
+        # 温度读取（100 次 SPI 传输 + 滤波）在后台线程进行，不阻塞界面
+        self.acquisition_thread = None
+        self.acquisition_stop = threading.Event()
+        self.rate_changed = threading.Event()  # 阶段变化时立即重新计算采样间隔
 
     def build(self):
         self.theme_cls.theme_style = "Light"
@@ -97,9 +130,14 @@ class MotorControlApp(MDApp):
 
         screen.add_widget(layout)
 
-        # 定时更新日期时间和温度
-        Clock.schedule_interval(self.update_date_time, 1)
-        Clock.schedule_interval(self.update_actual_temperature, 0.5)  # 每2秒更新实际温度
+        # 运行时指标: TEC_METRICS=1 开启, TEC_METRICS_OVERLAY=1 显示叠加层
+        metrics_overlay.install(layout)
+
+        # 标签只通过 binder 更新，文本不变时跳过
+        self.ui_binder.bind("date_time", self.date_time_label)
+        self.ui_binder.bind("set_temp", self.current_temperature_label, "Current Set Temperature: {} °C")
+        self.ui_binder.bind("actual_temp", self.actual_temperature_label, "Current Actual Temperature: {} °C")
+        self.ui_binder.start()
 
         # 绑定按钮事件
         set_temperature_button.bind(on_press=self.set_temperature)
@@ -108,26 +146,86 @@ class MotorControlApp(MDApp):
 
         return screen
 
-    def update_date_time(self, dt):
-        now = datetime.now()
-        self.date_time_label.text = now.strftime("%Y-%m-%d %H:%M:%S")
+    def update_date_time(self, now):
+        self.ui_binder.publish("date_time", now.strftime("%Y-%m-%d %H:%M:%S"))
 
     def set_temperature(self, instance):
-        self.tec_controller.set_temperature(self.temperature_slider.value)
+        if self.tec_controller.set_temperature(self.temperature_slider.value):
+            self.current_setpoint = int(self.temperature_slider.value)
+            self.stage = "ramp"
+            self.rate_changed.set()  # 立即切到快速采样，不等下一次读数
 
     def update_temperature(self, instance, value):
-        self.current_temperature_label.text = f"Current Set Temperature: {value} °C"
-
-    def update_actual_temperature(self, dt):
-        # 读取实际温度并更新显示
-        actual_temperature = self.sensor.read_temperature()
-        self.actual_temperature_label.text = f"Current Actual Temperature: {actual_temperature} °C"
+        self.ui_binder.publish("set_temp", value)
+
+    def acquisition_loop(self):
+        """Read the thermistor on a background thread at the stage-dependent rate"""
+        next_tick = time.monotonic()
+        while not self.acquisition_stop.is_set():
+            try:
+                self.update_actual_temperature(self.sensor.read_temperature())
+            except Exception as e:
+                print(f"Temperature read failed: {e}")
+            self.sample_interval = self.rate.interval(self.stage, self.current_setpoint,
+                                                      self.actual_temperature)
+            next_tick += self.sample_interval
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now  # fell behind, do not burst
+            if self.rate_changed.wait(next_tick - now):
+                self.rate_changed.clear()
+                next_tick = time.monotonic()
+
+    def update_actual_temperature(self, actual_temperature):
+        # 显示实际温度并写入日志（采集线程调用，binder 和日志均线程安全）
+        self.actual_temperature = actual_temperature
+        self.ui_binder.publish("actual_temp", actual_temperature)
+        self.telemetry_log.log({
+            "timestamp": time.time(),
+            "setpoint": self.current_setpoint,
+            "dac_code": self.tec_controller.dac_value,
+            "raw_code": self.sensor.last_raw,
+            "temperature": actual_temperature,
+        })
+        # 进入设定点 ±0.5°C 后从升降温转为保持
+        if self.stage == "ramp" and abs(actual_temperature - self.current_setpoint) <= 0.5:
+            self.stage = "hold"
 
     def stop_max1978(self, instance):
-        GPIO.output(4, GPIO.LOW)
+        self.tec_controller.disable()
+        self.stage = "idle"
+        self.rate_changed.set()
         print("MAX1978 has been stopped.")
 
+    def on_start(self):
+        startup_profile.watch_first_frame()
+        TICKER.attach("time", self.update_date_time)
+        # 温度日志持续记录，与窗口是否可见无关
+        self.acquisition_thread = threading.Thread(target=self.acquisition_loop,
+                                                   name="temperature", daemon=True)
+        self.acquisition_thread.start()
+        # 窗口最小化时停止刷新时间和标签
+        Window.bind(on_minimize=self.on_window_hidden, on_restore=self.on_window_shown)
+
+    def on_window_hidden(self, *args):
+        TICKER.detach("time", self.update_date_time)
+        self.ui_binder.stop()
+
+    def on_window_shown(self, *args):
+        self.ui_binder.start()
+        TICKER.attach("time", self.update_date_time)
+
     def on_stop(self):
+        self.acquisition_stop.set()
+        self.rate_changed.set()
+        if self.acquisition_thread is not None:
+            self.acquisition_thread.join(timeout=5)
+        TICKER.detach("time", self.update_date_time)
+        self.ui_binder.stop()
+        print(f"UI updates: {self.ui_binder.stats()}")
+        self.telemetry_log.close()
+        print(f"Telemetry log: {self.telemetry_log.stats()}")
+        print(f"Acquisition rate: {self.rate.stats()}")
         self.tec_controller.cleanup()
         self.sensor.cleanup()  # 清理传感器资源
 
@@ -7,7 +7,8 @@ Key Learning Topics:
 1. Custom Widget - inherit from kivy.uix.widget.Widget
 2. Canvas Drawing - using Kivy Graphics instructions
 3. NumericProperty - Kivy's reactive properties
-4. Clock.schedule_interval - animation timer updates
+4. Shared ticker (ticker.py) - timer updates only while the screen is shown
+   (stage times come from time.monotonic() deadlines, see stage_timer.py)
 5. Circular Progress Bar - Ellipse with angle_start and angle_end
 """
 
@@ -23,8 +24,12 @@ from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.floatlayout import MDFloatLayout
 from kivymd.uix.button import MDButton, MDButtonIcon, MDButtonText
 from kivymd.uix.label import MDLabel
-from datetime import datetime
 import math
+import time
+
+from ui_binding import UIBinder
+from ticker import TICKER
+from stage_timer import StageTimer, PeriodicSchedule, TimingReport
 
 
 class ProcessFlowWidget(Widget):
@@ -62,78 +67,97 @@ class ProcessFlowWidget(Widget):
         
         print(f"📋 ProcessFlowWidget initialized with {len(self.stages)} stages")
         
-        # Start timer - update every second
-        Clock.schedule_interval(self.update_timer, 1)
+        # Create the drawing instructions once; updates only change their
+        # pos / size / angle_end / circle instead of rebuilding the canvas
+        with self.canvas:
+            # ========== 1. Gray background circle ==========
+            Color(0.9, 0.9, 0.9, 1)  # Light gray (R, G, B, Alpha)
+            self.background_circle = Ellipse()
+            
+            # ========== 2. Blue progress sector ==========
+            Color(0.3, 0.5, 0.9, 1)  # Blue
+            self.progress_sector = Ellipse(
+                angle_start=0,           # Start angle (from right, counter-clockwise)
+                angle_end=0              # End angle, set from fill_percentage
+            )
+            
+            # ========== 3. Black border ==========
+            Color(0, 0, 0, 1)  # Black
+            self.border = Line(width=2)
+        
+        self.bind(pos=self.update_geometry, size=self.update_geometry,
+                  fill_percentage=self.update_canvas)
+        
+        # Stage deadlines are absolute (time.monotonic()), the Clock callback
+        # only looks at them - a late or dropped frame cannot stretch a stage
+        self.timing = TimingReport()
+        self.stage_timer = StageTimer(self.stages[self.current_stage],
+                                      self.total_time_per_stage).start()
+        
+        # The screen attaches update_timer to the shared "time" ticker while
+        # it is shown; deadlines keep running, so a hidden widget catches up
         
         # Initial draw
-        self.update_canvas()
+        self.update_geometry()
     
-    def update_timer(self, dt):
+    def update_timer(self, *args):
         """
-        Timer callback - called every second
+        Timer callback - called about every second from the "time" ticker
         
         Functions:
-        1. Update remaining time
-        2. Switch stages
+        1. Update remaining time from the stage deadline (dt is not trusted)
+        2. Switch stages - catching up on every stage that ended meanwhile
         3. Update progress percentage
         """
-        if self.remaining_time > 0:
-            self.remaining_time -= 1
-        else:
-            # Time's up, switch to next stage
+        now = time.monotonic()
+        while self.stage_timer.expired(now):
+            # Time's up: record how late we noticed, the next stage starts at
+            # this stage's deadline so the error does not add up
+            finished = self.stage_timer
+            lateness = finished.lateness(now)
+            actual = now - finished.started  # measured: from its start until the switch was noticed
+            self.timing.record_stage(finished.name, finished.duration, actual, lateness)
+            print(f"⏱  {finished.name}: {actual:.3f} s (planned {finished.duration} s), "
+                  f"switched {lateness * 1000:.0f} ms late")
+            
             self.current_stage = (self.current_stage + 1) % len(self.stages)
             self.stage_text = self.stages[self.current_stage]
-            self.remaining_time = self.total_time_per_stage
+            self.stage_timer = StageTimer(self.stages[self.current_stage],
+                                          self.total_time_per_stage).start(at=finished.deadline)
+        
+        self.remaining_time = math.ceil(self.stage_timer.remaining(now))
         
         # Update canvas
         self.update_canvas()
     
-    def on_size(self, *args):
-        """Redraw when window size changes"""
-        self.update_canvas()
-    
-    def update_canvas(self):
+    def update_geometry(self, *args):
         """
-        Core drawing method - draw pie chart progress animation
+        Move / resize the circle when the widget moves or the window resizes
         
-        Drawing steps:
-        1. Clear canvas
-        2. Draw gray background circle
-        3. Draw blue progress sector
-        4. Draw black border
+        Steps:
+        1. Calculate circle radius and center position
+        2. Apply them to the background circle, sector and border
+        3. Update the sector angle
         """
-        # Clear previous drawings
-        self.canvas.clear()
-        
-        # Calculate circle radius and center position
-        radius = min(self.width, self.height) / 2 - 20
+        radius = max(min(self.width, self.height) / 2 - 20, 0)
         center_x, center_y = self.center_x, self.center_y
         
-        with self.canvas:
-            # ========== 1. Draw gray background circle ==========
-            Color(0.9, 0.9, 0.9, 1)  # Light gray (R, G, B, Alpha)
-            Ellipse(
-                pos=(center_x - radius, center_y - radius),  # Bottom-left position
-                size=(radius * 2, radius * 2)                # Circle size
-            )
-            
-            # ========== 2. Draw blue progress sector ==========
-            # Calculate fill angle based on fill_percentage
-            fill_angle = 360 * (self.fill_percentage / 100)
-            Color(0.3, 0.5, 0.9, 1)  # Blue
-            Ellipse(
-                pos=(center_x - radius, center_y - radius),
-                size=(radius * 2, radius * 2),
-                angle_start=0,           # Start angle (from right, counter-clockwise)
-                angle_end=fill_angle     # End angle
-            )
-            
-            # ========== 3. Draw black border ==========
-            Color(0, 0, 0, 1)  # Black
-            Line(
-                circle=(center_x, center_y, radius),  # (center_x, center_y, radius)
-                width=2                                # Line width
-            )
+        pos = (center_x - radius, center_y - radius)  # Bottom-left position
+        size = (radius * 2, radius * 2)                # Circle size
+        self.background_circle.pos = self.progress_sector.pos = pos
+        self.background_circle.size = self.progress_sector.size = size
+        self.border.circle = (center_x, center_y, radius)  # (center_x, center_y, radius)
+        
+        self.update_canvas()
+    
+    def update_canvas(self, *args):
+        """
+        Core drawing method - update the pie chart progress
+        
+        Only the sector's end angle depends on fill_percentage, so this
+        is a single attribute change - no Color/Ellipse/Line is recreated.
+        """
+        self.progress_sector.angle_end = 360 * (self.fill_percentage / 100)
 
 
 class MotorControlScreen(MDScreen):
@@ -153,6 +177,9 @@ class MotorControlScreen(MDScreen):
         self.project_name = ""
         self.stop_requested = False
         
+        # Coalesced label updates - one dispatcher per frame
+        self.ui_binder = UIBinder()
+        
         # ========== Create pie chart animation widget ==========
         # Pass 'self' so ProcessFlowWidget can access this Screen
         self.process_flow = ProcessFlowWidget(
@@ -315,52 +342,69 @@ class MotorControlScreen(MDScreen):
         layout.add_widget(self.right_layout)
         screen.add_widget(layout)
         
-        # ========== Start timers ==========
-        
-        # Update temperature every 0.5 seconds
-        Clock.schedule_interval(self.update_actual_temperature, 0.5)
-        
-        # Update date/time every second
-        Clock.schedule_interval(self.update_date_time, 1)
+        # ========== Bind labels to the per-frame dispatcher ==========
+        self.ui_binder.bind("actual_temp", self.actual_temperature_label,
+                            "Current Temperature: {:.1f} °C")
+        self.ui_binder.bind("date_time", self.date_time_label)
+        self.ui_binder.bind("remaining", self.remaining_time_label,
+                            lambda s: f"Remaining: {s // 60:02d}:{s % 60:02d}")
         
-        # Simulate progress update
-        Clock.schedule_interval(self.simulate_progress, 1)
+        # ========== Telemetry source for the shared ticker ==========
+        # Read once per 0.5 s for all subscribers, only while someone listens
+        TICKER.add_source("temperature", self.read_temperature, interval=0.5)
         
         return screen
     
-    def update_actual_temperature(self, dt):
+    def on_enter(self, *args):
         """
-        Update temperature display
+        Screen shown - start timers
         
+        Timers come from the shared ticker, so a hidden screen costs nothing
+        """
+        self.ui_binder.start()
+        self.progress_ticks = PeriodicSchedule(1.0).start()  # 1% per second of visible time
+        TICKER.attach("temperature", self.update_actual_temperature)  # every 0.5 s
+        TICKER.attach("time", self.update_date_time)                  # every second
+        TICKER.attach("time", self.simulate_progress, immediate=False)
+        TICKER.attach("time", self.process_flow.update_timer)
+    
+    def on_leave(self, *args):
+        """Screen hidden - stop timers"""
+        TICKER.detach("temperature", self.update_actual_temperature)
+        TICKER.detach("time", self.update_date_time)
+        TICKER.detach("time", self.simulate_progress)
+        TICKER.detach("time", self.process_flow.update_timer)
+        self.ui_binder.stop()
+    
+    def read_temperature(self):
+        """
         In real application, this would read from actual sensor
         Here we just simulate with random values
         """
         import random
-        temp = 25 + random.random() * 10  # Simulate 25-35°C
-        self.actual_temperature_label.text = f"Current Temperature: {temp:.1f} °C"
+        return 25 + random.random() * 10  # Simulate 25-35°C
+    
+    def update_actual_temperature(self, temp):
+        """Update temperature display"""
+        self.ui_binder.publish("actual_temp", temp)
     
-    def update_date_time(self, dt):
+    def update_date_time(self, now):
         """Update date/time display"""
-        now = datetime.now()
-        self.date_time_label.text = now.strftime("%Y-%m-%d %H:%M:%S")
+        self.ui_binder.publish("date_time", now.strftime("%Y-%m-%d %H:%M:%S"))
     
-    def simulate_progress(self, dt):
+    def simulate_progress(self, now):
         """
         Simulate progress for demo purposes
         In real application, this would be updated by actual process
         """
-        # Increase progress by 1% each second
-        if self.process_flow.fill_percentage < 100:
-            self.process_flow.fill_percentage += 1
-        else:
-            # Reset to 0 when reaching 100%
-            self.process_flow.fill_percentage = 0
-        
-        # Update remaining time display
-        total_seconds = int(self.process_flow.remaining_time)
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-        self.remaining_time_label.text = f"Remaining: {minutes:02d}:{seconds:02d}"
+        # Increase progress by 1% per elapsed second - a late tick catches up
+        steps = len(self.progress_ticks.due())
+        if steps:
+            # Reset to 0 after reaching 100%
+            self.process_flow.fill_percentage = (self.process_flow.fill_percentage + steps) % 101
+        
+        # Update remaining time display (skipped when the text is unchanged)
+        self.ui_binder.publish("remaining", int(self.process_flow.remaining_time))
     
     # ========== Button event handlers ==========
     
@@ -380,6 +424,8 @@ class MotorControlScreen(MDScreen):
     def on_result_clicked(self, *args):
         """Result button clicked"""
         print("📁 Result button clicked")
+        print(f"   UI updates: {self.ui_binder.stats()}")
+        print(f"   Stage timing:\n{self.process_flow.timing.format()}")
 
 
 class DemoApp(MDApp):
@@ -408,7 +454,7 @@ class DemoApp(MDApp):
         print("  1. ProcessFlowWidget - Custom circular progress widget")
         print("  2. Canvas Drawing - Using Color, Ellipse, Line")
         print("  3. NumericProperty - Reactive property system")
-        print("  4. Clock.schedule_interval - Timer-based animations")
+        print("  4. Shared ticker - timers that run only while the screen is visible")
         print("  5. Complex Layout - Dual-column with multiple components")
         print("\n💡 Animation Features:")
         print("  - Pie chart fills from 0% to 100%")
@@ -420,7 +466,7 @@ class DemoApp(MDApp):
         print("  - Border: Black outline")
         print("\n🔧 Try modifying:")
         print("  - Change fill_percentage increment speed")
-        print("  - Modify colors in update_canvas()")
+        print("  - Modify colors in ProcessFlowWidget.__init__()")
         print("  - Add more stages to self.stages list")
         print("="*70 + "\n")
 
@@ -0,0 +1,81 @@
+"""
+Thermal profile files
+
+A profile is an ordered list of steps. Each step drives the block to a
+setpoint and holds it there for a number of seconds.
+
+JSON format:
+    {
+        "repeat": 1,
+        "steps": [
+            {"name": "Denature", "setpoint": 95, "hold": 30},
+            {"name": "Anneal",   "setpoint": 60, "hold": 45}
+        ]
+    }
+A bare list of steps is accepted as well.
+
+CSV format (header optional):
+    setpoint,hold,name
+    95,30,Denature
+    60,45,Anneal
+"""
+
+import csv
+import json
+import os
+
+
+class ProfileStep:
+    def __init__(self, setpoint, hold, name=None):
+        self.setpoint = int(round(float(setpoint)))
+        self.hold = float(hold)
+        self.name = name or f"{self.setpoint}°C"
+
+    def to_dict(self):
+        return {"name": self.name, "setpoint": self.setpoint, "hold": self.hold}
+
+    def __repr__(self):
+        return f"ProfileStep({self.name!r}, setpoint={self.setpoint}, hold={self.hold})"
+
+
+def _steps_from_dicts(items):
+    return [ProfileStep(item["setpoint"], item.get("hold", 0), item.get("name")) for item in items]
+
+
+def load_profile(path):
+    """Load a profile file and return the expanded list of ProfileStep"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        steps = []
+        with open(path, newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0].strip().startswith("#"):
+                    continue
+                try:
+                    setpoint = float(row[0])
+                except ValueError:
+                    continue  # header row
+                hold = row[1] if len(row) > 1 and row[1].strip() else 0
+                name = row[2].strip() if len(row) > 2 else None
+                steps.append(ProfileStep(setpoint, hold, name))
+        return steps
+
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return _steps_from_dicts(data)
+    steps = _steps_from_dicts(data.get("steps", []))
+    return steps * int(data.get("repeat", 1))
+
+
+def parse_steps(specs):
+    """
+    Build steps from command line specs such as "95:30" or "60"
+
+    A bare setpoint holds forever (hold = 0 means "until stopped").
+    """
+    steps = []
+    for spec in specs:
+        setpoint, _, hold = spec.partition(":")
+        steps.append(ProfileStep(setpoint, hold or 0))
+    return steps
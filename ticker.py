@@ -0,0 +1,111 @@
+"""
+Shared clock ticker - one Clock event per source, only while someone listens
+
+Screens used to start their own Clock.schedule_interval(update_time, 1)
+in __init__ and never stop it, so hidden screens kept formatting
+datetimes and updating labels. With the ticker each value (wall-clock
+time, a sensor reading) is produced once per interval for all
+subscribers, and a source's Clock event exists only while at least one
+subscriber is attached:
+
+    from ticker import TICKER
+
+    def on_enter(self, *args):
+        TICKER.attach("time", self.update_time)       # callback(datetime)
+
+    def on_leave(self, *args):
+        TICKER.detach("time", self.update_time)
+
+    TICKER.add_source("temperature", sensor.read_temperature, interval=0.5)
+    TICKER.attach("temperature", self.show_temperature)
+
+The "time" source (datetime.now every second) is always registered.
+Callbacks run on the Kivy main thread.
+"""
+
+from datetime import datetime
+
+from kivy.clock import Clock
+
+
+class Ticker:
+    def __init__(self):
+        self._sources = {}      # name -> _Source
+        self.add_source("time", datetime.now, interval=1.0)
+
+    def add_source(self, name, read, interval=1.0):
+        """
+        Register (or replace) a source; read() is called once per interval
+        while the source has subscribers. Existing subscribers are kept.
+        """
+        source = self._sources.get(name)
+        if source is None:
+            self._sources[name] = _Source(name, read, interval)
+            return
+        running = source.event is not None
+        source.stop()
+        source.read = read
+        source.interval = interval
+        if running:
+            source.start()
+
+    def attach(self, name, callback, immediate=True):
+        """Subscribe callback(value); with immediate=True it is called right away"""
+        source = self._sources[name]
+        if callback not in source.subscribers:
+            source.subscribers.append(callback)
+        if source.event is None:
+            source.start()
+        if immediate:
+            callback(source.last if source.last is not None else source.poll())
+
+    def detach(self, name, callback):
+        source = self._sources.get(name)
+        if source is None:
+            return
+        if callback in source.subscribers:
+            source.subscribers.remove(callback)
+        if not source.subscribers:
+            source.stop()
+
+    def active(self):
+        """Names of the sources that currently have a Clock event"""
+        return [name for name, source in self._sources.items() if source.event is not None]
+
+    def stats(self):
+        return {name: {"subscribers": len(s.subscribers), "ticks": s.ticks, "running": s.event is not None}
+                for name, s in self._sources.items()}
+
+
+class _Source:
+    def __init__(self, name, read, interval):
+        self.name = name
+        self.read = read
+        self.interval = interval
+        self.subscribers = []
+        self.event = None
+        self.last = None
+        self.ticks = 0
+
+    def start(self):
+        if self.event is None:
+            self.event = Clock.schedule_interval(self._tick, self.interval)
+
+    def stop(self):
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
+            self.last = None  # stale once nobody is polling
+
+    def poll(self):
+        self.last = self.read()
+        self.ticks += 1
+        return self.last
+
+    def _tick(self, dt):
+        value = self.poll()
+        for callback in list(self.subscribers):
+            callback(value)
+
+
+TICKER = Ticker()
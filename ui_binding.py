@@ -0,0 +1,96 @@
+"""
+UI binding layer - coalesced per-frame label updates
+
+Telemetry producers call publish(key, value) from any thread. A single
+Clock callback runs once per frame, formats the latest value of every
+changed key and assigns MDLabel.text only when the formatted string is
+different from what the label already shows. Identical strings never
+reach the label, so no texture is re-rendered for them.
+
+Usage:
+    binder = UIBinder()
+    binder.bind("actual_temp", self.actual_temperature_label,
+                "Current Actual Temperature: {} °C")
+    binder.start()
+    ...
+    binder.publish("actual_temp", sensor.read_temperature())
+"""
+
+import threading
+
+from kivy.clock import Clock
+
+
+class UIBinder:
+    def __init__(self):
+        self._bindings = {}     # key -> [(label, formatter), ...]
+        self._pending = {}      # key -> latest published value
+        self._lock = threading.Lock()
+        self._event = None
+
+        # Statistics
+        self.updates = 0        # label.text assignments performed
+        self.skipped = 0        # formatted text identical, assignment skipped
+        self.coalesced = 0      # values overwritten before a frame consumed them
+
+    def bind(self, key, label, fmt="{}"):
+        """
+        Attach a label to a key
+
+        fmt may be a format string ("Temp: {:.1f}°C") or a callable
+        that takes the value and returns the text.
+        """
+        formatter = fmt if callable(fmt) else fmt.format
+        self._bindings.setdefault(key, []).append((label, formatter))
+
+    def unbind(self, key, label=None):
+        """Detach one label (or all labels) from a key"""
+        if label is None:
+            self._bindings.pop(key, None)
+            return
+        entries = [e for e in self._bindings.get(key, []) if e[0] is not label]
+        if entries:
+            self._bindings[key] = entries
+        else:
+            self._bindings.pop(key, None)
+
+    def publish(self, key, value):
+        """Record the latest value for key (thread-safe, never touches widgets)"""
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = value
+
+    def start(self):
+        """Start the per-frame dispatcher"""
+        if self._event is None:
+            self._event = Clock.schedule_interval(self.flush, 0)
+
+    def stop(self):
+        """Stop the dispatcher (pending values are kept)"""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def flush(self, dt=0):
+        """Push changed values to their labels - called once per frame"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for key, value in pending.items():
+            for label, formatter in self._bindings.get(key, ()):
+                text = formatter(value)
+                if label.text == text:
+                    self.skipped += 1
+                    continue
+                label.text = text
+                self.updates += 1
+
+    def stats(self):
+        return {
+            "updates": self.updates,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+        }
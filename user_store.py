@@ -0,0 +1,102 @@
+"""
+In-process user store backed by ~/user_data.json
+
+Users are kept in a dict keyed by username, so lookups are O(1). The file
+is re-read only when its mtime/size changes, and that is checked at most
+once per `check_interval` seconds - screen entry and login normally do not
+touch the disk at all. Saves write a temporary file, fsync it and
+atomically replace the original, so a power cut never leaves a truncated
+user_data.json.
+
+File format (unchanged):
+    {"users": [{"username": "...", "password": "..."}, ...]}
+"""
+
+import json
+import os
+import tempfile
+import time
+
+
+class UserStore:
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._users = {}            # username -> user dict, in file order
+        self._stat = None           # (mtime_ns, size) of the loaded file
+        self._last_check = float("-inf")
+
+    # ========== Cache ==========
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self, force=False):
+        """Reload the file if it changed since it was last read"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        stat = self._file_stat()
+        if stat == self._stat and not force:
+            return
+        self._stat = stat
+        self._users = {}
+        if stat is None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for user in data.get("users", []):
+            self._users[user["username"]] = user
+
+    # ========== Queries ==========
+    def names(self):
+        self.refresh()
+        return list(self._users)
+
+    def get(self, username):
+        self.refresh()
+        return self._users.get(username)
+
+    def check_password(self, username, password):
+        user = self.get(username)
+        return user is not None and user.get("password") == password
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def __len__(self):
+        self.refresh()
+        return len(self._users)
+
+    # ========== Updates ==========
+    def add(self, username, password):
+        """Add a user and save; returns False if the name is taken"""
+        self.refresh(force=True)  # never overwrite a change made by someone else
+        if username in self._users:
+            return False
+        self._users[username] = {"username": username, "password": password}
+        self.save()
+        return True
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".user_data.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"users": list(self._users.values())}, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._stat = self._file_stat()
+        self._last_check = time.monotonic()